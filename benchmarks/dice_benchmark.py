@@ -0,0 +1,49 @@
+"""
+Compare the scalar and batch dice paths.
+
+Run with ``python benchmarks/dice_benchmark.py``.
+"""
+
+import timeit
+
+from nos import dice
+
+HORDE_SIZE = 300
+REPEATS = 20
+
+CASES = {
+    "d20 with advantage": (
+        lambda: [dice.d20.roll(dice.Situation.ADVANTAGE) for _ in range(HORDE_SIZE)],
+        lambda: dice.d20.roll_many(HORDE_SIZE, dice.Situation.ADVANTAGE),
+    ),
+    "d20 with elven accuracy": (
+        lambda: [
+            dice.d20.roll(dice.Situation.ELVEN_ACCURACY) for _ in range(HORDE_SIZE)
+        ],
+        lambda: dice.d20.roll_many(HORDE_SIZE, dice.Situation.ELVEN_ACCURACY),
+    ),
+    "8d6": (
+        lambda: [dice.Roll(*[dice.d6] * 8).roll() for _ in range(HORDE_SIZE)],
+        lambda: dice.Roll(*[dice.d6] * 8).roll_batch(HORDE_SIZE),
+    ),
+    "4d6 keep highest 3": (
+        lambda: [dice.Roll(*[dice.d6] * 4).roll(highest=3) for _ in range(HORDE_SIZE)],
+        lambda: dice.Roll(*[dice.d6] * 4).roll_batch(HORDE_SIZE, highest=3),
+    ),
+}
+
+
+def main():
+    print(f"{HORDE_SIZE} rolls per call, best of {REPEATS} calls")
+    for name, (scalar, batch) in CASES.items():
+        scalar_time = min(timeit.repeat(scalar, number=1, repeat=REPEATS))
+        batch_time = min(timeit.repeat(batch, number=1, repeat=REPEATS))
+        print(
+            f"{name:<26} scalar {scalar_time * 1e3:8.3f} ms"
+            f"  batch {batch_time * 1e3:8.3f} ms"
+            f"  speedup {scalar_time / batch_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
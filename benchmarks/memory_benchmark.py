@@ -0,0 +1,96 @@
+"""
+Measure the memory used per creature by armies of plain Creatures and by a Horde.
+
+Plain Creatures are also measured unslotted, as the baseline: every model class is
+replicated as an ordinary dataclass with the same fields, whose instances keep a
+``__dict__``, and each creature builds its own ability scores, as it did before they
+were shared.
+
+Run with ``python benchmarks/memory_benchmark.py``.
+"""
+
+import dataclasses
+import functools
+import tracemalloc
+
+import nos.world as world
+import nos.world.abilities as abilities
+import nos.world.movement as movement
+from nos.world.creatures import Creature
+from nos.world.horde import Horde
+
+ARMY_SIZES = (1_000, 10_000)
+
+
+def skeleton() -> Creature:
+    return Creature(
+        "Skeleton",
+        "Rattles.",
+        world.Medium(),
+        13,
+        13,
+        movements=[movement.Walk(30)],
+    )
+
+
+@functools.cache
+def unslotted(cls: type) -> type:
+    """
+    A plain dataclass with the fields of the slotted dataclass ``cls``, keeping its
+    state in a ``__dict__``.
+    """
+    fields = []
+    for field in dataclasses.fields(cls):
+        if field.default_factory is not dataclasses.MISSING:
+            spec = dataclasses.field(default_factory=field.default_factory)
+        else:
+            default = None if field.default is dataclasses.MISSING else field.default
+            spec = dataclasses.field(default=default)
+        fields.append((field.name, field.type, spec))
+    return dataclasses.make_dataclass(f"Unslotted{cls.__name__}", fields)
+
+
+def unslotted_skeleton():
+    ability_scores = {}
+    for field in dataclasses.fields(abilities.Abilities):
+        ability = type(field.default)
+        ability_scores[field.name] = unslotted(ability)(
+            name=ability.__name__, score=10, bonus=0
+        )
+    return unslotted(Creature)(
+        name="Skeleton",
+        description="Rattles.",
+        size=unslotted(world.Medium)(),
+        armor_class=13,
+        max_hit_points=13,
+        current_hit_points=13,
+        movements=[unslotted(movement.Walk)(30)],
+        abilities=unslotted(abilities.Abilities)(**ability_scores),
+        world_position=unslotted(movement.Position)(),
+        turn=unslotted(world.Turn)(),
+    )
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    army = build()  # noqa: F841, keep the army alive until it is measured
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    unslotted_skeleton()  # build the replica classes before measuring
+    for count in ARMY_SIZES:
+        baseline = measure(lambda: [unslotted_skeleton() for _ in range(count)])
+        creatures = measure(lambda: [skeleton() for _ in range(count)])
+        horde = measure(lambda: Horde(skeleton(), count))
+        print(
+            f"{count:>6} creatures: {baseline / count:7.0f} bytes each unslotted"
+            f"  | slotted: {creatures / count:7.0f} bytes each"
+            f"  | as a Horde: {horde / count:5.0f} bytes each"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
+import bisect
+import itertools
 import typing
 
 import pygame as pg
 
-from nos import assets
+from nos import assets, config
 
 COORDINATES = typing.TypeVar("COORDINATES", tuple[int | float, int | float], pg.Vector2)
 
 
 class Sprite(pg.sprite.Sprite):
+    # Set after drawing on the image in place, for nos.rendering.DirtyRenderer.
+    dirty: bool = False
+
     def __init__(
         self,
         asset: assets.Asset,
@@ -17,6 +22,7 @@ class Sprite(pg.sprite.Sprite):
     ):
         super().__init__(*(groups or []))
         self.image = asset.image
+        asset.users.add(self)  # keep the asset loaded while this sprite shows it
         self.rect = rect or self.image.get_rect()
         self.rect.topleft = position
 
@@ -27,10 +33,38 @@ class Sprite(pg.sprite.Sprite):
         pass
 
 
+class AnimationClock:
+    """
+    The time all animations play by, advanced once per frame by the time that passed,
+    so they keep their speed when the frame rate drops.
+    """
+
+    def __init__(self):
+        self.time = 0.0  # milliseconds
+
+    def advance(self, milliseconds: float):
+        self.time += milliseconds
+
+
+ANIMATION_CLOCK = AnimationClock()
+
+
 class Animation:
-    def __init__(
-        self, images, img_duration: int | list[int] = 5, loop=True, initial_frame=0
-    ):
+    """
+    A timeline of frames, shared by every sprite playing it. Sprites keep their own
+    place in it with an ``AnimationCursor``.
+
+    Parameters
+    ----------
+    images : list[pg.Surface]
+        The frames.
+    img_duration : int | list[int]
+        How long each frame shows, in frames at the configured frame rate.
+    loop : bool
+        Whether to start over after the last frame, rather than stay on it.
+    """
+
+    def __init__(self, images, img_duration: int | list[int] = 5, loop=True):
         img_duration = (
             img_duration
             if isinstance(img_duration, list)
@@ -39,37 +73,67 @@ class Animation:
         self.frames = images
         self.loop = loop
         self.img_duration = img_duration
-        self.done = False
-        self.frame = initial_frame
-        self.frame_index = 0
-        self.total_frames = sum(img_duration)
-        self.end_frames = [img_duration[0] - 1]
-        for i in range(1, len(img_duration)):
-            self.end_frames.append(img_duration[i] + self.end_frames[i - 1])
-
-    def copy(self):
-        return Animation(self.frames, self.img_duration, self.loop)
-
-    def advance(self, num_frames: int = 1):
-        if self.loop:
-            self.frame = (self.frame + num_frames) % self.total_frames
-        else:
-            self.frame = min(self.frame + num_frames, self.total_frames - 1)
-            if self.frame >= self.total_frames - 1:
-                self.done = True
-        self.frame_index = (
-            self.frame_index
-            if self.frame < self.end_frames[self.frame_index]
-            else (self.frame_index + 1) % len(self.frames)
+        frame_time = 1000 / config.GAME["fps"]
+        self.end_times = list(
+            itertools.accumulate(duration * frame_time for duration in img_duration)
         )
+        self.duration = self.end_times[-1]
+        # The frame shown to the cursors started at each time, as of ``_now``.
+        self._now = None
+        self._frames: dict[float, int] = {}
+
+    def frame_index(self, start: float, now: float) -> int:
+        """
+        The frame shown at ``now`` by a cursor started at ``start``, both in milliseconds
+        of the animation clock. Computed once per frame for all the cursors started
+        together.
+        """
+        if now != self._now:
+            self._now = now
+            self._frames.clear()
+        index = self._frames.get(start)
+        if index is None:
+            elapsed = now - start
+            if self.loop:
+                elapsed %= self.duration
+            index = self._frames[start] = min(
+                bisect.bisect_right(self.end_times, elapsed), len(self.frames) - 1
+            )
+        return index
+
+    def cursor(self, clock: AnimationClock = None) -> "AnimationCursor":
+        return AnimationCursor(self, clock or ANIMATION_CLOCK)
+
+
+class AnimationCursor:
+    """
+    A sprite's place in a shared Animation: when it started playing it.
+    """
+
+    __slots__ = ("animation", "clock", "start")
+
+    def __init__(self, animation: Animation, clock: AnimationClock):
+        self.animation = animation
+        self.clock = clock
+        self.start = clock.time
 
     @property
-    def image(self):
-        return self.frames[self.frame_index]
+    def frame_index(self) -> int:
+        return self.animation.frame_index(self.start, self.clock.time)
+
+    @property
+    def image(self) -> pg.Surface:
+        return self.animation.frames[self.frame_index]
+
+    @property
+    def done(self) -> bool:
+        return (
+            not self.animation.loop
+            and self.clock.time - self.start >= self.animation.duration
+        )
 
     def reset(self):
-        self.frame = 0
-        self.done = False
+        self.start = self.clock.time
 
 
 class AnimatedSprite(Sprite):
@@ -79,10 +143,12 @@ class AnimatedSprite(Sprite):
         initial_state: str = "idle",
         rect: pg.Rect = None,
         position: tuple[int, int] = (0, 0),
+        clock: AnimationClock = None,
     ):
         super().__init__(asset, rect, position)
         self.asset = asset
         self.animations = asset.animations
+        self.clock = clock or ANIMATION_CLOCK
         self._state: str = initial_state
         self.state = initial_state
 
@@ -94,12 +160,11 @@ class AnimatedSprite(Sprite):
     def state(self, state: str):
         self._state = state
         self.animation = self.animations[self._state]
-        self.animation.reset()
-        self.image = self.animation.image
+        self.cursor = self.animation.cursor(self.clock)
+        self.image = self.cursor.image
 
     def update(self):
-        self.animation.advance()
-        self.image = self.animation.image
+        self.image = self.cursor.image
 
 
 class Group(pg.sprite.Group):
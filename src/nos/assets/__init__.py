@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 import dataclasses
+import functools
 import importlib
+import os
 import pkgutil
+import time
+import typing
+import weakref
 from pathlib import Path
 
 import pygame as pg
 
 import nos
+import nos.config as config
+import nos.sprite_cache as sprite_cache
 
 
 def load_asset(path: Path) -> pg.Surface:
@@ -16,8 +25,20 @@ def load_asset(path: Path) -> pg.Surface:
     return img.convert_alpha()
 
 
+# Threads decoding image files, which pygame does without holding the GIL.
+WORKERS = config.CACHE.get("workers") or os.cpu_count() or 1
+
+
 def load_assets(paths: list[Path]) -> list[pg.Surface]:
-    return [load_asset(path) for path in paths]
+    """
+    Load image files, decoding them concurrently. Only the conversion for display,
+    which pygame requires of the main thread, is done one after another.
+    """
+    with concurrent.futures.ThreadPoolExecutor(WORKERS) as pool:
+        images = list(pool.map(pg.image.load, paths))
+    for image in images:
+        image.set_colorkey((0, 0, 0))
+    return [image.convert_alpha() for image in images]
 
 
 def load_directory(directory: Path) -> list[pg.Surface]:
@@ -35,6 +56,23 @@ def load_directory(directory: Path) -> list[pg.Surface]:
     return load_assets([directory / file for file in directory.iterdir()])
 
 
+# The image files decoded ahead by ``load_all``, by (path, colorkey), until it is done.
+_decoded: dict[tuple[Path, tuple[int, int, int] | None], pg.Surface] = {}
+
+
+def read_image(path: Path, colorkey: tuple[int, int, int] | None) -> pg.Surface:
+    """
+    Decode an image file. Nothing keeps it once the assets cut from it are rendered,
+    except during ``load_all``, which decodes each file once for all of them.
+    """
+    image = _decoded.get((path, colorkey))
+    if image is None:
+        image = pg.image.load(path)
+        if colorkey is not None:
+            image.set_colorkey(colorkey)
+    return image
+
+
 @dataclasses.dataclass
 class Asset:
     path: Path = None
@@ -43,14 +81,25 @@ class Asset:
     scale: float | tuple[float, float] = (1, 1)
     static_tile: tuple[int, int] = (0, 0)
     offset: tuple[int, int] = (0, 0)
-    colorkey: tuple[int, int, int] = (0, 0, 0)
+    colorkey: tuple[int, int, int] | None = (0, 0, 0)
+    layers: list[tuple[Asset, tuple[int, int], tuple[int, int]]] = None
+    loaded: bool = dataclasses.field(default=False, init=False)
+    users: weakref.WeakSet = dataclasses.field(
+        default_factory=weakref.WeakSet, init=False, repr=False, compare=False
+    )
+    _tiles: dict[tuple[int, int], pg.Surface] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _source: pg.Surface = dataclasses.field(default=None, init=False, repr=False)
+    _source_geometry: tuple = dataclasses.field(default=None, init=False, repr=False)
     """
     Attributes
     ----------
     path : Path
         The path to the image file.
     spritesheet : pg.Surface
-        The image file.
+        The image file. Once loaded, only the part of it holding the asset's tiles,
+        converted and scaled.
     tile_size : tuple[int, int]
         The size of the tiles in the spritesheet.
     scale : float | tuple[float, float]
@@ -59,41 +108,187 @@ class Asset:
         The tile to use as the static image, in tile indices (default is (0, 0)).
     offset : tuple[int, int]
         The offset of the (0, 0) tile from the top left corner of the spritesheet.
-    colorkey : tuple[int, int, int]
-        The color to use as the transparency mask for the spritesheet.
+    colorkey : tuple[int, int, int] | None
+        The color to use as the transparency mask for an image file, if any.
+    layers : list[tuple[Asset, tuple[int, int], tuple[int, int]]]
+        The (asset, tile, offset) of each image stacked into this asset, see ``stack``.
+    loaded : bool
+        Whether the spritesheet is ready for display. Assets load themselves the first
+        time a tile is asked for, and may be unloaded again to stay within the memory
+        budget of ``LOADED`` while no sprite uses them.
+    users : weakref.WeakSet
+        The live sprites showing this asset, which keep it from being unloaded.
     """
 
     def __post_init__(self):
-        if not self.path and not self.spritesheet:
-            raise ValueError("Either path or image must be provided.")
-        if self.path and self.spritesheet:
-            raise ValueError("Only one of path or image must be provided.")
-        if self.path:
-            self.spritesheet = pg.image.load(self.path)
-            self.spritesheet.set_colorkey(self.colorkey)
+        sources = [
+            source
+            for source in (self.path, self.spritesheet, self.layers)
+            if source is not None
+        ]
+        if not sources:
+            raise ValueError("Either path, image or layers must be provided.")
+        if len(sources) > 1:
+            raise ValueError("Only one of path, image or layers must be provided.")
+        self._source = self.spritesheet
+        self._source_geometry = (self.tile_size, self.offset)
         self.scale: tuple[float, float] = (
             self.scale if isinstance(self.scale, tuple) else (self.scale, self.scale)
         )
 
     def load(self) -> None:
-        self.spritesheet = self.spritesheet.convert_alpha()
-        self.tile_size = self.tile_size or self.spritesheet.get_size()
+        """
+        Render the spritesheet for display, or load it from the sprite cache.
+        """
+        if self.loaded:
+            LOADED.touch(self)
+            return
+        self._load(self.read_cached())
+
+    def read_cached(self) -> tuple[pg.Surface, tuple[int, int]] | None:
+        """
+        The sprite cache entry for this asset, if any. Safe to call from any thread.
+        """
+        cache_key = self.cache_key()
+        return sprite_cache.CACHE.load(cache_key) if cache_key else None
+
+    def _load(self, cached: tuple[pg.Surface, tuple[int, int]] | None) -> None:
+        if cached is None:
+            spritesheet, tile_size = self._render()
+            cache_key = self.cache_key()
+            if cache_key:
+                sprite_cache.CACHE.store(cache_key, spritesheet, tile_size)
+        else:
+            spritesheet, tile_size = cached
+            spritesheet = spritesheet.convert_alpha()
+        self.spritesheet, self.tile_size, self.offset = spritesheet, tile_size, (0, 0)
+        self._tiles = {}
+        self.loaded = True
+        LOADED.add(self)
+
+    def unload(self) -> None:
+        """
+        Free the spritesheet. It is loaded again, usually from the sprite cache, the next
+        time a tile is asked for.
+        """
+        if not self.loaded:
+            return
+        LOADED.discard(self)
+        self.loaded = False
+        self._tiles = {}
+        self.spritesheet = self._source
+        self.tile_size, self.offset = self._source_geometry
+
+    @property
+    def nbytes(self) -> int:
+        if not self.loaded:
+            return 0
+        width, height = self.spritesheet.get_size()
+        return width * height * self.spritesheet.get_bytesize()
+
+    @property
+    def used_tiles(self) -> list[tuple[int, int]]:
+        """
+        The tiles this asset shows, which are all that is kept of its image once loaded.
+        """
+        return [self.static_tile]
+
+    def source(self) -> pg.Surface:
+        """
+        The whole image this asset is cut from, before conversion and scaling. Decoded
+        or composited again on each call, unless it was given as a surface.
+        """
+        if self._source is not None:
+            return self._source
+        if self.path is not None:
+            return read_image(self.path, self.colorkey)
+        return self._composite()
+
+    def source_files(self) -> set[tuple[Path, tuple[int, int, int] | None]]:
+        """
+        The (path, colorkey) of the image files rendering this asset decodes.
+        """
+        if self.path is not None:
+            return {(self.path, self.colorkey)}
+        if self.layers is not None:
+            return set().union(*(layer.source_files() for layer, _, _ in self.layers))
+        return set()
+
+    def source_tile(self, tile: tuple[int, int]) -> pg.Surface:
+        source = self.source()
+        tile_size, offset = self._source_geometry
+        tile_size = tile_size or source.get_size()
+        position = (
+            offset[0] + tile[0] * tile_size[0],
+            offset[1] + tile[1] * tile_size[1],
+        )
+        return source.subsurface(pg.Rect(position, tile_size))
+
+    def source_key(self) -> tuple | None:
+        """
+        What the source image is made from, or None if it was given as a surface and
+        can't be cached.
+        """
+        if self.path is not None:
+            return ("file", sprite_cache.file_digest(self.path), self.colorkey)
+        if self.layers is not None:
+            layers = tuple(
+                (layer.source_key(), layer._source_geometry, tuple(tile), tuple(offset))
+                for layer, tile, offset in self.layers
+            )
+            if all(layer[0] is not None for layer in layers):
+                return ("stack", layers)
+        return None
+
+    def cache_key(self) -> str | None:
+        source_key = self.source_key()
+        if source_key is None:
+            return None
+        return sprite_cache.key(
+            source_key,
+            self._source_geometry,
+            self.scale,
+            tuple(sorted(set(self.used_tiles))),
+        )
+
+    def _render(self) -> tuple[pg.Surface, tuple[int, int]]:
+        source = self.source()
+        tile_size, offset = self._source_geometry
+        tile_size = tile_size or source.get_size()
+        # Keep only the part of the source that the used tiles come from.
+        used_tiles = self.used_tiles
+        region = pg.Rect(
+            offset,
+            (
+                (max(tile[0] for tile in used_tiles) + 1) * tile_size[0],
+                (max(tile[1] for tile in used_tiles) + 1) * tile_size[1],
+            ),
+        ).clip(source.get_rect())
+        spritesheet = source.subsurface(region).convert_alpha()
         if self.scale != (1.0, 1.0):
-            self.spritesheet = pg.transform.scale(
-                self.spritesheet,
+            spritesheet = pg.transform.scale(
+                spritesheet,
                 (
-                    int(self.spritesheet.size[0] * self.scale[0]),
-                    int(self.spritesheet.size[1] * self.scale[1]),
+                    int(spritesheet.size[0] * self.scale[0]),
+                    int(spritesheet.size[1] * self.scale[1]),
                 ),
             )
-            self.tile_size = (
-                int(self.tile_size[0] * self.scale[0]),
-                int(self.tile_size[1] * self.scale[1]),
-            )
-            self.offset = (
-                int(self.offset[0] * self.scale[0]),
-                int(self.offset[1] * self.scale[1]),
+            tile_size = (
+                int(tile_size[0] * self.scale[0]),
+                int(tile_size[1] * self.scale[1]),
             )
+        return spritesheet, tile_size
+
+    def _composite(self) -> pg.Surface:
+        images = [layer.source_tile(tile) for layer, tile, _ in self.layers]
+        size = (
+            max(image.size[0] for image in images),
+            max(image.size[1] for image in images),
+        )
+        composite = pg.Surface(size, pg.SRCALPHA)
+        for image, (_, _, offset) in zip(images, self.layers):
+            composite.blit(image, offset)
+        return composite
 
     def rect_from_tile(self, tile: tuple[int, int]) -> pg.Rect:
         x, y = (
@@ -107,7 +302,17 @@ class Asset:
         return x // self.tile_size[0], y // self.tile_size[1]
 
     def get_tile(self, tile: tuple[int, int]) -> pg.Surface:
-        return self.spritesheet.subsurface(self.rect_from_tile(tile))
+        """
+        The image of ``tile``, one surface shared by every sprite and animation showing
+        it. Copy it before drawing on it.
+        """
+        self.load()
+        image = self._tiles.get(tile)
+        if image is None:
+            image = self._tiles[tile] = self.spritesheet.subsurface(
+                self.rect_from_tile(tile)
+            )
+        return image
 
     @property
     def image(self) -> pg.Surface:
@@ -124,6 +329,9 @@ class Asset:
         """
         Stack multiple assets into a single Asset.
 
+        The layers are only composited when the stacked asset is loaded, and not at all
+        when it is in the sprite cache.
+
         Parameters
         ----------
         assets : list[Asset]
@@ -141,18 +349,7 @@ class Asset:
         """
         offsets = offsets or [(0, 0) for _ in assets]
         tiles = tiles or [asset.static_tile for asset in assets]
-        size = (
-            max(asset.get_tile(tile).size[0] for asset, tile in zip(assets, tiles)),
-            max(asset.get_tile(tile).size[1] for asset, tile in zip(assets, tiles)),
-        )
-        spritesheet = pg.Surface(size, pg.SRCALPHA)
-        for asset, offset in zip(assets, offsets):
-            spritesheet.blit(asset.get_tile(asset.static_tile), offset)
-        return Asset(
-            spritesheet=spritesheet,
-            tile_size=size,
-            scale=scale,
-        )
+        return Asset(layers=list(zip(assets, tiles, offsets)), scale=scale)
 
 
 @dataclasses.dataclass
@@ -162,8 +359,8 @@ class AnimatedAsset(Asset):
     )
     frame_duration: int | dict[str, int | list[int]] = 5
     loop: bool | dict[str, bool] = True
-    animations: dict[str, nos.Animation] = dataclasses.field(
-        init=False, default_factory=dict
+    _animations: dict[str, nos.Animation] = dataclasses.field(
+        init=False, default_factory=dict, repr=False
     )
 
     def __post_init__(self):
@@ -187,9 +384,21 @@ class AnimatedAsset(Asset):
                     f"Specific frame durations for {state} must be given for each tile."
                 )
 
-    def load(self) -> None:
-        super().load()
-        self.animations = {
+    @property
+    def used_tiles(self) -> list[tuple[int, int]]:
+        return [
+            self.static_tile,
+            *(tile for tiles in self.animation_tiles.values() for tile in tiles),
+        ]
+
+    @property
+    def animations(self) -> dict[str, nos.Animation]:
+        self.load()
+        return self._animations
+
+    def _load(self, cached: tuple[pg.Surface, tuple[int, int]] | None) -> None:
+        super()._load(cached)
+        self._animations = {
             state: nos.Animation(
                 images=[self.get_tile(tile) for tile in tiles],
                 img_duration=self.frame_duration[state],
@@ -198,10 +407,83 @@ class AnimatedAsset(Asset):
             for state, tiles in self.animation_tiles.items()
         }
 
+    def unload(self) -> None:
+        super().unload()
+        self._animations = {}
+
+
+class LoadedAssets:
+    """
+    The loaded assets, least recently used first, within a budget of memory.
+
+    Loading an asset that takes the total over budget unloads the least recently used
+    ones until it fits again, skipping those that live sprites still show.
+
+    Parameters
+    ----------
+    budget : int
+        The bytes of spritesheets to keep loaded.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.nbytes = 0
+        self._assets: collections.OrderedDict[int, Asset] = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, asset: Asset):
+        return id(asset) in self._assets
+
+    def add(self, asset: Asset):
+        self.discard(asset)
+        self._assets[id(asset)] = asset
+        self.nbytes += asset.nbytes
+        self.evict(keep=asset)
+
+    def touch(self, asset: Asset):
+        if id(asset) in self._assets:
+            self._assets.move_to_end(id(asset))
+
+    def discard(self, asset: Asset):
+        if self._assets.pop(id(asset), None) is not None:
+            self.nbytes -= asset.nbytes
+
+    def evict(self, keep: Asset = None):
+        for asset in list(self._assets.values()):
+            if self.nbytes <= self.budget:
+                return
+            if asset is not keep and not asset.users:
+                asset.unload()
+
+
+LOADED = LoadedAssets(int(config.CACHE.get("memory_budget", 256) * 2**20))
+
+# Every asset of the asset modules, by "module.NAME", e.g. "minions.SKELETON_ARCHER".
+REGISTRY: dict[str, Asset] = {}
 
-def load_all() -> None:
+
+def register(name: str, asset: Asset) -> Asset:
+    REGISTRY[name] = asset
+    return asset
+
+
+def get(name: str) -> Asset:
+    """
+    The asset registered as ``name``, loaded.
+    """
+    try:
+        asset = REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"No asset named {name!r}") from None
+    asset.load()
+    return asset
+
+
+def register_all() -> None:
     """
-    load all assets and optimize for use.
+    Import the asset modules and register their assets, without loading any of them.
     """
     globals()["__all__"] = __all__ = []
     for loader, module_name, is_pkg in pkgutil.walk_packages(__path__):
@@ -213,14 +495,81 @@ def load_all() -> None:
         module = globals()[module_name]
         for obj_name in dir(module):
             obj = getattr(module, obj_name)
-            if isinstance(obj, nos.assets.Asset):
-                obj.load()
+            if isinstance(obj, Asset):
+                register(f"{module_name}.{obj_name}", obj)
+
+
+# Seconds spent loading each asset by the last ``load_all``, by name.
+LOAD_TIMES: dict[str, float] = {}
+
+
+def _timed(function: typing.Callable, *args) -> tuple[typing.Any, float]:
+    start = time.perf_counter()
+    return function(*args), time.perf_counter() - start
+
+
+def load_all(workers: int = None) -> dict[str, float]:
+    """
+    Register and load every asset up front, as far as the memory budget allows.
+
+    Sprite cache entries are read, and the image files of the assets missing from it
+    decoded, on a pool of ``workers`` threads. The main thread only converts, scales
+    and composites the results, which pygame requires of it.
+
+    Returns
+    -------
+    dict[str, float]: the seconds spent loading each asset, by name, also kept in
+        ``LOAD_TIMES``. An asset's time includes decoding its image files, even when
+        it shares them with others.
+    """
+    register_all()
+    pending = {name: asset for name, asset in REGISTRY.items() if not asset.loaded}
+    try:
+        prepared = _decode_ahead(pending, workers)
+        LOAD_TIMES.clear()
+        for name, asset in pending.items():
+            cached, seconds = prepared[name]
+            LOAD_TIMES[name] = seconds + _timed(asset._load, cached)[1]
+    finally:
+        _decoded.clear()
+    return LOAD_TIMES
+
+
+def _decode_ahead(
+    pending: dict[str, Asset], workers: int = None
+) -> dict[str, tuple[tuple[pg.Surface, tuple[int, int]] | None, float]]:
+    # The sprite cache entry of each asset, if any, and the seconds spent reading it or
+    # decoding its image files into ``_decoded``.
+    with concurrent.futures.ThreadPoolExecutor(workers or WORKERS) as pool:
+        entries = dict(
+            zip(pending, pool.map(_timed, [a.read_cached for a in pending.values()]))
+        )
+        files = list(
+            {
+                source
+                for name, (cached, _) in entries.items()
+                if cached is None
+                for source in pending[name].source_files()
+            }
+        )
+        decoded = pool.map(_timed, [functools.partial(read_image, *f) for f in files])
+        decode_times = {}
+        for file, (image, seconds) in zip(files, decoded):
+            _decoded[file] = image
+            decode_times[file] = seconds
+    prepared = {}
+    for name, (cached, seconds) in entries.items():
+        if cached is None:
+            seconds += sum(decode_times[file] for file in pending[name].source_files())
+        prepared[name] = (cached, seconds)
+    return prepared
 
 
 def clean_up() -> None:
     """
     Remove all construction objects to save memory.
     """
+    _decoded.clear()
     for module_finder, name, ispkg in pkgutil.iter_modules(
         ["nos.assets"], "nos.assets."
     ):
@@ -231,6 +580,13 @@ def clean_up() -> None:
                 del obj
 
 
-def initialize():
-    load_all()
+def initialize(preload: bool = config.CACHE.get("preload", False)):
+    """
+    Register the assets. Each is loaded the first time it is shown, or all of them now
+    with ``preload``.
+    """
+    if preload:
+        load_all()
+    else:
+        register_all()
     clean_up()
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import pygame as pg
-
 import nos.assets as assets
 import nos.config as config
 
@@ -14,15 +12,17 @@ DESKTOP = assets.Asset(
 # Manifest, the main page.
 MANIFEST_SPRITESHEET_POSITION_OFFSET = (176, 1040)
 MANIFEST_SPRITESHEET_PAGE_SIZE = (592, 464)
-PAGES = pg.image.load("assets/pages.png")
-BORDERS = pg.image.load("assets/borders.png")
+PAGES = Path("assets/pages.png")
+BORDERS = Path("assets/borders.png")
 manifest_page = assets.Asset(
-    spritesheet=PAGES,
+    path=PAGES,
+    colorkey=None,
     tile_size=MANIFEST_SPRITESHEET_PAGE_SIZE,
     offset=MANIFEST_SPRITESHEET_POSITION_OFFSET,
 )
 manifest_border = assets.Asset(
-    spritesheet=BORDERS,
+    path=BORDERS,
+    colorkey=None,
     tile_size=MANIFEST_SPRITESHEET_PAGE_SIZE,
     offset=MANIFEST_SPRITESHEET_POSITION_OFFSET,
 )
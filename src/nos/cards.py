@@ -1,14 +1,35 @@
-from pathlib import Path
+import functools
 
 import pygame as pg
 
 import nos
 import nos.assets as assets
 import nos.assets.cards as cards
+import nos.text as text
 from nos import config
 
 
+@functools.lru_cache(maxsize=config.CACHE.get("text", 512))
+def card_face(name: str, text_offset: tuple[int, int], selected: bool) -> pg.Surface:
+    """
+    The background, border and name of a card, composited once and shared by every
+    card showing the same name.
+    """
+    face = cards.CARD.image.copy()
+    handwriting = text.font(cards.HANDWRITING, 10, italic=True)
+    face.blit(text.render(handwriting, name, "black"), text_offset)
+    if selected:
+        face.blit(cards.CARD_SELECT_BORDER.image, (0, 0))
+    return face
+
+
 class Card(nos.Draggable, nos.Group):
+    """
+    A unit's card: a face holding everything static about it, composited into one
+    image, and the unit's animated icon on top. The face is only composited again when
+    the card is renamed, selected or deselected, or given new data.
+    """
+
     def __init__(
         self,
         asset: assets.AnimatedAsset,
@@ -18,41 +39,58 @@ class Card(nos.Draggable, nos.Group):
         card_data=None,
         is_selected=False,
     ):
-        handwriting = pg.font.Font(Path("assets/fonts/Grand9K_Pixel.ttf"), 10)
-        handwriting.italic = True
-        card_data = card_data or {}
-        self.card_data = card_data
-        self.card = nos.Sprite(cards.CARD, position=position)
-        self.icon = nos.AnimatedSprite(
-            asset, position=position, initial_state=initial_state
-        )
+        self._card_data = card_data or {}
+        self.face = nos.Sprite(cards.CARD, position=position)
+        self.icon = nos.AnimatedSprite(asset, initial_state=initial_state)
         self.icon_offset = icon_offset or (
             config.GAME["card"]["left_sprite_margin"],
-            (self.card.image.size[1] - self.icon.image.size[1]) // 2,
+            (self.face.image.size[1] - self.icon.image.size[1]) // 2,
         )
-        self.text_offset = (self.icon_offset[0] + self.icon.image.size[0], 10)
-        self.text_surface = assets.Asset(
-            spritesheet=handwriting.render(
-                self.card_data.get("name", ""), True, pg.Color("black")
-            )
-        )
-        self.text_surface.load()
-        self.text = nos.Sprite(
-            self.text_surface,
-            position=pg.Vector2(position) + pg.Vector2(self.text_offset),
+        self.icon.rect.topleft = (
+            position[0] + self.icon_offset[0],
+            position[1] + self.icon_offset[1],
         )
-        nos.Group.__init__(self, sprites=[self.card, self.icon, self.text])
+        self.text_offset = (self.icon_offset[0] + self.icon.image.size[0], 10)
+        nos.Group.__init__(self, sprites=[self.face, self.icon])
         nos.Draggable.__init__(
             self,
             select_mask=nos.Sprite(cards.CARD_SELECT_BORDER, position=position),
             is_selected=is_selected,
         )
+        self.redraw()
+
+    @property
+    def card_data(self) -> dict:
+        return self._card_data
+
+    @card_data.setter
+    def card_data(self, card_data: dict):
+        self._card_data = card_data
+        self.redraw()
+
+    def rename(self, name: str):
+        self.card_data = {**self.card_data, "name": name}
+
+    def redraw(self):
+        """
+        Composite the face again, after something shown on it changed.
+        """
+        self.face.image = card_face(
+            self.card_data.get("name", ""), self.text_offset, self.is_selected
+        )
+
+    def select(self):
+        self.is_selected = True
+        self.redraw()
+
+    def deselect(self):
+        self.is_selected = False
+        self.redraw()
 
     def update(self):
         super().update()
-        self.card.rect.topleft = self.rect.topleft
-        self.card.update()
-        self.icon.rect = pg.Vector2(self.rect.topleft) + pg.Vector2(self.icon_offset)
-        self.icon.update()
-        self.text.rect = pg.Vector2(self.rect.topleft) + pg.Vector2(self.text_offset)
-        self.text.update()
+        self.face.rect.topleft = self.rect.topleft
+        self.icon.rect.topleft = (
+            self.rect.x + self.icon_offset[0],
+            self.rect.y + self.icon_offset[1],
+        )
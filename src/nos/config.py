@@ -11,6 +11,8 @@ WINDOW = SETTINGS["window"]
 
 GAME = SETTINGS["game"]
 
+CACHE = SETTINGS.get("cache", {})
+
 #  TODO: add a Moddable mixin to allow for easy modding of the game by specifying a new entity with a JSON file.
 
 
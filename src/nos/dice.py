@@ -1,5 +1,186 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
 import dataclasses
+import functools
+import itertools
+import math
 import random
+import re
+
+import numpy as np
+
+
+class RandomStream:
+    """
+    A seedable source of randomness for dice, which can be split into independent streams.
+
+    Each stream drives both the scalar rolls (through a ``random.Random``) and the batch
+    rolls (through a NumPy ``Generator``), both derived from one ``SeedSequence``, so a
+    stream built from the same seed replays exactly the same rolls. ``spawn`` hands out
+    statistically independent child streams, e.g. one per worker thread or process.
+
+    Parameters
+    ----------
+    seed : int | np.random.SeedSequence
+        The seed of the stream. If omitted, fresh entropy is drawn from the OS.
+    """
+
+    def __init__(self, seed: int | np.random.SeedSequence = None):
+        self.seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        # 128 bits, so that the scalar rolls of sibling streams don't collide.
+        state = self.seed_sequence.generate_state(4)
+        self.random = random.Random(int.from_bytes(state.tobytes(), "little"))
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+
+    @property
+    def seed(self) -> int:
+        """
+        The entropy this stream was seeded with. Child streams share their parent's seed
+        and are told apart by their ``spawn_key``.
+        """
+        return self.seed_sequence.entropy
+
+    @property
+    def spawn_key(self) -> tuple[int, ...]:
+        return self.seed_sequence.spawn_key
+
+    def randint(self, low: int, high: int) -> int:
+        return self.random.randint(low, high)
+
+    def integers(self, low, high, size=None) -> np.ndarray:
+        """
+        Random integers from ``low`` to ``high`` inclusive, broadcast like NumPy's.
+        """
+        return self.generator.integers(low, high, size=size, endpoint=True)
+
+    def spawn(self, n: int) -> list[RandomStream]:
+        """
+        Split off ``n`` independent child streams.
+        """
+        return [RandomStream(child) for child in self.seed_sequence.spawn(n)]
+
+    def __repr__(self):
+        return f"RandomStream(seed={self.seed}, spawn_key={self.spawn_key})"
+
+
+_stream: contextvars.ContextVar[RandomStream] = contextvars.ContextVar(
+    "dice_stream", default=RandomStream()
+)
+
+
+def current_stream() -> RandomStream:
+    """
+    The stream used by rolls that are not given one explicitly.
+    """
+    return _stream.get()
+
+
+def seed(value: int | np.random.SeedSequence = None) -> RandomStream:
+    """
+    Replace the current stream with a new one seeded by ``value``, e.g. to replay a combat.
+    """
+    stream = RandomStream(value)
+    _stream.set(stream)
+    return stream
+
+
+@contextlib.contextmanager
+def using(stream: RandomStream | int):
+    """
+    Roll with ``stream`` (or a new stream seeded with it) for the duration of the block.
+
+    The binding is held in a context variable, so each thread or task keeps its own.
+    """
+    stream = stream if isinstance(stream, RandomStream) else RandomStream(stream)
+    token = _stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _stream.reset(token)
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Distribution:
+    """
+    The exact probability distribution of the outcome of a roll.
+
+    Attributes
+    ----------
+    minimum : int
+        The lowest possible outcome.
+    pmf : np.ndarray
+        The probability of each outcome from ``minimum`` to ``maximum``, inclusive.
+        The array is read-only, as distributions are shared between cached rolls.
+    """
+
+    minimum: int
+    pmf: np.ndarray
+
+    def __post_init__(self):
+        self.pmf.flags.writeable = False
+
+    @property
+    def maximum(self) -> int:
+        return self.minimum + self.pmf.size - 1
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        return np.arange(self.minimum, self.maximum + 1)
+
+    @functools.cached_property
+    def expected_value(self) -> float:
+        return float(self.outcomes @ self.pmf)
+
+    @functools.cached_property
+    def variance(self) -> float:
+        return float((self.outcomes - self.expected_value) ** 2 @ self.pmf)
+
+    @property
+    def standard_deviation(self) -> float:
+        return self.variance**0.5
+
+    def probability(self, value: int) -> float:
+        """
+        The probability that the outcome is exactly ``value``.
+        """
+        if not self.minimum <= value <= self.maximum:
+            return 0.0
+        return float(self.pmf[value - self.minimum])
+
+    def cdf(self, value: int) -> float:
+        """
+        The probability that the outcome is at most ``value``.
+        """
+        if value < self.minimum:
+            return 0.0
+        return float(self.pmf[: value - self.minimum + 1].sum())
+
+    def at_least(self, value: int) -> float:
+        """
+        The probability that the outcome is at least ``value``, e.g. meeting a target's AC.
+        """
+        return 1.0 - self.cdf(value - 1)
+
+    def __add__(self, other: int | Distribution) -> Distribution:
+        if isinstance(other, Distribution):
+            return Distribution(
+                self.minimum + other.minimum, np.convolve(self.pmf, other.pmf)
+            )
+        return Distribution(self.minimum + other, self.pmf.copy())
+
+    __radd__ = __add__
+
+    def __str__(self):
+        return (
+            f"{self.minimum} to {self.maximum} "
+            f"(mean {self.expected_value:.2f}, sd {self.standard_deviation:.2f})"
+        )
 
 
 class Situation:
@@ -7,23 +188,79 @@ class Situation:
     DISADVANTAGE = "disadvantage"
     ELVEN_ACCURACY = "elven_accuracy"
 
+    @staticmethod
+    def combine(*situations: str | None) -> str | None:
+        """
+        The situation of a roll affected by several circumstances: any advantage and any
+        disadvantage cancel out, however many of each there are.
+        """
+        present = set(situations)
+        if Situation.DISADVANTAGE in present:
+            if present & {Situation.ADVANTAGE, Situation.ELVEN_ACCURACY}:
+                return None
+            return Situation.DISADVANTAGE
+        if Situation.ELVEN_ACCURACY in present:
+            return Situation.ELVEN_ACCURACY
+        if Situation.ADVANTAGE in present:
+            return Situation.ADVANTAGE
+        return None
+
+
+# Number of d20s rolled for each situation, and whether the highest or lowest is kept.
+SITUATION_ROLLS = {
+    None: (1, np.max),
+    Situation.ADVANTAGE: (2, np.max),
+    Situation.DISADVANTAGE: (2, np.min),
+    Situation.ELVEN_ACCURACY: (3, np.max),
+}
+
 
 @dataclasses.dataclass
 class Die:
     sides: int = 20
 
-    def roll(self, situation: str = None):
-        result = [random.randint(1, self.sides)]
+    def roll(self, situation: str = None, rng: RandomStream = None):
+        rng = rng or _stream.get()
+        result = rng.randint(1, self.sides)
         match situation:
             case Situation.ADVANTAGE:
-                return max(self.roll(), result)
+                return max(self.roll(rng=rng), result)
             case Situation.DISADVANTAGE:
-                return min(self.roll(), result)
+                return min(self.roll(rng=rng), result)
             case Situation.ELVEN_ACCURACY:
-                return max(self.roll(), self.roll(), result)
+                return max(self.roll(rng=rng), self.roll(rng=rng), result)
             case _:
                 return result
 
+    def roll_many(
+        self, n: int, situation: str = None, rng: RandomStream = None
+    ) -> np.ndarray:
+        """
+        Roll this die ``n`` times at once.
+
+        Parameters
+        ----------
+        n : int
+            The number of independent rolls.
+        situation : str
+            One of the ``Situation`` values, applied to every roll.
+        rng : RandomStream
+            The stream to roll with, defaulting to the current stream.
+
+        Returns
+        -------
+        np.ndarray: an integer array of shape ``(n,)`` with the result of each roll.
+        """
+        count, keep = SITUATION_ROLLS.get(situation, SITUATION_ROLLS[None])
+        rolls = (rng or _stream.get()).integers(1, self.sides, size=(count, n))
+        return keep(rolls, axis=0)
+
+    def distribution(self, situation: str = None) -> Distribution:
+        """
+        The exact distribution of a roll of this die in the given situation.
+        """
+        return _die_distribution(self.sides, situation)
+
     def __str__(self):
         return f"d{self.sides}"
 
@@ -44,19 +281,79 @@ d100 = Die(100)
 
 
 class Roll:
-    def __init__(self, *dice: Die):
+    def __init__(self, *dice: Die, rng: RandomStream = None):
         self.dice = dice
+        self.rng = rng
 
-    def roll(self, highest: int = None, lowest: int = None):
+    def roll(self, highest: int = None, lowest: int = None, rng: RandomStream = None):
         if highest and lowest:
             raise ValueError("Cannot specify both highest and lowest")
-        dice = [d.roll() for d in self.dice]
+        rng = rng or self.rng or _stream.get()
+        dice = [d.roll(rng=rng) for d in self.dice]
         if highest:
             dice = sorted(dice)[-highest:]
         if lowest:
             dice = sorted(dice)[:lowest]
         return sum(dice)
 
+    def roll_dice(self, n: int, rng: RandomStream = None) -> np.ndarray:
+        """
+        Roll every die of this Roll ``n`` times at once, without totalling them.
+
+        Returns
+        -------
+        np.ndarray: an integer array of shape ``(n, len(self.dice))``.
+        """
+        sides = np.fromiter((die.sides for die in self.dice), dtype=np.int64)
+        rng = rng or self.rng or _stream.get()
+        return rng.integers(1, sides, size=(n, sides.size))
+
+    def roll_batch(
+        self,
+        n: int,
+        highest: int = None,
+        lowest: int = None,
+        rng: RandomStream = None,
+    ) -> np.ndarray:
+        """
+        Make ``n`` independent rolls of this Roll at once.
+
+        Parameters
+        ----------
+        n : int
+            The number of independent rolls.
+        highest : int
+            Only total the highest ``highest`` dice of each roll.
+        lowest : int
+            Only total the lowest ``lowest`` dice of each roll.
+        rng : RandomStream
+            The stream to roll with, defaulting to the Roll's own stream, if bound,
+            and otherwise the current stream.
+
+        Returns
+        -------
+        np.ndarray: an integer array of shape ``(n,)`` with the total of each roll.
+        """
+        if highest and lowest:
+            raise ValueError("Cannot specify both highest and lowest")
+        return keep_and_total(self.roll_dice(n, rng), highest, lowest)
+
+    def distribution(self, highest: int = None, lowest: int = None) -> Distribution:
+        """
+        The exact distribution of the total of this Roll.
+
+        Distributions are memoized by the canonical form of the roll (the sorted sides of
+        its dice and which dice are kept), so repeated queries are free.
+        """
+        if highest and lowest:
+            raise ValueError("Cannot specify both highest and lowest")
+        sides = tuple(sorted(die.sides for die in self.dice))
+        if highest and highest >= len(sides):
+            highest = None
+        if lowest and lowest >= len(sides):
+            lowest = None
+        return _roll_distribution(sides, highest or None, lowest or None)
+
     def __str__(self):
         return " + ".join(map(str, self.dice))
 
@@ -64,5 +361,305 @@ class Roll:
         return f'Roll({", ".join(map(repr, self.dice))})'
 
 
-def roll(dice: list[Die], highest: int = None, lowest: int = None):
-    return Roll(*dice).roll(highest, lowest)
+def keep_and_total(
+    rolls: np.ndarray, highest: int = None, lowest: int = None
+) -> np.ndarray:
+    """
+    Total each row of ``rolls``, keeping only the highest or lowest dice of each row.
+    """
+    dice_count = rolls.shape[-1]
+    if highest and highest < dice_count:
+        rolls = np.partition(rolls, dice_count - highest, axis=-1)[..., -highest:]
+    if lowest and lowest < dice_count:
+        rolls = np.partition(rolls, lowest - 1, axis=-1)[..., :lowest]
+    return rolls.sum(axis=-1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _die_distribution(sides: int, situation: str = None) -> Distribution:
+    count, keep = SITUATION_ROLLS.get(situation, SITUATION_ROLLS[None])
+    faces = np.arange(0, sides + 1)
+    if keep is np.max:
+        # P(max <= x) = (x / sides) ** count
+        cumulative = (faces / sides) ** count
+    else:
+        # P(min <= x) = 1 - P(min > x) = 1 - ((sides - x) / sides) ** count
+        cumulative = 1 - ((sides - faces) / sides) ** count
+    return Distribution(1, np.diff(cumulative))
+
+
+@functools.lru_cache(maxsize=1024)
+def _roll_distribution(
+    sides: tuple[int, ...], highest: int = None, lowest: int = None
+) -> Distribution:
+    kept = highest or lowest
+    if not kept:
+        total = Distribution(0, np.ones(1))
+        for die_sides in sides:
+            total = total + _die_distribution(die_sides)
+        return total
+    return _kept_distribution(sides, kept, highest=bool(highest))
+
+
+def _kept_distribution(
+    sides: tuple[int, ...], kept: int, highest: bool
+) -> Distribution:
+    """
+    The total of the ``kept`` highest (or lowest) of dice with ``sides``, by order
+    statistics: faces are visited from the best down, counting how many of the dice not
+    yet placed show each one, until ``kept`` dice are placed.
+
+    The states are (dice left to place in each group of identical dice, dice kept so
+    far), each with the distribution of the kept total, so the cost is polynomial in
+    the number of dice rather than combinatorial.
+    """
+    groups = sorted(set(sides))
+    top = groups[-1]
+    width = kept * top + 1
+    start = np.zeros(width)
+    start[0] = 1.0
+    states = {(tuple(sides.count(group) for group in groups), 0): start}
+    done = np.zeros(width)
+    for face in range(top, 0, -1) if highest else range(1, top + 1):
+        # Given the dice not yet placed are all below (above) the faces already visited,
+        # each shows this face with the same chance as the others of its group.
+        chances = [
+            (1 / face if highest else 1 / (group - face + 1)) if group >= face else 0.0
+            for group in groups
+        ]
+        next_states: dict[tuple[tuple[int, ...], int], np.ndarray] = {}
+        for (remaining, count), pmf in states.items():
+            outcomes = [
+                [
+                    (
+                        shown,
+                        math.comb(left, shown)
+                        * chance**shown
+                        * (1 - chance) ** (left - shown),
+                    )
+                    for shown in range(left + 1 if chance else 1)
+                ]
+                for left, chance in zip(remaining, chances)
+            ]
+            for combination in itertools.product(*outcomes):
+                probability = math.prod(chance for _, chance in combination)
+                if not probability:
+                    continue
+                shown = [number for number, _ in combination]
+                placed = min(sum(shown), kept - count)
+                shifted = np.zeros(width)
+                shifted[placed * face :] = pmf[: width - placed * face]
+                shifted *= probability
+                if count + placed == kept:
+                    done += shifted
+                    continue
+                key = (
+                    tuple(left - n for left, n in zip(remaining, shown)),
+                    count + placed,
+                )
+                if key in next_states:
+                    next_states[key] += shifted
+                else:
+                    next_states[key] = shifted
+        states = next_states
+    return Distribution(kept, np.trim_zeros(done[kept:], "b"))
+
+
+@dataclasses.dataclass(frozen=True)
+class DiceTerm:
+    """
+    A group of identical dice in a dice expression, such as ``2d20kh1`` or ``-1d4``.
+    """
+
+    count: int
+    sides: int
+    highest: int = None
+    lowest: int = None
+    sign: int = 1
+
+    @property
+    def kept(self) -> int:
+        return self.highest or self.lowest or self.count
+
+    def roll(self, rng: RandomStream = None) -> int:
+        rng = rng or _stream.get()
+        dice = [rng.randint(1, self.sides) for _ in range(self.count)]
+        if self.highest:
+            dice = sorted(dice)[-self.highest :]
+        if self.lowest:
+            dice = sorted(dice)[: self.lowest]
+        return self.sign * sum(dice)
+
+    def roll_batch(self, n: int, rng: RandomStream = None) -> np.ndarray:
+        rolls = (rng or _stream.get()).integers(1, self.sides, size=(n, self.count))
+        return self.sign * keep_and_total(rolls, self.highest, self.lowest)
+
+    def distribution(self) -> Distribution:
+        distribution = _roll_distribution(
+            (self.sides,) * self.count, self.highest, self.lowest
+        )
+        if self.sign > 0:
+            return distribution
+        return Distribution(-distribution.maximum, distribution.pmf[::-1].copy())
+
+    def __str__(self):
+        keep = ""
+        if self.highest:
+            keep = f"kh{self.highest}"
+        if self.lowest:
+            keep = f"kl{self.lowest}"
+        return f"{'-' if self.sign < 0 else ''}{self.count}d{self.sides}{keep}"
+
+
+@dataclasses.dataclass(frozen=True)
+class RollPlan:
+    """
+    A compiled dice expression, such as ``8d6+3`` or ``2d20kh1+5``.
+
+    Plans are immutable and hashable, and are built once by ``parse`` and then reused,
+    so rolling them allocates no ``Die`` objects. They can be rolled one at a time with
+    ``roll``, many at once with ``roll_batch``, or analyzed exactly with ``distribution``.
+
+    Attributes
+    ----------
+    terms : tuple[DiceTerm, ...]
+        The groups of dice in the expression.
+    modifier : int
+        The sum of the constant terms in the expression.
+    """
+
+    terms: tuple[DiceTerm, ...] = ()
+    modifier: int = 0
+
+    @functools.cached_property
+    def dice(self) -> tuple[Die, ...]:
+        """
+        The dice of this plan, for code that expects a ``Roll``.
+        """
+        return tuple(_die(term.sides) for term in self.terms for _ in range(term.count))
+
+    def roll(self, rng: RandomStream = None) -> int:
+        rng = rng or _stream.get()
+        return sum(term.roll(rng) for term in self.terms) + self.modifier
+
+    def roll_batch(self, n: int, rng: RandomStream = None) -> np.ndarray:
+        """
+        Make ``n`` independent rolls of this plan at once.
+
+        Returns
+        -------
+        np.ndarray: an integer array of shape ``(n,)`` with the total of each roll.
+        """
+        rng = rng or _stream.get()
+        totals = np.full(n, self.modifier, dtype=np.int64)
+        for term in self.terms:
+            totals += term.roll_batch(n, rng)
+        return totals
+
+    def distribution(self) -> Distribution:
+        return _plan_distribution(self)
+
+    def __str__(self):
+        expression = "+".join(map(str, self.terms)).replace("+-", "-")
+        if self.modifier or not expression:
+            expression += f"{self.modifier:+d}" if expression else f"{self.modifier}"
+        return expression
+
+
+_TERM = re.compile(
+    r"(?P<sign>[+-])?"
+    r"(?:(?P<count>\d*)d(?P<sides>\d+)(?:(?P<keep>k[hl]?|d[hl]?)(?P<keep_count>\d+))?"
+    r"|(?P<constant>\d+))"
+)
+
+
+@functools.lru_cache(maxsize=256)
+def parse(expression: str) -> RollPlan:
+    """
+    Compile a dice expression into a RollPlan.
+
+    Expressions are sums of dice and constants, where dice may keep (``kh``/``kl``, or
+    ``k`` for highest) or drop (``dl``/``dh``, or ``d`` for lowest) some of their
+    results, e.g. ``8d6+3``, ``2d20kh1+5`` or ``4d6dl1``. Plans are cached, so parsing
+    the same expression again costs a dictionary lookup.
+
+    Parameters
+    ----------
+    expression : str
+        The dice expression. Case and whitespace around ``+`` and ``-`` are ignored.
+
+    Returns
+    -------
+    RollPlan: the compiled, immutable plan.
+    """
+    normalized = re.sub(r"\s*([+-])\s*", r"\1", expression.strip().lower())
+    if not normalized:
+        raise ValueError("Dice expression is empty.")
+    if any(character.isspace() for character in normalized):
+        raise ValueError(f"Invalid dice expression: {expression!r}")
+    terms = []
+    modifier = 0
+    position = 0
+    while position < len(normalized):
+        match = _TERM.match(normalized, position)
+        if not match or (position and not match["sign"]):
+            raise ValueError(f"Invalid dice expression: {expression!r}")
+        position = match.end()
+        sign = -1 if match["sign"] == "-" else 1
+        if match["constant"]:
+            modifier += sign * int(match["constant"])
+            continue
+        count = int(match["count"] or 1)
+        sides = int(match["sides"])
+        if count < 1 or sides < 1:
+            raise ValueError(f"Invalid dice in expression: {match[0]!r}")
+        highest = lowest = None
+        if match["keep"]:
+            keep_count = int(match["keep_count"])
+            if match["keep"] in ("k", "kh"):
+                highest = keep_count
+            elif match["keep"] == "kl":
+                lowest = keep_count
+            elif match["keep"] in ("d", "dl"):
+                highest = count - keep_count
+            else:
+                lowest = count - keep_count
+            if not 0 < (highest or lowest or 0) <= count:
+                raise ValueError(f"Cannot keep that many dice: {match[0]!r}")
+            if (highest or lowest) == count:
+                highest = lowest = None
+        terms.append(DiceTerm(count, sides, highest, lowest, sign))
+    return RollPlan(tuple(terms), modifier)
+
+
+@functools.lru_cache(maxsize=None)
+def _die(sides: int) -> Die:
+    return Die(sides)
+
+
+@functools.lru_cache(maxsize=1024)
+def _plan_distribution(plan: RollPlan) -> Distribution:
+    total = Distribution(plan.modifier, np.ones(1))
+    for term in plan.terms:
+        total = total + term.distribution()
+    return total
+
+
+def roll(
+    dice: list[Die], highest: int = None, lowest: int = None, rng: RandomStream = None
+):
+    return Roll(*dice).roll(highest, lowest, rng)
+
+
+def roll_batch(
+    dice: list[Die],
+    n: int,
+    highest: int = None,
+    lowest: int = None,
+    rng: RandomStream = None,
+):
+    return Roll(*dice).roll_batch(n, highest, lowest, rng)
+
+
+def distribution(dice: list[Die], highest: int = None, lowest: int = None):
+    return Roll(*dice).distribution(highest, lowest)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import typing
+
+import pygame as pg
+
+POINTER_EVENTS = (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEMOTION)
+
+
+class Target(typing.Protocol):
+    rect: pg.Rect
+
+    def handle_event(self, event: pg.event.Event) -> bool | None: ...
+
+
+def coalesce(events: typing.Iterable[pg.event.Event]) -> list[pg.event.Event]:
+    """
+    The events, with each run of consecutive MOUSEMOTION events merged into one at the
+    last position, moved by their combined ``rel``.
+    """
+    merged = []
+    for event in events:
+        previous = merged[-1] if merged else None
+        if (
+            event.type == pg.MOUSEMOTION
+            and previous is not None
+            and previous.type == pg.MOUSEMOTION
+        ):
+            merged[-1] = pg.event.Event(
+                pg.MOUSEMOTION,
+                {
+                    **event.dict,
+                    "rel": (
+                        previous.rel[0] + event.rel[0],
+                        previous.rel[1] + event.rel[1],
+                    ),
+                },
+            )
+        else:
+            merged.append(event)
+    return merged
+
+
+class HitIndex:
+    """
+    The rects of the targets on screen, hashed into a grid of cells, in z-order: later
+    targets are drawn over earlier ones.
+
+    Parameters
+    ----------
+    cell_size : int
+        The side of a cell, in pixels.
+    """
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self._targets: dict[int, Target] = {}
+        self._z: dict[int, int] = {}
+        self._rects: dict[int, pg.Rect] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._next_z = 0
+
+    def __len__(self):
+        return len(self._targets)
+
+    def __contains__(self, target: Target):
+        return id(target) in self._targets
+
+    def add(self, target: Target):
+        """
+        Add ``target`` on top of the others, or rehash it if it's already in.
+        """
+        key = id(target)
+        if key not in self._targets:
+            self._targets[key] = target
+            self._z[key] = self._next_z
+            self._next_z += 1
+        self.update(target)
+
+    def remove(self, target: Target):
+        key = id(target)
+        if self._targets.pop(key, None) is None:
+            return
+        del self._z[key]
+        self._unlink(key, self._rects.pop(key))
+
+    def update(self, target: Target):
+        """
+        Rehash ``target`` after its rect moved or changed size.
+        """
+        key = id(target)
+        rect = pg.Rect(target.rect)
+        old_rect = self._rects.get(key)
+        if rect == old_rect:
+            return
+        if old_rect is not None:
+            self._unlink(key, old_rect)
+        self._rects[key] = rect
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def at(self, position: tuple[int, int]) -> list[Target]:
+        """
+        The targets whose rect holds ``position``, topmost first.
+        """
+        cell = (position[0] // self.cell_size, position[1] // self.cell_size)
+        hits = [
+            key
+            for key in self._cells.get(cell, ())
+            if self._rects[key].collidepoint(position)
+        ]
+        hits.sort(key=self._z.__getitem__, reverse=True)
+        return [self._targets[key] for key in hits]
+
+    def _cells_of(self, rect: pg.Rect) -> typing.Iterator[tuple[int, int]]:
+        size = self.cell_size
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield x, y
+
+    def _unlink(self, key: int, rect: pg.Rect):
+        for cell in self._cells_of(rect):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+
+class EventRouter:
+    """
+    Sends events to the groups that should handle them.
+
+    Pointer events go to the groups under the pointer, topmost first, until one handles
+    them, so the cost of an event doesn't grow with the number of groups on screen. A
+    group handling a button press captures the pointer: motion goes only to it, and the
+    release to it first, until the button is released, so a dragged card keeps up with
+    a fast pointer. Other events go to every group, topmost first, until one handles
+    them.
+
+    Parameters
+    ----------
+    groups : list
+        The groups, in the order they are drawn.
+    """
+
+    def __init__(self, groups: typing.Iterable[Target] = ()):
+        self.index = HitIndex()
+        self.groups: list[Target] = []
+        self.captured: Target | None = None
+        for group in groups:
+            self.add(group)
+
+    def add(self, group: Target):
+        self.groups.append(group)
+        self.index.add(group)
+
+    def remove(self, group: Target):
+        self.groups.remove(group)
+        self.index.remove(group)
+        if self.captured is group:
+            self.captured = None
+
+    def update(self, group: Target):
+        """
+        Rehash ``group`` after something other than an event moved it.
+        """
+        self.index.update(group)
+
+    def dispatch(self, event: pg.event.Event) -> Target | None:
+        """
+        Send ``event`` on, and return the group that handled it, if any.
+        """
+        if event.type not in POINTER_EVENTS:
+            return self._first_to_handle(reversed(self.groups), event)
+        captured = self.captured
+        if event.type == pg.MOUSEBUTTONUP:
+            self.captured = None
+        if captured is not None and event.type != pg.MOUSEBUTTONDOWN:
+            handled = self._send(captured, event)
+            if handled or event.type == pg.MOUSEMOTION:
+                return captured if handled else None
+        targets = [
+            target for target in self.index.at(event.pos) if target is not captured
+        ]
+        handler = self._first_to_handle(targets, event)
+        if event.type == pg.MOUSEBUTTONDOWN and handler is not None:
+            self.captured = handler
+        return handler
+
+    def _first_to_handle(
+        self, groups: typing.Iterable[Target], event: pg.event.Event
+    ) -> Target | None:
+        for group in groups:
+            if self._send(group, event):
+                return group
+        return None
+
+    def _send(self, group: Target, event: pg.event.Event) -> bool:
+        handled = group.handle_event(event)
+        if group in self.index:
+            self.index.update(group)  # it may have moved
+        return bool(handled)
@@ -7,6 +7,8 @@ import nos.assets as assets
 import nos.cards as cards
 import nos.config as config
 import nos.desktop as desktop
+import nos.events as events
+import nos.rendering as rendering
 
 
 class Necronomy:
@@ -17,6 +19,12 @@ class Necronomy:
             (config.WINDOW["width"], config.WINDOW["height"])
         )
         self.clock = pygame.time.Clock()
+        # Redraw and update only what changed on screen, rather than everything.
+        self.renderer = (
+            rendering.DirtyRenderer(self.screen)
+            if config.GAME.get("dirty_rects", True)
+            else None
+        )
 
         assets.initialize()
 
@@ -42,15 +50,12 @@ class Necronomy:
             nos.Group([desktop.Desktop(), desktop.manifest.Manifest()]),
             *self.skeletons,
         ]
+        self.router = events.EventRouter(self.groups)
 
     def run(self):
         while True:
-            for event in pygame.event.get():
-                for group in reversed(self.groups):
-                    if group.handle_event(
-                        event
-                    ):  # If the event was fully handled, stop checking.
-                        break
+            for event in events.coalesce(pygame.event.get()):
+                self.router.dispatch(event)
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -58,10 +63,13 @@ class Necronomy:
             for group in self.groups:
                 group.update()
 
-            for group in self.groups:
-                group.draw(self.screen)
-            pygame.display.flip()
-            self.clock.tick(config.GAME["fps"])
+            if self.renderer:
+                pygame.display.update(self.renderer.draw(self.groups))
+            else:
+                for group in self.groups:
+                    group.draw(self.screen)
+                pygame.display.flip()
+            nos.ANIMATION_CLOCK.advance(self.clock.tick(config.GAME["fps"]))
 
     @staticmethod
     def quit(close=True):
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import typing
+
+import pygame as pg
+
+
+def _merge(rects: typing.Iterable[pg.Rect]) -> list[pg.Rect]:
+    """
+    The rects, with those that overlap merged into one.
+    """
+    merged: list[pg.Rect] = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """
+    Draws groups of sprites onto the screen, redrawing only where something changed.
+
+    A sprite has changed when it shows another image, for instance the next frame of
+    its animation, when it moved, when it was added to or removed from a group, for
+    instance a selection border, or when it sets its ``dirty`` flag after drawing on
+    its own image. Only the regions it covered and now covers are redrawn: the screen
+    is cleared there, and every sprite overlapping them, backgrounds included, is
+    blitted again clipped to them.
+
+    Parameters
+    ----------
+    screen : pg.Surface
+        The surface to draw on, usually the display.
+    background : pg.Color
+        The color under all the sprites.
+    """
+
+    def __init__(self, screen: pg.Surface, background: pg.Color = pg.Color("black")):
+        self.screen = screen
+        self.background = background
+        # What each sprite showed, and where, when last drawn.
+        self._drawn: dict[pg.sprite.Sprite, tuple[pg.Surface, pg.Rect]] = {}
+
+    def draw(self, groups: typing.Iterable[pg.sprite.AbstractGroup]) -> list[pg.Rect]:
+        """
+        Bring the screen up to date with ``groups``, drawn in order.
+
+        Returns
+        -------
+        list[pg.Rect]: the regions of the screen that changed, for
+            ``pg.display.update``.
+        """
+        layers = []
+        shown = {}
+        for group in groups:
+            for sprite in group.sprites():
+                image = sprite.image
+                rect = image.get_rect(topleft=(sprite.rect[0], sprite.rect[1]))
+                layers.append((image, rect))
+                shown[sprite] = (image, rect)
+        changed = []
+        for sprite, (image, rect) in shown.items():
+            drawn = self._drawn.get(sprite)
+            if drawn is None:
+                changed.append(rect)
+            elif (
+                drawn[0] is not image
+                or drawn[1] != rect
+                or getattr(sprite, "dirty", False)
+            ):
+                changed.append(rect)
+                changed.append(drawn[1])
+                sprite.dirty = False
+        changed.extend(
+            rect for sprite, (_, rect) in self._drawn.items() if sprite not in shown
+        )
+        self._drawn = shown
+        screen_rect = self.screen.get_rect()
+        dirty = _merge(
+            rect
+            for rect in (rect.clip(screen_rect) for rect in changed)
+            if rect.w and rect.h
+        )
+        for region in dirty:
+            self.screen.set_clip(region)
+            self.screen.fill(self.background)
+            for image, rect in layers:
+                if rect.colliderect(region):
+                    self.screen.blit(image, rect)
+        self.screen.set_clip(None)
+        return dirty
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import pygame as pg
+
+import nos.config as config
+
+# Bump when the rendering of assets changes, to ignore the entries made before.
+VERSION = 1
+
+# Width, height, tile width and tile height, ahead of the RGBA pixels of each entry.
+_HEADER = struct.Struct("<4i")
+
+
+@functools.lru_cache(maxsize=None)
+def _digest(path: Path, modified: int, size: int) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """
+    A hash of the contents of ``path``, computed once per version of the file.
+    """
+    path = Path(path)
+    stat = path.stat()
+    return _digest(path.resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+def key(*parts) -> str:
+    """
+    The name of the entry for an asset rendered from ``parts``, which must have a
+    stable ``repr``: tuples of strings and numbers.
+    """
+    return hashlib.blake2b(repr((VERSION, parts)).encode(), digest_size=16).hexdigest()
+
+
+class SpriteCache:
+    """
+    A directory of rendered sprite sheets, so later runs can skip decoding, compositing
+    and scaling them.
+
+    Each entry holds the final RGBA pixels of one asset, which are loaded back with
+    ``pg.image.frombuffer`` without any decoding. Entries are written to a temporary
+    file first and renamed into place, so an interrupted run never leaves a broken
+    entry behind.
+
+    Parameters
+    ----------
+    directory : Path
+        Where to keep the entries. Created when the first entry is stored.
+    enabled : bool
+        Whether to use the cache at all.
+    """
+
+    def __init__(self, directory: Path, enabled: bool = True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+
+    def load(self, name: str) -> tuple[pg.Surface, tuple[int, int]] | None:
+        """
+        The cached sprite sheet and tile size for ``name``, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        try:
+            data = (self.directory / name).read_bytes()
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        width, height, tile_width, tile_height = _HEADER.unpack_from(data)
+        pixels = memoryview(data)[_HEADER.size :]
+        if len(pixels) != width * height * 4:
+            return None
+        surface = pg.image.frombuffer(pixels, (width, height), "RGBA")
+        return surface, (tile_width, tile_height)
+
+    def store(self, name: str, surface: pg.Surface, tile_size: tuple[int, int]):
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = _HEADER.pack(*surface.get_size(), *tile_size)
+        pixels = pg.image.tobytes(surface, "RGBA")
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as file:
+            file.write(header)
+            file.write(pixels)
+        os.replace(file.name, self.directory / name)
+
+    def clear(self):
+        if self.directory.is_dir():
+            for entry in self.directory.iterdir():
+                entry.unlink()
+
+
+CACHE = SpriteCache(
+    config.CACHE.get("sprites", ".cache/sprites"), config.CACHE.get("enabled", True)
+)
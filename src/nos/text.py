@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+
+import pygame as pg
+
+import nos.config as config
+
+Color = pg.Color | str | tuple[int, int, int] | tuple[int, int, int, int]
+
+
+@functools.lru_cache(maxsize=None)
+def font(
+    path: Path | None,
+    size: int,
+    bold: bool = False,
+    italic: bool = False,
+    underline: bool = False,
+) -> pg.font.Font:
+    """
+    The font at ``path`` in ``size`` points and the given style, opened once for the
+    whole game. It is shared: don't change its style, ask for another one instead.
+    """
+    opened = pg.font.Font(path, size)
+    opened.bold, opened.italic, opened.underline = bold, italic, underline
+    return opened
+
+
+@functools.lru_cache(maxsize=config.CACHE.get("text", 512))
+def _render(
+    font: pg.font.Font, text: str, color: tuple[int, ...], antialias: bool
+) -> pg.Surface:
+    return font.render(text, antialias, color)
+
+
+def render(
+    font: pg.font.Font, text: str, color: Color, antialias: bool = True
+) -> pg.Surface:
+    """
+    ``text`` rendered in ``font``, rasterized once while it stays among the most
+    recently rendered texts. The surface is shared: copy it before drawing on it.
+    """
+    return _render(font, text, tuple(pg.Color(color)), antialias)
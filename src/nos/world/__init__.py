@@ -1,16 +1,36 @@
 from __future__ import annotations
 
 import dataclasses
+import heapq
+import itertools
 import typing
 from abc import ABC
 
 from nos import assets
-from nos.world.abilities import Abilities, Skill
-from nos.world.conditions import Condition
+from nos.world.abilities import DEFAULT_ABILITIES, Abilities, Skill
+from nos.world.actions import (  # noqa: F401
+    Action,
+    BonusAction,
+    ItemInteraction,
+    Phase,
+    Reaction,
+)
+from nos.world.conditions import (
+    TURN_PHASES,
+    Condition,
+    ConditionEffects,
+    condition_mask,
+    effects,
+    is_blocking_action,
+)
+from nos.world.derived import derived
 from nos.world.movement import Movement, Position
 
+if typing.TYPE_CHECKING:
+    from nos.world.spatial import SpatialIndex
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class Size(ABC):
     square_size: typing.ClassVar[
         float
@@ -24,7 +44,7 @@ class Size(ABC):
     weight: float = None  # in pounds
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Tiny(Size):
     square_size: typing.ClassVar[float] = 0.5
     carrying_capacity_multiplier: typing.ClassVar[float] = 7.5
@@ -34,7 +54,7 @@ class Tiny(Size):
     weight: float = 10
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Small(Size):
     square_size: typing.ClassVar[float] = 1
     carrying_capacity_multiplier: typing.ClassVar[float] = 15
@@ -44,7 +64,7 @@ class Small(Size):
     weight: float = 50
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Medium(Size):
     square_size: typing.ClassVar[float] = 1
     carrying_capacity_multiplier: typing.ClassVar[float] = 15
@@ -54,7 +74,7 @@ class Medium(Size):
     weight: float = 150
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Large(Size):
     square_size: typing.ClassVar[float] = 2
     carrying_capacity_multiplier: typing.ClassVar[float] = 30
@@ -64,7 +84,7 @@ class Large(Size):
     weight: float = 600
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Huge(Size):
     square_size: typing.ClassVar[float] = 3
     carrying_capacity_multiplier: typing.ClassVar[float] = 60
@@ -74,7 +94,7 @@ class Huge(Size):
     weight: float = 2500
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Gargantuan(Size):
     square_size: typing.ClassVar[float] = 4
     carrying_capacity_multiplier: typing.ClassVar[float] = 120
@@ -84,29 +104,7 @@ class Gargantuan(Size):
     weight: float = 8000
 
 
-@dataclasses.dataclass
-class Phase(ABC):
-    name: str
-    description: str
-
-
-class Action(Phase):
-    pass
-
-
-class BonusAction(Action):
-    pass
-
-
-class Reaction(Action):
-    pass
-
-
-class ItemInteraction(Action):
-    pass
-
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Turn:
     """
     A turn in combat. If the attribute is None, it is available to be used.
@@ -137,7 +135,7 @@ class Turn:
         self.reaction = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Entity:
     name: str
     description: str
@@ -148,12 +146,53 @@ class Entity:
     asset: assets.Asset = None
     movements: list[Movement] = dataclasses.field(default_factory=list)
     conditions: list[Condition] = dataclasses.field(default_factory=list)
-    abilities: Abilities = dataclasses.field(default_factory=Abilities)
+    abilities: Abilities = DEFAULT_ABILITIES
     proficiencies: list[Skill] = dataclasses.field(default_factory=list)
     world_position: Position = dataclasses.field(default_factory=Position)
     turn: Turn = dataclasses.field(default_factory=Turn)
     critical_hit_minimum: int = 20
     proficiency_bonus: int = 2
+    condition_flags: int = dataclasses.field(default=0, init=False)
+    turns_started: int = dataclasses.field(default=0, init=False)
+    _condition_expiries: list[tuple[int, int, Condition]] = dataclasses.field(
+        default_factory=list, init=False, repr=False
+    )
+    # The (turn, token) of the expiry entry still valid for each condition, by id.
+    _condition_due: dict[int, tuple[int, int]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    spatial_index: SpatialIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )  # the index this entity is in, set by SpatialIndex.add
+    _derived: dict[str, typing.Any] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )  # cached values of the ``derived`` properties
+    """
+    Attributes
+    ----------
+    conditions : list[Condition]
+        The active conditions. Add and remove them with ``add_condition`` and
+        ``remove_condition``, which keep ``condition_flags`` and expiries up to date.
+    condition_flags : int
+        The bitmask of the active conditions, see ``conditions.STANDARD_CONDITIONS``.
+    turns_started : int
+        The number of turns this entity has started, which condition durations count.
+    movements : list[Movement]
+        The entity's own movements. Conditions leave them alone and show in
+        ``effective_movements`` and ``speed`` instead.
+    """
+
+    def invalidate(self, *inputs: str):
+        """
+        Forget the cached ``derived`` values that depend on any of ``inputs``.
+        """
+        cache = getattr(self, "_derived", None)
+        if not cache:
+            return
+        inputs = set(inputs)
+        for name in list(cache):
+            if getattr(type(self), name).inputs & inputs:
+                del cache[name]
 
     def __post_init__(self):
         self.current_hit_points = (
@@ -161,37 +200,258 @@ class Entity:
             if self.current_hit_points is None
             else self.current_hit_points
         )
+        initial_conditions, self.conditions = self.conditions, []
+        for condition in initial_conditions:
+            self.add_condition(condition)
+
+    def add_condition(self, condition: Condition):
+        self.conditions.append(condition)
+        self.condition_flags |= condition.bit
+        self.invalidate("conditions")
+        if condition.remaining_duration:
+            due = (
+                self.turns_started + condition.remaining_duration,
+                next(_expiry_order),
+            )
+            self._condition_due[id(condition)] = due
+            heapq.heappush(self._condition_expiries, (*due, condition))
+        self._block_phases()
+
+    def remove_condition(self, condition: Condition):
+        """
+        End ``condition`` early. Its pending expiry is skipped when it comes due, even
+        if the condition is added again.
+        """
+        for index, active in enumerate(self.conditions):
+            if active is condition:
+                del self.conditions[index]
+                break
+        else:
+            return
+        self._condition_due.pop(id(condition), None)
+        self.condition_flags = condition_mask(self.conditions)
+        self.invalidate("conditions")
+        self._block_phases()
+
+    def has_condition(self, condition: type[Condition]) -> bool:
+        """
+        Whether this entity has ``condition``, or a condition that implies it.
+        """
+        return bool(self.condition_flags & condition.implied_by)
+
+    @property
+    def condition_effects(self) -> ConditionEffects:
+        return effects(self.condition_flags)
+
+    @property
+    def attack_situation(self) -> str | None:
+        return self.condition_effects.attack_situation
+
+    @property
+    def defense_situation(self) -> str | None:
+        return self.condition_effects.defense_situation
+
+    def automatically_fails(self, saving_throw: str) -> bool:
+        return saving_throw in self.condition_effects.failed_saves
+
+    @derived("movements", "conditions")
+    def effective_movements(self) -> tuple[Movement, ...]:
+        """
+        The movements left to this entity by its conditions: only crawling while prone,
+        at half its walking speed, and nothing while immobilized.
+        """
+        return self.condition_effects.limit_movements(self.movements)
+
+    @derived("movements", "conditions")
+    def speed(self) -> int:
+        return max((movement.speed for movement in self.effective_movements), default=0)
+
+    @property
+    def remaining_movement(self) -> float:
+        """
+        The feet this entity can still move this turn, at its fastest speed.
+        """
+        return max(self.speed - self.turn.movement, 0)
+
+    def _block_phases(self):
+        # Fill the parts of the turn that conditions take away, and free those they
+        # gave back, leaving any already used alone.
+        condition_effects = self.condition_effects
+        for phase in TURN_PHASES:
+            used = getattr(self.turn, phase)
+            if phase in condition_effects.blocked_phases:
+                if used is None:
+                    setattr(self.turn, phase, condition_effects.blocking_action)
+            elif used is not None and is_blocking_action(used):
+                setattr(self.turn, phase, None)
+
+    def remaining_duration(self, condition: Condition) -> int | None:
+        due = self._condition_due.get(id(condition))
+        return None if due is None else due[0] - self.turns_started
 
     def start_turn(self):
         self.turn.start()
-        for condition in self.conditions:
-            if condition.remaining_duration:
-                condition.remaining_duration -= 1
-        self.conditions = [
-            condition
-            for condition in self.conditions
-            if condition.remaining_duration is None or condition.remaining_duration > 0
-        ]
-        for condition in self.conditions:
-            condition.apply_to(self)
-
-
-@dataclasses.dataclass
+        self.turns_started += 1
+        expiries = self._condition_expiries
+        while expiries and expiries[0][0] <= self.turns_started:
+            expires_at, token, condition = heapq.heappop(expiries)
+            if self._condition_due.get(id(condition)) == (expires_at, token):
+                self.remove_condition(condition)
+        if self.condition_effects.blocked_phases:
+            self._block_phases()
+
+
+_expiry_order = itertools.count()  # breaks ties between conditions expiring together
+
+
+def _derived_input(name: str) -> property:
+    # Wraps the slot of the Entity field ``name`` so that reassigning it forgets the
+    # ``derived`` values depending on it. Other fields are written straight to their
+    # slots, at no extra cost.
+    slot = getattr(Entity, name)
+
+    def set_input(entity: Entity, value):
+        slot.__set__(entity, value)
+        entity.invalidate(name)
+
+    return property(slot.__get__, set_input, doc=slot.__doc__)
+
+
+for _name in ("abilities", "movements", "size"):
+    setattr(Entity, _name, _derived_input(_name))
+
+
+@dataclasses.dataclass(slots=True)
 class Item(Entity):
     value: int = 0
+    container: Container | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )  # the container holding this item, kept up to date by Container.add_item
+
+    def get_weight(self) -> float:
+        return self.size.weight or 0
+
+    def get_value(self) -> int:
+        return self.value
+
+    def set_weight(self, weight: float):
+        """
+        Change the weight of this item, updating the totals of the containers holding it.
+        The item gets a Size of its own, as items such as arrows may share one.
+        """
+        delta = weight - (self.size.weight or 0)
+        self.size = dataclasses.replace(self.size, weight=weight)
+        self._propagate(delta, 0, 0)
+
+    def set_value(self, value: int):
+        delta = value - self.value
+        self.value = value
+        self._propagate(0, 0, delta)
+
+    def _propagate(self, weight: float, count: int, value: int):
+        container = self.container
+        while container is not None:
+            container._weight += weight
+            container._item_count += count
+            container._value += value
+            container = container.container
+
+
+@dataclasses.dataclass(slots=True)
+class Container(Item):
+    """
+    An item holding other items, which may be containers themselves.
 
+    The total weight, value and item count of everything inside are cached on each
+    container, and updated along the chain of containers holding it whenever an item is
+    added, removed or changed, so reading them costs O(1) and changing the contents
+    costs O(depth). Change the contents with ``add_item`` and ``remove_item``, and
+    item weights and values with ``Item.set_weight`` and ``Item.set_value``.
+    """
 
-@dataclasses.dataclass
-class Container(Item):
     capacity: float = None  # weight in pounds
     volume: float = None  # in cubic feet
     items: list[Item] = dataclasses.field(default_factory=list)
+    _weight: float = dataclasses.field(default=0, init=False, repr=False)
+    _item_count: int = dataclasses.field(default=0, init=False, repr=False)
+    _value: int = dataclasses.field(default=0, init=False, repr=False)
 
-    def get_weight(self):
-        return (
-            sum(
-                item.get_weight() if isinstance(item, Container) else item.size.weight
-                for item in self.items
-            )
-            + self.size.weight
+    def __post_init__(self):
+        Entity.__post_init__(self)
+        for item in self.items:
+            item.container = self
+        self.recompute()
+
+    def get_weight(self) -> float:
+        return self._weight
+
+    def get_value(self) -> int:
+        return self._value
+
+    def item_count(self) -> int:
+        """
+        The number of items inside this container, including those in nested containers.
+        """
+        return self._item_count
+
+    def add_item(self, item: Item):
+        container = self
+        while container is not None:
+            if container is item:
+                raise ValueError(f"Cannot put {item.name} inside itself.")
+            container = container.container
+        if item.container is not None:
+            item.container.remove_item(item)
+        self.items.append(item)
+        item.container = self
+        item._propagate(item.get_weight(), _count_of(item), item.get_value())
+
+    def remove_item(self, item: Item):
+        # By identity, as identical items (e.g. a quiver of arrows) compare equal.
+        for index, contained in enumerate(self.items):
+            if contained is item:
+                del self.items[index]
+                break
+        else:
+            raise ValueError(f"{item.name} is not in {self.name}.")
+        item._propagate(-item.get_weight(), -_count_of(item), -item.get_value())
+        item.container = None
+
+    def set_weight(self, weight: float):
+        delta = weight - (self.size.weight or 0)
+        self.size = dataclasses.replace(self.size, weight=weight)
+        self._weight += delta
+        self._propagate(delta, 0, 0)
+
+    def set_value(self, value: int):
+        delta = value - self.value
+        self.value = value
+        self._value += delta
+        self._propagate(0, 0, delta)
+
+    def recompute(self):
+        """
+        Rebuild the cached totals of this container and everything inside it from scratch,
+        e.g. after changing ``items`` directly, and update the containers holding it.
+        """
+        weight, count, value = self._weight, self._item_count, self._value
+        self._rebuild()
+        self._propagate(
+            self._weight - weight, self._item_count - count, self._value - value
         )
+
+    def _rebuild(self):
+        self._weight = self.size.weight or 0
+        self._item_count = len(self.items)
+        self._value = self.value
+        for item in self.items:
+            item.container = self
+            if isinstance(item, Container):
+                item._rebuild()
+                self._item_count += item._item_count
+            self._weight += item.get_weight()
+            self._value += item.get_value()
+
+
+def _count_of(item: Item) -> int:
+    return 1 + (item._item_count if isinstance(item, Container) else 0)
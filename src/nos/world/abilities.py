@@ -2,57 +2,73 @@ import dataclasses
 from abc import ABC
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class Ability(ABC):
-    name: str
+    """
+    An ability score. Abilities are immutable, so one instance can be shared by every
+    creature with that score; give a creature a new score by replacing the Ability.
+    """
+
+    name: str = None
     score: int = 10
     bonus: int = dataclasses.field(init=False)
 
     def __post_init__(self):
-        self.bonus = (self.score - 10) // 2
+        object.__setattr__(self, "name", self.name or type(self).__name__)
+        object.__setattr__(self, "bonus", (self.score - 10) // 2)
 
     def __str__(self):
         return f"{self.bonus:+d} {self.name} ({self.score})"
 
 
 class Strength(Ability):
-    name = "Strength"
+    __slots__ = ()
 
 
 class Dexterity(Ability):
-    name = "Dexterity"
+    __slots__ = ()
 
 
 class Constitution(Ability):
-    name = "Constitution"
+    __slots__ = ()
 
 
 class Intelligence(Ability):
-    name = "Intelligence"
+    __slots__ = ()
 
 
 class Wisdom(Ability):
-    name = "Wisdom"
+    __slots__ = ()
 
 
 class Charisma(Ability):
-    name = "Charisma"
+    __slots__ = ()
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class Abilities:
-    strength: Strength = dataclasses.field(default_factory=Strength)
-    dexterity: Dexterity = dataclasses.field(default_factory=Dexterity)
-    constitution: Constitution = dataclasses.field(default_factory=Constitution)
-    intelligence: Intelligence = dataclasses.field(default_factory=Intelligence)
-    wisdom: Wisdom = dataclasses.field(default_factory=Wisdom)
-    charisma: Charisma = dataclasses.field(default_factory=Charisma)
+    """
+    A creature's six ability scores. Like each Ability, Abilities are immutable and
+    shared, e.g. ``DEFAULT_ABILITIES`` by every creature that doesn't specify its own.
+    """
+
+    strength: Strength = Strength()
+    dexterity: Dexterity = Dexterity()
+    constitution: Constitution = Constitution()
+    intelligence: Intelligence = Intelligence()
+    wisdom: Wisdom = Wisdom()
+    charisma: Charisma = Charisma()
 
     def __str__(self):
-        return "\n".join(str(ability) for ability in dataclasses.astuple(self))
+        return "\n".join(
+            str(getattr(self, field.name)) for field in dataclasses.fields(self)
+        )
+
+
+DEFAULT_ABILITIES = Abilities()
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class Skill:
     name: str
     associated_ability: type[Ability]
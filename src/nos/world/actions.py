@@ -0,0 +1,24 @@
+import dataclasses
+from abc import ABC
+
+
+@dataclasses.dataclass
+class Phase(ABC):
+    name: str
+    description: str
+
+
+class Action(Phase):
+    pass
+
+
+class BonusAction(Action):
+    pass
+
+
+class Reaction(Action):
+    pass
+
+
+class ItemInteraction(Action):
+    pass
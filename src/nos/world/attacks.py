@@ -1,11 +1,137 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
+import typing
+
+import numpy as np
 
 import nos.world as world
 import nos.world.abilities as abilities
+import nos.world.spatial as spatial
 from nos import dice
 
+ARMOR_CLASSES = np.arange(5, 31)
+
+
+@dataclasses.dataclass
+class AttackResults:
+    """
+    The results of many attacks resolved at once by ``Attack.resolve_many``.
+
+    Attributes
+    ----------
+    rolls : np.ndarray
+        The d20 roll of each attack, after advantage or disadvantage.
+    totals : np.ndarray
+        The attack roll total of each attack, including all bonuses.
+    hits : np.ndarray
+        Whether each attack hit, including critical hits.
+    crits : np.ndarray
+        Whether each attack was a critical hit.
+    damage : np.ndarray
+        The damage dealt by each attack, 0 on a miss.
+    """
+
+    rolls: np.ndarray
+    totals: np.ndarray
+    hits: np.ndarray
+    crits: np.ndarray
+    damage: np.ndarray
+
+    @property
+    def misses(self) -> np.ndarray:
+        return ~self.hits
+
+    @property
+    def fumbles(self) -> np.ndarray:
+        return self.rolls == 1
+
+    @property
+    def total_damage(self) -> int:
+        return int(self.damage.sum())
+
+    def __len__(self):
+        return self.rolls.size
+
+    def __str__(self):
+        return (
+            f"{int(self.hits.sum())}/{len(self)} hits "
+            f"({int(self.crits.sum())} critical) for {self.total_damage} damage"
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class AttackOdds:
+    """
+    The exact chances of an attack against a single armor class.
+    """
+
+    armor_class: int
+    hit_chance: float
+    crit_chance: float
+    expected_damage: float
+
+    def __str__(self):
+        return (
+            f"AC {self.armor_class}: {self.hit_chance:.0%} to hit "
+            f"({self.crit_chance:.0%} critical), {self.expected_damage:.1f} damage"
+        )
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class AttackOddsTable:
+    """
+    The exact chances of an attack against each armor class in ``armor_classes``.
+
+    The arrays are read-only, as tables are shared between attacks with the same numbers.
+    """
+
+    armor_classes: np.ndarray
+    hit_chance: np.ndarray
+    crit_chance: np.ndarray
+    expected_damage: np.ndarray
+
+    def __post_init__(self):
+        for array in dataclasses.astuple(self):
+            array.flags.writeable = False
+
+    def __getitem__(self, armor_class: int) -> AttackOdds:
+        index = armor_class - self.armor_classes[0]
+        if not 0 <= index < self.armor_classes.size:
+            raise KeyError(f"AC {armor_class} is not in this table.")
+        return AttackOdds(
+            armor_class,
+            float(self.hit_chance[index]),
+            float(self.crit_chance[index]),
+            float(self.expected_damage[index]),
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def _odds_table(
+    attack_bonus: int,
+    damage_bonus: int,
+    damage_distribution: dice.Distribution,
+    critical_damage: int,
+    crit_range_min: int,
+    situation: str,
+    armor_classes: tuple[int, ...],
+) -> AttackOddsTable:
+    d20 = dice.d20.distribution(situation)
+    rolls = d20.outcomes
+    landed = rolls != 1
+    crits = landed & (rolls >= crit_range_min)
+    armor_class = np.array(armor_classes)
+    hits = crits | (landed & (rolls + attack_bonus >= armor_class[:, np.newaxis]))
+    hit_chance = hits @ d20.pmf
+    crit_chance = np.full(armor_class.shape, crits @ d20.pmf)
+    expected_damage = (
+        hit_chance * (damage_distribution.expected_value + damage_bonus)
+        + crit_chance * critical_damage
+    )
+    return AttackOddsTable(armor_class, hit_chance, crit_chance, expected_damage)
+
 
 @dataclasses.dataclass
 class Attack(world.Action):
@@ -22,19 +148,21 @@ class Attack(world.Action):
         target: world.Entity,
         situation: str = None,
         crit_range_min: int = 20,
+        rng: dice.RandomStream = None,
     ):
-        die_roll = dice.roll(dice.d20, situation)
+        rng = rng or dice.current_stream()
+        die_roll = dice.d20.roll(situation, rng)
         effects_on_hit = []
         effects_on_miss = []
         if die_roll == 1:
             return 0, 0, effects_on_miss
         damage = (
-            self.weapon.damage_roll.roll()
+            self.weapon.damage_roll.roll(rng=rng)
             + self.weapon.damage_bonus
             + self.ability.bonus
         )
         if die_roll >= crit_range_min:
-            damage += sum(die.sides for die in self.weapon.damage_roll.dice)
+            damage += self.weapon.critical_damage
             return True, damage, effects_on_hit
         hit = (
             self.ability.bonus
@@ -49,14 +177,191 @@ class Attack(world.Action):
             effects = effects_on_hit
         return hit, damage, effects
 
+    def resolve_many(
+        self,
+        attackers: int | typing.Sequence[world.Entity],
+        targets: world.Entity | typing.Sequence[world.Entity],
+        situation: str = None,
+        crit_range_min: int = 20,
+        rng: dice.RandomStream = None,
+    ) -> AttackResults:
+        """
+        Resolve this attack for a whole group of attackers in one vectorized pass.
+
+        Follows the same rules as ``resolve``: a natural 1 always misses, a roll of at
+        least ``crit_range_min`` is a critical hit that adds the maximum of the damage
+        dice, and any other roll hits if its total meets the target's armor class.
 
+        Parameters
+        ----------
+        attackers : int | Sequence[Entity]
+            The number of attackers, or the attacking entities themselves.
+        targets : Entity | Sequence[Entity]
+            The target of every attack, or one target per attacker.
+        situation : str
+            One of the ``dice.Situation`` values, applied to every attack roll.
+        crit_range_min : int
+            The lowest d20 roll that is a critical hit.
+        rng : dice.RandomStream
+            The stream to roll with, defaulting to the current stream.
+
+        Returns
+        -------
+        AttackResults: the per-attack rolls, hit/crit flags and damage.
+        """
+        rng = rng or dice.current_stream()
+        count = attackers if isinstance(attackers, int) else len(attackers)
+        if isinstance(targets, world.Entity):
+            armor_class = targets.armor_class
+        elif isinstance(getattr(targets, "armor_class", None), np.ndarray):
+            # A Horde, which already stores its armor classes as an array.
+            if len(targets) != count:
+                raise ValueError("Give either one target, or one target per attacker.")
+            armor_class = targets.armor_class
+        else:
+            if len(targets) != count:
+                raise ValueError("Give either one target, or one target per attacker.")
+            armor_class = np.fromiter(
+                (target.armor_class for target in targets), dtype=np.int64, count=count
+            )
+        rolls = dice.d20.roll_many(count, situation, rng)
+        totals = (
+            rolls
+            + self.ability.bonus
+            + self.proficiency_bonus
+            + self.weapon.attack_bonus
+        )
+        landed = rolls != 1
+        crits = landed & (rolls >= crit_range_min)
+        hits = crits | (landed & (totals >= armor_class))
+        damage = (
+            self.weapon.damage_roll.roll_batch(count, rng=rng)
+            + self.weapon.damage_bonus
+            + self.ability.bonus
+        )
+        damage += np.where(crits, self.weapon.critical_damage, 0)
+        return AttackResults(
+            rolls=rolls,
+            totals=totals,
+            hits=hits,
+            crits=crits,
+            damage=np.where(hits, damage, 0),
+        )
+
+    def targets_in_range(
+        self,
+        attacker: world.Entity,
+        index: spatial.SpatialIndex,
+        predicate: typing.Callable[[world.Entity], bool] = None,
+    ) -> list[world.Entity]:
+        """
+        The entities in ``index`` within this attack's range of ``attacker``, nearest first.
+        """
+        return index.within(attacker, self.range, predicate)
+
+    def odds_table(
+        self,
+        situation: str = None,
+        crit_range_min: int = 20,
+        armor_classes: typing.Iterable[int] = ARMOR_CLASSES,
+    ) -> AttackOddsTable:
+        """
+        The exact hit chance, crit chance and expected damage of this attack by target AC.
+
+        Tables are computed once and cached by the numbers that go into them (the
+        ability bonus, proficiency bonus and weapon), so a table is recomputed only
+        after one of those changes.
+
+        Parameters
+        ----------
+        situation : str
+            One of the ``dice.Situation`` values, applied to the attack roll.
+        crit_range_min : int
+            The lowest d20 roll that is a critical hit.
+        armor_classes : Iterable[int]
+            Consecutive armor classes to tabulate, AC 5 to 30 by default.
+
+        Returns
+        -------
+        AttackOddsTable: the odds, indexable by armor class.
+        """
+        return _odds_table(
+            self.ability.bonus + self.proficiency_bonus + self.weapon.attack_bonus,
+            self.weapon.damage_bonus + self.ability.bonus,
+            self.weapon.damage_roll.distribution(),
+            self.weapon.critical_damage,
+            crit_range_min,
+            situation,
+            tuple(int(armor_class) for armor_class in armor_classes),
+        )
+
+    def odds(
+        self, target: world.Entity, situation: str = None, crit_range_min: int = 20
+    ) -> AttackOdds:
+        """
+        The exact odds of this attack against ``target``, e.g. to show on its card.
+        """
+        armor_class = target.armor_class
+        table = self.odds_table(situation, crit_range_min)
+        if table.armor_classes[0] <= armor_class <= table.armor_classes[-1]:
+            return table[armor_class]
+        return self.odds_table(situation, crit_range_min, (armor_class,))[armor_class]
+
+    def resolve_average(
+        self,
+        count: int,
+        target: world.Entity,
+        situation: str = None,
+        crit_range_min: int = 20,
+    ) -> tuple[int, int]:
+        """
+        Resolve ``count`` identical attacks without rolling, using their expected results.
+
+        Returns
+        -------
+        tuple[int, int]: the number of hits and the total damage, rounded.
+        """
+        odds = self.odds(target, situation, crit_range_min)
+        return round(count * odds.hit_chance), round(count * odds.expected_damage)
+
+
+@dataclasses.dataclass(slots=True)
 class Weapon(world.Item):
-    attack_bonus: int
-    damage_bonus: int
-    damage_roll: dice.Roll
-    range: int
-    reach: int
+    attack_bonus: int = 0
+    damage_bonus: int = 0
+    damage_roll: dice.Roll | dice.RollPlan | str = None
+    range: int = 5
+    reach: int = 5
     properties: list[str] = dataclasses.field(default_factory=list)
 
+    def __post_init__(self):
+        # Slotted dataclasses are rebuilt as new classes, which breaks a bare super().
+        world.Item.__post_init__(self)
+        if isinstance(self.damage_roll, str):
+            self.damage_roll = dice.parse(self.damage_roll)
+
+    @property
+    def critical_damage(self) -> int:
+        """
+        The damage a critical hit adds: the maximum of the dice the damage roll keeps,
+        less that of the dice it subtracts, e.g. 20 for ``2d20kh1``, 2 for ``1d6-1d4``.
+        """
+        if isinstance(self.damage_roll, dice.RollPlan):
+            return sum(
+                term.sign * term.kept * term.sides for term in self.damage_roll.terms
+            )
+        return sum(die.sides for die in self.damage_roll.dice)
+
+    def targets_in_reach(
+        self,
+        wielder: world.Entity,
+        index: spatial.SpatialIndex,
+        predicate: typing.Callable[[world.Entity], bool] = None,
+    ) -> list[world.Entity]:
+        """
+        The entities in ``index`` within this weapon's reach of ``wielder``, nearest first.
+        """
+        return index.within(wielder, self.reach, predicate)
+
     def __str__(self):
         return f"{self.name}"
@@ -1,15 +1,34 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import typing
 
-import nos.world as world
-import nos.world.movement as world_movement
+import nos.world.actions as actions
+import nos.world.movement as movement
+from nos.dice import Situation
 
+# The parts of a turn that conditions such as Incapacitated can take away.
+TURN_PHASES = frozenset(("action", "bonus_action", "reaction"))
+# Saving throws that some conditions make fail automatically.
+STRENGTH_AND_DEXTERITY = frozenset(("strength", "dexterity"))
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class Condition:
     description: typing.ClassVar[str] = None
+    bit: typing.ClassVar[int] = 0  # flag in a bitmask of STANDARD_CONDITIONS
+    implied_by: typing.ClassVar[int] = 0  # its flag and those of conditions implying it
+    # What the condition does to the entity's derived stats, see ``effects``. Combined
+    # conditions inherit these from the conditions they are made of.
+    stops_movement: typing.ClassVar[bool] = False
+    crawling: typing.ClassVar[bool] = False  # the only movement left is crawling
+    blocked_phases: typing.ClassVar[frozenset[str]] = frozenset()
+    blocking_action: typing.ClassVar[actions.Action] = None  # fills blocked phases
+    attack_situation: typing.ClassVar[str] = None  # of the entity's own attack rolls
+    defense_situation: typing.ClassVar[str] = None  # of attack rolls against it
+    failed_saves: typing.ClassVar[frozenset[str]] = frozenset()
+    save_disadvantages: typing.ClassVar[frozenset[str]] = frozenset()
     name: str = None
     duration: int = None  # in turns (6 seconds)
     remaining_duration: int = dataclasses.field(default=None)  # in turns (6 seconds)
@@ -28,14 +47,11 @@ class Condition:
             string += f" for {self.remaining_duration} turns"
         return string
 
-    def apply_to(self, entity):
-        pass
-
-    def remove_from(self, entity):
-        pass
-
 
 class Blinded(Condition):
+    __slots__ = ()
+    attack_situation = Situation.DISADVANTAGE
+    defense_situation = Situation.ADVANTAGE
     description = "A blinded creature can't see and automatically fails any ability check that requires sight."
 
 
@@ -48,6 +64,7 @@ class Charmed(Condition):
 
 
 class Deafened(Condition):
+    __slots__ = ()
     description = "A deafened creature can't hear and automatically fails any ability check that requires hearing."
 
 
@@ -56,57 +73,43 @@ class Frightened(Condition):
         "A frightened creature has disadvantage on ability checks and attack rolls "
         "while the source of its fear is within line of sight."
     )
+    # Taken to apply at all times; see nos.world.visibility to check the line of sight.
+    attack_situation = Situation.DISADVANTAGE
     by: object = None
 
 
 class Immobilized(Condition):
+    __slots__ = ()
     description = "An immobilized creature has zero movement speed."
-    _original_speed: dict[str, int] = dataclasses.field(
-        init=False, default_factory=dict
-    )
-
-    def apply_to(self, entity):
-        self._original_speed = {}
-        for movement in entity.movements:
-            self._original_speed[movement] = movement.speed
-            movement.speed = 0
-
-    def remove_from(self, entity):
-        for movement in entity.movements:
-            movement.speed = self._original_speed[movement.name]
+    stops_movement = True
 
 
 class Grappled(Condition):
     description = "A grappled creature's speed becomes 0, and it can't benefit from any bonus to its speed."
+    stops_movement = True
     by: object = None
 
 
 class Incapacitated(Condition):
+    __slots__ = ()
     description = "An incapacitated creature can't take actions or reactions."
-    _action: typing.ClassVar[world.Action] = world.Action(
-        name="Incapacitated", description=description
-    )
-
-    def apply_to(self, entity):
-        entity.action = self._action
-        entity.bonus_action = self._action
-        entity.reaction = self._action
-
-    def remove_from(self, entity):
-        entity.action = None
-        entity.bonus_action = None
-        entity.reaction = None
+    blocked_phases = TURN_PHASES
+    blocking_action = actions.Action(name="Incapacitated", description=description)
 
 
 class Invisible(Condition):
+    __slots__ = ()
     description = (
         "An invisible creature is impossible to see without the aid of magic or a special sense. "
         "For the purpose of hiding, the creature is heavily obscured. "
         "The creature's location can be detected by any noise it makes or any tracks it leaves."
     )
+    attack_situation = Situation.ADVANTAGE
+    defense_situation = Situation.DISADVANTAGE
 
 
 class Paralyzed(Incapacitated, Immobilized):
+    __slots__ = ()
     description = (
         "A paralyzed creature is incapacitated and can't move or speak. "
         + Incapacitated.description
@@ -114,82 +117,58 @@ class Paralyzed(Incapacitated, Immobilized):
         "Attack rolls against the creature have advantage. "
         "Any attack that hits the creature is a critical hit if the attacker is within 5 feet of the creature."
     )
-
-    def apply_to(self, entity):
-        Incapacitated.apply_to(self, entity)
-        Immobilized.apply_to(self, entity)
-
-    def remove_from(self, entity):
-        Incapacitated.apply_to(self, entity)
-        Immobilized.apply_to(self, entity)
+    defense_situation = Situation.ADVANTAGE
+    failed_saves = STRENGTH_AND_DEXTERITY
 
 
 class Petrified(Incapacitated, Immobilized):
+    __slots__ = ()
     description = (
         "A petrified creature is transformed, along with any nonmagical object it is wearing or carrying, "
         "into a solid inanimate substance (usually stone). "
         "Its weight increases by a factor of ten, and it ceases aging."
     )
-
-    def apply_to(self, entity):
-        Incapacitated.apply_to(self, entity)
-        Immobilized.apply_to(self, entity)
-
-    def remove_from(self, entity):
-        Incapacitated.apply_to(self, entity)
-        Immobilized.apply_to(self, entity)
+    defense_situation = Situation.ADVANTAGE
+    failed_saves = STRENGTH_AND_DEXTERITY
 
 
 class Poisoned(Condition):
+    __slots__ = ()
     description = (
         "A poisoned creature has disadvantage on attack rolls and ability checks."
     )
+    attack_situation = Situation.DISADVANTAGE
 
 
 class Prone(Condition):
+    __slots__ = ()
     description = (
         "A prone creature's only movement option is to crawl, "
         "unless it stands up and thereby ends the condition."
     )
-    _original_movements: list[world.Movement] = dataclasses.field(
-        init=False, default_factory=list
-    )
-
-    def apply_to(self, entity):
-        self._original_movements = entity.movements.copy()
-        walking_movements = [
-            movement
-            for movement in self._original_movements
-            if isinstance(movement, world.movement.Walk)
-        ]
-        crawl_speed = (
-            max(
-                movement.speed
-                // (1 if isinstance(movement, world_movement.Crawl) else 2)
-                for movement in walking_movements
-            )
-            if walking_movements
-            else None
-        )
-        entity.movements = []
-        if crawl_speed is not None:
-            entity.movements = [world_movement.Crawl(crawl_speed)]
-
-    def remove_from(self, entity):
-        entity.movements = self._original_movements
+    crawling = True
+    # Attacks against it depend on the distance, so they are left to the attacker.
+    attack_situation = Situation.DISADVANTAGE
 
 
 class Restrained(Immobilized):
+    __slots__ = ()
     description = (
         "A restrained creature's speed becomes 0, "
         "and it can't benefit from any bonus to its speed. "
         "Attack rolls against the creature have advantage, "
         "and the creature's attack rolls have disadvantage."
     )
+    attack_situation = Situation.DISADVANTAGE
+    defense_situation = Situation.ADVANTAGE
+    save_disadvantages = frozenset(("dexterity",))
 
 
 class Stunned(Incapacitated, Immobilized):
+    __slots__ = ()
     description = "A stunned creature is incapacitated, can't move, and can speak only falteringly."
+    defense_situation = Situation.ADVANTAGE
+    failed_saves = STRENGTH_AND_DEXTERITY
 
 
 @dataclasses.dataclass
@@ -202,6 +181,8 @@ class Unconscious(Incapacitated, Immobilized, Prone):
         "Any attack that hits the creature is a critical hit "
         "if the attacker is within 5 feet of the creature."
     )
+    defense_situation: typing.ClassVar[str] = Situation.ADVANTAGE
+    failed_saves: typing.ClassVar[frozenset[str]] = STRENGTH_AND_DEXTERITY
     dying: bool = False
     saves: int = 0
     fails: int = 0
@@ -225,3 +206,133 @@ class Exhaustion(Condition):
 
 class Dead(Unconscious):
     description = "A dead creature is an ex-creature."
+
+
+STANDARD_CONDITIONS: list[type[Condition]] = [
+    Blinded,
+    Charmed,
+    Deafened,
+    Frightened,
+    Immobilized,
+    Grappled,
+    Incapacitated,
+    Invisible,
+    Paralyzed,
+    Petrified,
+    Poisoned,
+    Prone,
+    Restrained,
+    Stunned,
+    Unconscious,
+    Exhaustion,
+    Dead,
+]
+
+
+def _assign_bits():
+    for index, condition in enumerate(STANDARD_CONDITIONS):
+        condition.bit = 1 << index
+    for condition in STANDARD_CONDITIONS:
+        # e.g. a Paralyzed creature also counts as Incapacitated and Immobilized.
+        condition.implied_by = 0
+        for other in STANDARD_CONDITIONS:
+            if issubclass(other, condition):
+                condition.implied_by |= other.bit
+
+
+_assign_bits()
+
+
+def condition_mask(conditions: typing.Iterable[Condition | type[Condition]]) -> int:
+    """
+    The combined flags of ``conditions``.
+    """
+    mask = 0
+    for condition in conditions:
+        mask |= condition.bit
+    return mask
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ConditionEffects:
+    """
+    The combined effects of a set of conditions on an entity's derived stats.
+    """
+
+    stops_movement: bool = False
+    crawling: bool = False
+    blocked_phases: frozenset[str] = frozenset()
+    blocking_action: actions.Action | None = None
+    attack_situation: str | None = None
+    defense_situation: str | None = None
+    failed_saves: frozenset[str] = frozenset()
+    save_disadvantages: frozenset[str] = frozenset()
+
+    def limit_movements(
+        self, movements: typing.Iterable[movement.Movement]
+    ) -> tuple[movement.Movement, ...]:
+        """
+        The movements these conditions leave: only crawling, at half the walking speed,
+        and none at all when movement stops.
+        """
+        movements = list(movements)
+        if self.crawling:
+            crawl_speed = max(
+                [m.speed // 2 for m in movements if isinstance(m, movement.Walk)]
+                + [m.speed for m in movements if isinstance(m, movement.Crawl)],
+                default=None,
+            )
+            movements = [] if crawl_speed is None else [movement.Crawl(crawl_speed)]
+        if self.stops_movement:
+            movements = [type(m)(0) for m in movements]
+        return tuple(movements)
+
+
+@functools.lru_cache(maxsize=None)
+def effects(flags: int) -> ConditionEffects:
+    """
+    The combined effects of the conditions in the bitmask ``flags``.
+
+    Only a handful of combinations ever occur, so each is worked out once and shared by
+    every entity that has it.
+    """
+    active = [condition for condition in STANDARD_CONDITIONS if flags & condition.bit]
+    return ConditionEffects(
+        stops_movement=any(condition.stops_movement for condition in active),
+        crawling=any(condition.crawling for condition in active),
+        blocked_phases=frozenset().union(
+            *(condition.blocked_phases for condition in active)
+        ),
+        blocking_action=next(
+            (c.blocking_action for c in active if c.blocking_action), None
+        ),
+        attack_situation=Situation.combine(
+            *(condition.attack_situation for condition in active)
+        ),
+        defense_situation=Situation.combine(
+            *(condition.defense_situation for condition in active)
+        ),
+        failed_saves=frozenset().union(
+            *(condition.failed_saves for condition in active)
+        ),
+        save_disadvantages=frozenset().union(
+            *(condition.save_disadvantages for condition in active)
+        ),
+    )
+
+
+def is_blocking_action(action: actions.Action) -> bool:
+    """
+    Whether ``action`` is a placeholder put in a turn by a condition, not a real action.
+    """
+    return any(action is condition.blocking_action for condition in STANDARD_CONDITIONS)
+
+
+@functools.lru_cache(maxsize=None)
+def effect_mask(effect: str) -> int:
+    """
+    The flags of the standard conditions that have ``effect``, e.g. "stops_movement".
+    """
+    return condition_mask(
+        condition for condition in STANDARD_CONDITIONS if getattr(condition, effect)
+    )
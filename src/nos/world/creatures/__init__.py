@@ -1,32 +1,92 @@
+from __future__ import annotations
+
 import dataclasses
+import typing
 
 import nos.world as world
 import nos.world.attacks as atks
+import nos.world.pathfinding as pathfinding
+from nos import dice
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Creature(world.Entity):
     attacks: [atks.Attack] = dataclasses.field(default_factory=list)
     actions: [world.Action] = dataclasses.field(default_factory=list)
     reactions: [world.Action] = dataclasses.field(default_factory=list)
-    carrying_capacity: float = dataclasses.field(init=False)
     inventory: [world.Item] = dataclasses.field(default_factory=list)
 
     def __post_init__(self):
-        self.carrying_capacity = (
-            self.size.carrying_capacity_multiplier * self.abilities.strength.score
-        )
+        # Slotted dataclasses are rebuilt as new classes, which breaks a bare super().
+        world.Entity.__post_init__(self)
+
+    @world.derived("abilities", "size")
+    def carrying_capacity(self) -> float:
+        return self.size.carrying_capacity_multiplier * self.abilities.strength.score
 
     def move(self, dx, dy, dz=0):
         self.world_position.x += dx
         self.world_position.y += dy
         self.world_position.z += dz
         self.turn.movement += (dx**2 + dy**2 + dz**2) ** 0.5
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
+    def move_toward(self, grid: pathfinding.BattleGrid, goal) -> bool:
+        """
+        Move along the cheapest path toward ``goal``, as far as the rest of this turn's
+        speed allows.
+
+        Returns
+        -------
+        bool: whether the goal was reached.
+        """
+        field = grid.flow_field(goal, self.effective_movements)
+        cells, spent, arrived = field.advance(
+            [grid.cell_of(self.world_position)], [self.remaining_movement]
+        )
+        self.world_position.x, self.world_position.y = (cells[0] * grid.square).tolist()
+        self.turn.movement += float(spent[0])
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+        return bool(arrived[0])
 
-    def attack(self, target: world.Entity, attack: atks.Attack):
-        hit, damage, effects = attack.resolve(self, target)
+    def attack(self, target: world.Entity, attack: atks.Attack, situation: str = None):
+        """
+        Make ``attack`` against ``target``. Unless a ``situation`` is given, it follows
+        from the conditions of both, e.g. advantage against a paralyzed target.
+        """
+        if situation is None:
+            situation = dice.Situation.combine(
+                self.attack_situation, target.defense_situation
+            )
+        hit, damage, effects = attack.resolve(
+            self, target, situation, crit_range_min=self.critical_hit_minimum
+        )
         for effect in effects:
             if isinstance(effect, atks.Attack):
                 self.attack(target, effect)
             elif isinstance(effect, world.Condition):
-                target.conditions.append(effect)
+                target.add_condition(effect)
+
+    @staticmethod
+    def group_attack(
+        attackers: typing.Sequence[Creature],
+        targets: world.Entity | typing.Sequence[world.Entity],
+        attack: atks.Attack,
+        situation: str = None,
+        rng: dice.RandomStream = None,
+    ) -> atks.AttackResults:
+        """
+        Have every attacker make the same attack at once, e.g. a volley of arrows.
+
+        The critical hit range is taken from the first attacker, as identical minions
+        share it.
+        """
+        return attack.resolve_many(
+            attackers,
+            targets,
+            situation,
+            crit_range_min=attackers[0].critical_hit_minimum if attackers else 20,
+            rng=rng,
+        )
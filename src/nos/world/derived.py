@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import typing
+
+
+class derived:
+    """
+    A property of an Entity computed from its other state, and cached on it until one of
+    the inputs it depends on changes.
+
+    Entities clear the cached values that depend on an input with ``Entity.invalidate``,
+    which happens by itself when conditions are added or removed and when ``abilities``,
+    ``movements`` or ``size`` are reassigned. Changing one of those in place, e.g.
+    appending to ``movements``, must be followed by an explicit ``invalidate``.
+
+    Parameters
+    ----------
+    *inputs : str
+        The inputs the value depends on, e.g. ``"conditions"`` or ``"abilities"``.
+    """
+
+    def __init__(self, *inputs: str):
+        self.inputs = frozenset(inputs)
+
+    def __call__(self, compute: typing.Callable) -> derived:
+        self.compute = compute
+        self.__doc__ = compute.__doc__
+        return self
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        cache = entity._derived
+        try:
+            return cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.compute(entity)
+            return value
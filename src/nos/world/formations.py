@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import typing
+
+import numpy as np
+
+import nos.world as world
+from nos.world.horde import Horde
+from nos.world.spatial import SQUARE
+
+Units = typing.Union[Horde, typing.Sequence[world.Entity]]
+
+
+def _line(count: int) -> np.ndarray:
+    return np.stack([np.arange(count) - (count - 1) / 2, np.zeros(count)], axis=1)
+
+
+def _column(count: int) -> np.ndarray:
+    return np.stack([np.zeros(count), -np.arange(count)], axis=1)
+
+
+def _block(count: int) -> np.ndarray:
+    width = math.ceil(math.sqrt(count))
+    index = np.arange(count)
+    return np.stack([index % width - (width - 1) / 2, -(index // width)], axis=1)
+
+
+def _wedge(count: int) -> np.ndarray:
+    # Row r holds r + 1 units, so the point of the wedge leads.
+    index = np.arange(count)
+    row = np.floor((np.sqrt(8 * index + 1) - 1) / 2)
+    column = index - row * (row + 1) / 2
+    return np.stack([column - row / 2, -row], axis=1)
+
+
+def _circle(count: int) -> np.ndarray:
+    radius = max(1.0, count / (2 * math.pi))  # about one square apart around the ring
+    angle = 2 * math.pi * np.arange(count) / count
+    return np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1)
+
+
+# Named formation shapes: the square offsets of ``count`` units from the anchor.
+FORMATIONS: dict[str, typing.Callable[[int], np.ndarray]] = {
+    "line": _line,
+    "column": _column,
+    "block": _block,
+    "wedge": _wedge,
+    "circle": _circle,
+}
+
+
+def offsets(shape: str, count: int, spacing: float = SQUARE) -> np.ndarray:
+    """
+    The ``(count, 3)`` offsets, in feet, of the places in a named formation.
+    """
+    if shape not in FORMATIONS:
+        raise ValueError(
+            f"Unknown formation {shape!r}, expected one of {list(FORMATIONS)}"
+        )
+    flat = FORMATIONS[shape](count) * spacing
+    return np.hstack([flat, np.zeros((count, 1))])
+
+
+@dataclasses.dataclass
+class FormationMove:
+    """
+    Where a group of units moved, as parallel arrays with one row per unit.
+
+    Attributes
+    ----------
+    start, end : np.ndarray
+        Shape ``(n, 3)`` positions before and after the move, in feet.
+    cost : np.ndarray
+        Shape ``(n,)`` feet of movement spent.
+    fell_short : np.ndarray
+        Shape ``(n,)`` whether the unit ran out of movement before its destination.
+    """
+
+    start: np.ndarray
+    end: np.ndarray
+    cost: np.ndarray
+    fell_short: np.ndarray
+
+    @property
+    def arrived(self) -> np.ndarray:
+        return ~self.fell_short
+
+    def __len__(self):
+        return len(self.cost)
+
+
+def plan(
+    start: np.ndarray, destination: np.ndarray, budget: np.ndarray
+) -> FormationMove:
+    """
+    Move every unit in a straight line toward its destination, stopping those whose
+    budget runs out part way.
+    """
+    start = np.asarray(start, dtype=np.float64)
+    delta = np.asarray(destination, dtype=np.float64) - start
+    length = np.linalg.norm(delta, axis=1)
+    cost = np.minimum(length, budget)
+    fraction = np.divide(cost, length, out=np.ones_like(length), where=length > 0)
+    return FormationMove(
+        start=start,
+        end=start + delta * fraction[:, np.newaxis],
+        cost=cost,
+        fell_short=length > budget,
+    )
+
+
+def shift(units: Units, delta: typing.Sequence[float], indices=None) -> FormationMove:
+    """
+    Move a whole formation by ``delta`` feet, keeping its shape where budgets allow.
+
+    Parameters
+    ----------
+    units : Horde | Sequence[Entity]
+        The units to move. Entities must be movable, e.g. Creatures.
+    delta : Sequence[float]
+        The ``(dx, dy)`` or ``(dx, dy, dz)`` to move by.
+    indices : np.ndarray
+        For a Horde, the units to move. Every living unit by default.
+    """
+    start, budget, indices = _gather(units, indices)
+    move = plan(start, start + _vector(delta), budget)
+    _scatter(units, indices, move)
+    return move
+
+
+def form(
+    units: Units,
+    shape: str,
+    anchor: world.Position | typing.Sequence[float],
+    indices=None,
+    spacing: float = SQUARE,
+) -> FormationMove:
+    """
+    Move units into a named formation around ``anchor``, see ``FORMATIONS``.
+
+    Units are matched to places in the formation by sorting both along x, then y, which
+    keeps their paths from crossing in most cases.
+    """
+    start, budget, indices = _gather(units, indices)
+    if isinstance(anchor, world.Position):
+        anchor = (anchor.x, anchor.y, anchor.z)
+    places = _vector(anchor) + offsets(shape, len(start), spacing)
+    destination = np.empty_like(places)
+    destination[np.lexsort((start[:, 1], start[:, 0]))] = places[
+        np.lexsort((places[:, 1], places[:, 0]))
+    ]
+    move = plan(start, destination, budget)
+    _scatter(units, indices, move)
+    return move
+
+
+def _vector(values: typing.Sequence[float]) -> np.ndarray:
+    # (x, y) or (x, y, z), in feet
+    vector = np.zeros(3)
+    vector[: len(values)] = values
+    return vector
+
+
+def _gather(units: Units, indices) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    if isinstance(units, Horde):
+        indices = units.alive_indices() if indices is None else np.asarray(indices)
+        return units.position[indices], units.movement_budget()[indices], indices
+    positions = np.array(
+        [
+            (unit.world_position.x, unit.world_position.y, unit.world_position.z)
+            for unit in units
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    budget = np.array([unit.remaining_movement for unit in units], dtype=np.float64)
+    return positions, budget, None
+
+
+def _scatter(units: Units, indices: np.ndarray | None, move: FormationMove):
+    if isinstance(units, Horde):
+        units.position[indices] = move.end
+        units.movement[indices] += move.cost
+        return
+    for unit, (x, y, z), cost in zip(units, move.end.tolist(), move.cost.tolist()):
+        position = unit.world_position
+        position.x, position.y, position.z = x, y, z
+        unit.turn.movement += cost
+        if unit.spatial_index is not None:
+            unit.spatial_index.update(unit)
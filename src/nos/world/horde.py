@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+import heapq
+import typing
+
+import numpy as np
+
+import nos.world as world
+import nos.world.conditions as conditions
+
+if typing.TYPE_CHECKING:
+    import nos.world.movement as movement
+    import nos.world.pathfinding as pathfinding
+
+ABILITIES = (
+    "strength",
+    "dexterity",
+    "constitution",
+    "intelligence",
+    "wisdom",
+    "charisma",
+)
+
+
+class Horde:
+    """
+    A group of identical creatures, with their per-unit state stored column by column.
+
+    Every unit shares the ``template`` Entity for its unchanging details (name, size,
+    attacks, ...), while the fields that change in play are kept in contiguous NumPy
+    arrays with one row per unit, so the whole horde can be damaged, healed or filtered
+    in one vectorized operation. Individual units are reached through lightweight
+    ``HordeUnit`` views, which read and write their row.
+
+    Parameters
+    ----------
+    template : Entity
+        The creature every unit is a copy of.
+    count : int
+        The number of units to start with.
+
+    Attributes
+    ----------
+    current_hit_points, max_hit_points, armor_class : np.ndarray
+        Shape ``(n,)`` integer columns.
+    position : np.ndarray
+        Shape ``(n, 3)`` world positions, in feet.
+    ability_bonuses : np.ndarray
+        Shape ``(n, 6)`` ability bonuses, in the order of ``ABILITIES``.
+    speed, movement : np.ndarray
+        Shape ``(n,)`` speed, and movement used this turn, in feet.
+    conditions : np.ndarray
+        Shape ``(n,)`` bitmask of ``conditions.STANDARD_CONDITIONS``.
+    round : int
+        The number of rounds started, which condition durations count.
+    """
+
+    _columns = {
+        "current_hit_points": ((), np.int64),
+        "max_hit_points": ((), np.int64),
+        "armor_class": ((), np.int64),
+        "position": ((3,), np.float64),
+        "ability_bonuses": ((len(ABILITIES),), np.int64),
+        "speed": ((), np.float64),
+        "movement": ((), np.float64),
+        "conditions": ((), np.uint32),
+    }
+
+    def __init__(self, template: world.Entity, count: int = 0):
+        self.template = template
+        self.round = 0
+        # Rounds at which timed conditions end, by condition flag, and a heap of the
+        # (round, flag) pairs still to come, so a round only touches what expires in it.
+        self._expiry_rounds: dict[int, np.ndarray] = {}
+        self._expiry_heap: list[tuple[int, int]] = []
+        self._size = 0
+        self._buffers = {
+            name: np.zeros((count, *shape), dtype=dtype)
+            for name, (shape, dtype) in self._columns.items()
+        }
+        self._resize(0)
+        self.spawn(count)
+
+    def _resize(self, size: int):
+        # Buffers grow geometrically; the public columns are views of their first rows.
+        capacity = len(self._buffers["current_hit_points"])
+        if size > capacity:
+            capacity = max(size, 2 * capacity)
+            for name, buffer in self._buffers.items():
+                grown = np.zeros((capacity, *buffer.shape[1:]), dtype=buffer.dtype)
+                grown[: self._size] = buffer[: self._size]
+                self._buffers[name] = grown
+        self._size = size
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:size])
+        for flag, expiry_rounds in self._expiry_rounds.items():
+            resized = np.zeros(size, dtype=np.int64)
+            resized[: min(size, expiry_rounds.size)] = expiry_rounds[:size]
+            self._expiry_rounds[flag] = resized
+
+    def spawn(self, count: int = 1) -> np.ndarray:
+        """
+        Add ``count`` fresh copies of the template.
+
+        Returns
+        -------
+        np.ndarray: the indices of the new units.
+        """
+        start, stop = self._size, self._size + count
+        self._resize(stop)
+        template = self.template
+        self.max_hit_points[start:stop] = template.max_hit_points
+        self.current_hit_points[start:stop] = template.current_hit_points
+        self.armor_class[start:stop] = template.armor_class
+        position = template.world_position
+        self.position[start:stop] = (position.x, position.y, position.z)
+        self.ability_bonuses[start:stop] = [
+            getattr(template.abilities, ability).bonus for ability in ABILITIES
+        ]
+        self.speed[start:stop] = max(
+            (movement.speed for movement in template.movements), default=0
+        )
+        self.movement[start:stop] = 0
+        self.conditions[start:stop] = conditions.condition_mask(template.conditions)
+        return np.arange(start, stop)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index: int) -> HordeUnit:
+        if not -self._size <= index < self._size:
+            raise IndexError("Horde index out of range")
+        return HordeUnit(self, index % self._size)
+
+    def __iter__(self) -> typing.Iterator[HordeUnit]:
+        return (HordeUnit(self, index) for index in range(self._size))
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.current_hit_points > 0
+
+    @property
+    def remaining_movement(self) -> np.ndarray:
+        return self.speed - self.movement
+
+    def movement_budget(self) -> np.ndarray:
+        """
+        The feet each unit can still move this turn, at the speed its conditions leave
+        it, as for an Entity: crawling at half its walking speed while prone, and
+        nothing while immobilized.
+        """
+        speed = self.speed.copy()
+        for flag in np.unique(self.conditions).tolist():
+            factor = self._speed_factor(flag)
+            if factor != 1:
+                units = self.conditions == flag
+                speed[units] *= factor
+        return np.maximum(speed - self.movement, 0)
+
+    def _speed_factor(self, flags: int) -> float:
+        """
+        The share of a unit's speed left by the conditions in ``flags``: the fastest of
+        the template's movements they leave, over its fastest movement.
+        """
+        movements = self.template.movements
+        fastest = max((movement.speed for movement in movements), default=0)
+        if not fastest:
+            return 0.0
+        limited = conditions.effects(flags).limit_movements(movements)
+        return max((movement.speed for movement in limited), default=0) / fastest
+
+    def alive_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.alive)
+
+    def apply_damage(self, damage: int | np.ndarray, indices: np.ndarray = None):
+        """
+        Deal damage to the units at ``indices`` (every unit by default).
+
+        Indices may repeat, e.g. when several attacks land on the same unit, and hit
+        points never drop below 0.
+        """
+        if indices is None:
+            self.current_hit_points -= damage
+        else:
+            np.subtract.at(
+                self.current_hit_points,
+                indices,
+                np.broadcast_to(damage, np.shape(indices)),
+            )
+        np.maximum(self.current_hit_points, 0, out=self.current_hit_points)
+
+    def heal(self, healing: int | np.ndarray, indices: np.ndarray = None):
+        """
+        Restore hit points to the units at ``indices``, up to their maximum.
+        """
+        if indices is None:
+            self.current_hit_points += healing
+        else:
+            np.add.at(
+                self.current_hit_points,
+                indices,
+                np.broadcast_to(healing, np.shape(indices)),
+            )
+        np.minimum(
+            self.current_hit_points, self.max_hit_points, out=self.current_hit_points
+        )
+
+    def move_toward(
+        self, grid: pathfinding.BattleGrid, goal, indices: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Move the units at ``indices`` (every living unit by default) along the cheapest
+        paths toward ``goal``, each as far as its movement budget allows. Units with the
+        same conditions, which leave them the same movements, share one flow field.
+
+        Returns
+        -------
+        np.ndarray: whether each moved unit reached the goal.
+        """
+        indices = self.alive_indices() if indices is None else np.asarray(indices)
+        start = np.floor(self.position[indices, :2] / grid.square).astype(np.int64)
+        budget = self.movement_budget()[indices]
+        flags = self.conditions[indices]
+        arrived = np.zeros(len(indices), dtype=bool)
+        for flag in np.unique(flags).tolist():
+            group = np.flatnonzero(flags == flag)
+            movements = conditions.effects(flag).limit_movements(
+                self.template.movements
+            )
+            field = grid.flow_field(goal, movements)
+            cells, spent, arrived[group] = field.advance(start[group], budget[group])
+            moved = group[np.flatnonzero(spent)]
+            self.position[indices[moved], :2] = cells[spent > 0] * grid.square
+            self.movement[indices[group]] += spent
+        return arrived
+
+    def has_condition(self, condition: type[conditions.Condition]) -> np.ndarray:
+        return (self.conditions & condition.implied_by) != 0
+
+    def add_condition(
+        self,
+        condition: type[conditions.Condition],
+        indices: np.ndarray = None,
+        duration: int = None,
+    ):
+        """
+        Give ``condition`` to the units at ``indices`` (every unit by default), for
+        ``duration`` rounds or until it is removed.
+        """
+        selection = slice(None) if indices is None else indices
+        self.conditions[selection] |= condition.bit
+        expiry_rounds = self._expiry_rounds.get(condition.bit)
+        if duration:
+            if expiry_rounds is None:
+                expiry_rounds = np.zeros(self._size, dtype=np.int64)
+                self._expiry_rounds[condition.bit] = expiry_rounds
+            expiry_rounds[selection] = self.round + duration
+            heapq.heappush(self._expiry_heap, (self.round + duration, condition.bit))
+        elif expiry_rounds is not None:
+            expiry_rounds[selection] = 0
+
+    def remove_condition(
+        self, condition: type[conditions.Condition], indices: np.ndarray = None
+    ):
+        selection = slice(None) if indices is None else indices
+        self.conditions[selection] &= ~np.uint32(condition.bit)
+        if condition.bit in self._expiry_rounds:
+            self._expiry_rounds[condition.bit][selection] = 0
+
+    def start_turn(self):
+        self.movement[:] = 0
+
+    def start_round(self) -> list[tuple[int, np.ndarray]]:
+        """
+        Start a new round for every unit at once: reset movement and end expired conditions.
+
+        Only the conditions due to end this round are looked at, however many units and
+        conditions the horde has.
+
+        Returns
+        -------
+        list[tuple[int, np.ndarray]]: each expired condition flag, with the indices of the
+            units it ended for.
+        """
+        self.round += 1
+        self.start_turn()
+        expired = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= self.round:
+            expiry_round, flag = heapq.heappop(heap)
+            if heap and heap[0] == (expiry_round, flag):
+                continue  # the same flag was given again in the same round
+            expiry_rounds = self._expiry_rounds[flag]
+            ended = np.flatnonzero(expiry_rounds == expiry_round)
+            if ended.size:
+                self.conditions[ended] &= ~np.uint32(flag)
+                expiry_rounds[ended] = 0
+                expired.append((flag, ended))
+        return expired
+
+    def compact(self) -> np.ndarray:
+        """
+        Drop the dead units, keeping the living ones in order.
+
+        Views of units made before compacting refer to old rows and must be discarded.
+
+        Returns
+        -------
+        np.ndarray: the old indices of the units that were kept.
+        """
+        kept = self.alive_indices()
+        for name in self._columns:
+            column = getattr(self, name)
+            column[: kept.size] = column[kept]
+        for flag, expiry_rounds in self._expiry_rounds.items():
+            self._expiry_rounds[flag] = expiry_rounds[kept]
+        self._resize(kept.size)
+        return kept
+
+    def __str__(self):
+        return f"{self.template.name} horde ({int(self.alive.sum())}/{len(self)} alive)"
+
+
+# The template's details that every unit of a horde shares, and reads from it.
+_SHARED = frozenset(
+    (
+        "name",
+        "description",
+        "size",
+        "asset",
+        "movements",
+        "abilities",
+        "proficiencies",
+        "critical_hit_minimum",
+        "proficiency_bonus",
+        "attacks",
+        "actions",
+        "reactions",
+        "inventory",
+    )
+)
+
+
+class HordeUnit:
+    """
+    A view of one unit of a Horde, which behaves like its Entity for the fields the horde
+    stores, conditions included, and reads the details every unit shares from the
+    horde's template. Anything else, e.g. its ``turn``, isn't tracked per unit and
+    raises an AttributeError rather than reach the template, which every unit shares.
+    """
+
+    __slots__ = ("horde", "index")
+
+    def __init__(self, horde: Horde, index: int):
+        self.horde = horde
+        self.index = index
+
+    def __getattr__(self, name):
+        if name in _SHARED:
+            return getattr(self.horde.template, name)
+        raise AttributeError(
+            f"{type(self).__name__} has no {name!r}: it isn't tracked per unit"
+        )
+
+    @property
+    def current_hit_points(self) -> int:
+        return int(self.horde.current_hit_points[self.index])
+
+    @current_hit_points.setter
+    def current_hit_points(self, value: int):
+        self.horde.current_hit_points[self.index] = value
+
+    @property
+    def max_hit_points(self) -> int:
+        return int(self.horde.max_hit_points[self.index])
+
+    @property
+    def armor_class(self) -> int:
+        return int(self.horde.armor_class[self.index])
+
+    @armor_class.setter
+    def armor_class(self, value: int):
+        self.horde.armor_class[self.index] = value
+
+    @property
+    def world_position(self) -> UnitPosition:
+        return UnitPosition(self.horde, self.index)
+
+    @property
+    def ability_bonuses(self) -> dict[str, int]:
+        return dict(zip(ABILITIES, self.horde.ability_bonuses[self.index].tolist()))
+
+    @property
+    def effective_movements(self) -> tuple[movement.Movement, ...]:
+        return self.condition_effects.limit_movements(self.horde.template.movements)
+
+    @property
+    def speed(self) -> float:
+        horde = self.horde
+        return float(horde.speed[self.index]) * horde._speed_factor(
+            self.condition_flags
+        )
+
+    @property
+    def remaining_movement(self) -> float:
+        return max(self.speed - float(self.horde.movement[self.index]), 0)
+
+    @property
+    def is_alive(self) -> bool:
+        return bool(self.horde.current_hit_points[self.index] > 0)
+
+    @property
+    def condition_flags(self) -> int:
+        return int(self.horde.conditions[self.index])
+
+    @property
+    def condition_effects(self) -> conditions.ConditionEffects:
+        return conditions.effects(self.condition_flags)
+
+    @property
+    def attack_situation(self) -> str | None:
+        return self.condition_effects.attack_situation
+
+    @property
+    def defense_situation(self) -> str | None:
+        return self.condition_effects.defense_situation
+
+    def automatically_fails(self, saving_throw: str) -> bool:
+        return saving_throw in self.condition_effects.failed_saves
+
+    def has_condition(self, condition: type[conditions.Condition]) -> bool:
+        return bool(self.horde.conditions[self.index] & condition.implied_by)
+
+    def add_condition(self, condition: conditions.Condition):
+        """
+        Give this unit the kind of ``condition``, for its remaining duration in rounds.
+        The horde keeps one flag per kind, so details such as who charmed it are lost.
+        """
+        self.horde.add_condition(
+            type(condition), [self.index], condition.remaining_duration
+        )
+
+    def remove_condition(self, condition: conditions.Condition):
+        self.horde.remove_condition(type(condition), [self.index])
+
+    def remaining_duration(self, condition: conditions.Condition) -> int | None:
+        expiry_rounds = self.horde._expiry_rounds.get(condition.bit)
+        if expiry_rounds is None or not expiry_rounds[self.index]:
+            return None
+        return int(expiry_rounds[self.index]) - self.horde.round
+
+    def start_turn(self):
+        self.horde.movement[self.index] = 0
+
+    def move(self, dx, dy, dz=0):
+        self.horde.position[self.index] += (dx, dy, dz)
+        self.horde.movement[self.index] += (dx**2 + dy**2 + dz**2) ** 0.5
+
+    def __str__(self):
+        return f"{self.name} #{self.index} ({self.current_hit_points} HP)"
+
+
+class UnitPosition:
+    """
+    A view of one unit's row of ``Horde.position``, with the fields of a Position.
+    """
+
+    __slots__ = ("horde", "index")
+
+    def __init__(self, horde: Horde, index: int):
+        self.horde = horde
+        self.index = index
+
+    @property
+    def x(self) -> float:
+        return float(self.horde.position[self.index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self.horde.position[self.index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.horde.position[self.index, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self.horde.position[self.index, 1] = value
+
+    @property
+    def z(self) -> float:
+        return float(self.horde.position[self.index, 2])
+
+    @z.setter
+    def z(self, value: float):
+        self.horde.position[self.index, 2] = value
+
+    def __str__(self):
+        return f"@{tuple(self.horde.position[self.index].tolist())}"
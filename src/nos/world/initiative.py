@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import typing
+
+import nos.world as world
+from nos import dice
+from nos.world.horde import Horde
+
+Combatant = typing.Union[world.Entity, Horde]
+
+
+def dexterity_bonus(combatant: Combatant) -> int:
+    entity = combatant.template if isinstance(combatant, Horde) else combatant
+    return entity.abilities.dexterity.bonus
+
+
+class InitiativeSlot:
+    """
+    A place in the initiative order, shared by every member that acts on it.
+
+    Identical minions share one slot, so a whole group takes its turn together.
+
+    Attributes
+    ----------
+    members : list[Entity | Horde]
+        The combatants that act on this slot, in the order they joined it.
+    initiative : int
+        The initiative count of the slot. Higher goes first.
+    dexterity_bonus : int
+        Breaks ties between slots with the same initiative. Higher goes first.
+    """
+
+    __slots__ = (
+        "_members",
+        "initiative",
+        "dexterity_bonus",
+        "order",
+        "key",
+        "version",
+        "acted_round",
+    )
+
+    def __init__(self, members: list[Combatant], initiative: int, dexterity_bonus: int):
+        # By id, for O(1) removal, in the order they joined.
+        self._members: dict[int, Combatant] = {id(m): m for m in members}
+        self.initiative = initiative
+        self.dexterity_bonus = dexterity_bonus
+        self.order = next(_slot_order)  # earlier slots win any remaining ties
+        self.key = (-initiative, -dexterity_bonus, self.order)
+        self.version = 0  # bumped on every reschedule, to invalidate old heap entries
+        self.acted_round = 0  # the last round the slot took its turn in
+
+    @property
+    def members(self) -> list[Combatant]:
+        return list(self._members.values())
+
+    def add_member(self, combatant: Combatant):
+        self._members[id(combatant)] = combatant
+
+    def remove_member(self, combatant: Combatant):
+        self._members.pop(id(combatant), None)
+
+    def __len__(self):
+        return len(self._members)
+
+    def start_turn(self):
+        for member in self._members.values():
+            if isinstance(member, Horde):
+                member.start_round()
+            else:
+                member.start_turn()
+
+    def __str__(self):
+        members = list(itertools.islice(self._members.values(), 3))
+        names = ", ".join(member.name for member in members)
+        if len(self) > 3:
+            names += f" and {len(self) - 3} more"
+        return f"{self.initiative}: {names}"
+
+
+_slot_order = itertools.count()
+
+
+class InitiativeOrder:
+    """
+    The turn order of an encounter, which combatants can join, leave or delay in
+    O(log n) time, even mid-round.
+
+    The slots still to act this round are kept in a heap, which removals and delays
+    update lazily: stale entries are skipped when they come up, rather than searched
+    for. ``next_turn`` pops the next slot and starts its members' turns.
+    """
+
+    def __init__(self):
+        self.round = 0
+        self.current: InitiativeSlot | None = None
+        self._position: tuple[int, int, int] = None  # the key of the current turn
+        self._slots: dict[int, InitiativeSlot] = {}
+        self._slot_of: dict[int, InitiativeSlot] = {}  # by id of each member
+        self._pending: list[tuple[tuple[int, int, int], int, InitiativeSlot]] = []
+
+    def add(
+        self,
+        combatants: Combatant | typing.Sequence[Combatant],
+        initiative: int = None,
+        rng: dice.RandomStream = None,
+    ) -> InitiativeSlot:
+        """
+        Add combatants to the order on a single, shared slot.
+
+        Parameters
+        ----------
+        combatants : Entity | Horde | Sequence[Entity | Horde]
+            The combatant, or the group of identical combatants, to add.
+        initiative : int
+            The slot's initiative count. If omitted, it is rolled once for the group,
+            with the first combatant's Dexterity bonus.
+        rng : dice.RandomStream
+            The stream to roll initiative with, defaulting to the current stream.
+
+        Returns
+        -------
+        InitiativeSlot: the new slot.
+        """
+        members = (
+            [combatants]
+            if isinstance(combatants, (world.Entity, Horde))
+            else list(combatants)
+        )
+        if not members:
+            raise ValueError("Cannot add an empty group to the initiative order.")
+        bonus = dexterity_bonus(members[0])
+        if initiative is None:
+            initiative = dice.d20.roll(rng=rng) + bonus
+        slot = InitiativeSlot(members, initiative, bonus)
+        self._slots[id(slot)] = slot
+        for member in members:
+            self._slot_of[id(member)] = slot
+        self._schedule(slot)
+        return slot
+
+    def join(self, slot: InitiativeSlot, combatant: Combatant):
+        """
+        Add a combatant to an existing slot, e.g. a freshly summoned minion.
+        """
+        slot.add_member(combatant)
+        self._slot_of[id(combatant)] = slot
+
+    def remove(self, combatant: Combatant):
+        """
+        Take a combatant out of the order. Its slot is removed once it is empty.
+        """
+        slot = self._slot_of.pop(id(combatant), None)
+        if slot is None:
+            return
+        slot.remove_member(combatant)
+        if not len(slot):
+            self.remove_slot(slot)
+
+    def remove_slot(self, slot: InitiativeSlot):
+        if self._slots.pop(id(slot), None) is None:
+            return
+        for key in slot._members:
+            self._slot_of.pop(key, None)
+        if len(self._pending) > 2 * len(self._slots) + 16:
+            self._pending = [
+                entry for entry in self._pending if self._is_current(entry)
+            ]
+            heapq.heapify(self._pending)
+
+    def delay(self, slot: InitiativeSlot, initiative: int):
+        """
+        Move a slot to a new initiative count. If the slot hasn't acted yet this round
+        and that count is still to come, it acts on it this round, otherwise from the
+        next round on: a slot never takes two turns in a round.
+        """
+        slot.initiative = initiative
+        slot.key = (-initiative, -slot.dexterity_bonus, slot.order)
+        self._schedule(slot)
+
+    def slot_of(self, combatant: Combatant) -> InitiativeSlot | None:
+        return self._slot_of.get(id(combatant))
+
+    def next_turn(self) -> InitiativeSlot | None:
+        """
+        Advance to the next slot, starting a new round when everyone has acted, and
+        start the turns of the slot's members.
+
+        Returns
+        -------
+        InitiativeSlot | None: the slot whose turn it is, or None if the order is empty.
+        """
+        while True:
+            while self._pending:
+                entry = heapq.heappop(self._pending)
+                if self._is_current(entry):
+                    self._position, _, self.current = entry
+                    self.current.acted_round = self.round
+                    self.current.start_turn()
+                    return self.current
+            if not self._slots:
+                self.current = self._position = None
+                return None
+            self.round += 1
+            self.current = self._position = None
+            self._pending = [
+                (slot.key, slot.version, slot) for slot in self._slots.values()
+            ]
+            heapq.heapify(self._pending)
+
+    def _is_current(self, entry) -> bool:
+        _, version, slot = entry
+        return slot.version == version and id(slot) in self._slots
+
+    def _schedule(self, slot: InitiativeSlot):
+        slot.version += 1
+        # Before the first round, slots wait for the round to be built from all slots.
+        if (
+            self.round
+            and slot.acted_round != self.round
+            and (self._position is None or slot.key > self._position)
+        ):
+            heapq.heappush(self._pending, (slot.key, slot.version, slot))
+
+    def __iter__(self) -> typing.Iterator[InitiativeSlot]:
+        """
+        The slots in turn order, from the highest initiative.
+        """
+        return iter(sorted(self._slots.values(), key=lambda slot: slot.key))
+
+    def __len__(self):
+        return len(self._slots)
@@ -1,7 +1,7 @@
 import dataclasses
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Position:
     x: int = 0
     y: int = 0
@@ -11,7 +11,7 @@ class Position:
         return f"@{dataclasses.astuple(self)}"
 
 
-@dataclasses.dataclass(eq=False)
+@dataclasses.dataclass(eq=False, slots=True)
 class Movement:
     speed: int  # per turn (6 seconds), in feet
 
@@ -31,28 +31,28 @@ class Movement:
 
 # Movement types
 class Walk(Movement):
-    pass
+    __slots__ = ()
 
 
 class Fly(Movement):
-    pass
+    __slots__ = ()
 
 
 class Swim(Movement):
-    pass
+    __slots__ = ()
 
 
 class Burrow(Movement):
-    pass
+    __slots__ = ()
 
 
 class Climb(Movement):
-    pass
+    __slots__ = ()
 
 
 class Hover(Movement):
-    pass
+    __slots__ = ()
 
 
 class Crawl(Movement):
-    pass
+    __slots__ = ()
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import heapq
+import math
+import typing
+
+import numpy as np
+
+import nos.world.movement as movement
+from nos.world.spatial import SQUARE
+
+Cell = tuple[int, int]
+
+TERRAINS = ("blocked", "difficult", "water", "climbable")
+
+# Extra feet of movement spent per foot moved, by movement type, on open ground, in water
+# and up climbable surfaces, and on difficult terrain. None where the type can't go.
+EXTRA_COSTS: dict[type[movement.Movement], tuple[int | None, ...]] = {
+    movement.Walk: (0, 1, 1, 1),
+    movement.Crawl: (0, 1, 1, 1),
+    movement.Swim: (None, 0, None, 1),
+    movement.Climb: (None, None, 0, 1),
+    movement.Fly: (0, 0, 0, 0),
+    movement.Hover: (0, 0, 0, 0),
+    movement.Burrow: (0, None, None, 0),
+}
+
+# Steps to the 8 neighbouring squares, orthogonal ones first so they win ties. Every step
+# is one square long, diagonals included, as on the battle grid.
+NEIGHBOURS = np.array(
+    [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+)
+
+
+def movement_profile(movements: typing.Iterable[movement.Movement]) -> frozenset:
+    """
+    The (movement type, speed) pairs, with a speed, that a mover can pick from square
+    by square.
+    """
+    speeds = {}
+    for m in movements:
+        if m.speed > 0:
+            speeds[type(m)] = max(m.speed, speeds.get(type(m), 0))
+    return frozenset(speeds.items())
+
+
+class BattleGrid:
+    """
+    The terrain of a battlefield, one square per cell, and the flow fields over it.
+
+    A flow field holds, for every square, the cost of the cheapest path to a goal and the
+    next square along it, so any number of movers heading to the same goal share one
+    search. Fields are cached by goal and movement profile until the terrain changes.
+
+    Parameters
+    ----------
+    width, height : int
+        The size of the grid, in squares.
+    square : float
+        The side of a square, in feet.
+
+    Attributes
+    ----------
+    blocked, difficult, water, climbable : np.ndarray
+        Shape ``(width, height)`` boolean terrain layers, indexed by ``[x, y]``. Change
+        them with ``paint``, which keeps the cached fields up to date.
+    """
+
+    def __init__(self, width: int, height: int, square: float = SQUARE):
+        self.width = width
+        self.height = height
+        self.square = square
+        for terrain in TERRAINS:
+            setattr(self, terrain, np.zeros((width, height), dtype=bool))
+        self._fields: dict[tuple[Cell, frozenset], FlowField] = {}
+
+    def paint(
+        self,
+        terrain: str,
+        x0: int,
+        y0: int,
+        x1: int = None,
+        y1: int = None,
+        value: bool = True,
+    ):
+        """
+        Set a terrain layer over the squares from (x0, y0) to (x1, y1), inclusive.
+        """
+        if terrain not in TERRAINS:
+            raise ValueError(f"Unknown terrain {terrain!r}, expected one of {TERRAINS}")
+        x1 = x0 if x1 is None else x1
+        y1 = y0 if y1 is None else y1
+        getattr(self, terrain)[x0 : x1 + 1, y0 : y1 + 1] = value
+        self._fields.clear()
+
+    def cell_of(self, position) -> Cell:
+        return (
+            math.floor(position.x / self.square),
+            math.floor(position.y / self.square),
+        )
+
+    def in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def entry_costs(self, profile: frozenset) -> np.ndarray:
+        """
+        The feet of movement it costs to enter each square, with the cheapest movement
+        type of ``profile`` that can, or infinity where none can.
+
+        Costs are in feet of the fastest speed of ``profile``, which movement budgets are
+        measured in: a square swum at a swim speed of 10 ft. costs a creature that walks
+        30 ft. three times as much of its budget as a square walked.
+        """
+        land = ~(self.water | self.climbable)
+        costs = np.full((self.width, self.height), np.inf)
+        fastest = max((speed for _, speed in profile), default=0)
+        for movement_type, speed in profile:
+            extra = EXTRA_COSTS.get(movement_type)
+            if extra is None:
+                continue
+            on_land, in_water, climbing, difficult = extra
+            type_costs = np.full((self.width, self.height), np.inf)
+            for layer, layer_extra in (
+                (land, on_land),
+                (self.water, in_water),
+                (self.climbable, climbing),
+            ):
+                if layer_extra is not None:
+                    type_costs[layer] = 1 + layer_extra
+            type_costs[self.difficult] += difficult
+            type_costs *= fastest / speed
+            np.minimum(costs, type_costs, out=costs)
+        costs[self.blocked] = np.inf
+        return costs * self.square
+
+    def flow_field(
+        self,
+        goal: Cell | movement.Position,
+        movements: typing.Iterable[movement.Movement],
+    ) -> FlowField:
+        """
+        The flow field toward ``goal`` for movers with ``movements``, computed once and
+        shared by every mover with the same movement types.
+        """
+        if not isinstance(goal, tuple):
+            goal = self.cell_of(goal)
+        if not self.in_bounds(goal):
+            raise ValueError(f"Goal {goal} is off the {self.width}x{self.height} grid")
+        key = (goal, movement_profile(movements))
+        field = self._fields.get(key)
+        if field is None:
+            field = self._fields[key] = FlowField(self, goal, self.entry_costs(key[1]))
+        return field
+
+
+class FlowField:
+    """
+    The cheapest paths from every square of a grid to one goal, found with a single
+    Dijkstra search outward from the goal.
+
+    Attributes
+    ----------
+    goal : Cell
+    costs : np.ndarray
+        Shape ``(width, height)`` feet of movement to enter each square.
+    distances : np.ndarray
+        Shape ``(width, height)`` feet of movement from each square to the goal, infinite
+        if it can't be reached.
+    steps : np.ndarray
+        Shape ``(width, height, 2)`` next square toward the goal, or -1 at the goal and
+        where it can't be reached.
+    """
+
+    def __init__(self, grid: BattleGrid, goal: Cell, costs: np.ndarray):
+        self.grid = grid
+        self.goal = goal
+        self.costs = costs
+        self.distances = self._search(costs, goal)
+        self.steps = self._descend(costs, self.distances)
+
+    @staticmethod
+    def _search(costs: np.ndarray, goal: Cell) -> np.ndarray:
+        width, height = costs.shape
+        entry = costs.ravel().tolist()
+        distances = [math.inf] * (width * height)
+        start = goal[0] * height + goal[1]
+        distances[start] = 0.0
+        queue = [(0.0, start)]
+        while queue:
+            distance, index = heapq.heappop(queue)
+            if distance > distances[index]:
+                continue
+            # Leaving a neighbour for this square costs entering this square.
+            step = distance + entry[index]
+            if step == math.inf:
+                continue
+            x, y = divmod(index, height)
+            for dx, dy in _OFFSETS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbour = nx * height + ny
+                    if step < distances[neighbour]:
+                        distances[neighbour] = step
+                        heapq.heappush(queue, (step, neighbour))
+        return np.array(distances).reshape(width, height)
+
+    @staticmethod
+    def _descend(costs: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        # For every square at once, the neighbour that leads downhill to the goal.
+        width, height = costs.shape
+        padded = np.pad(distances + costs, 1, constant_values=np.inf)
+        through = np.stack(
+            [
+                padded[1 + dx : 1 + dx + width, 1 + dy : 1 + dy + height]
+                for dx, dy in NEIGHBOURS
+            ]
+        )
+        best = through.argmin(axis=0)
+        steps = np.indices((width, height)).transpose(1, 2, 0) + NEIGHBOURS[best]
+        stuck = (distances == 0) | ~np.isfinite(distances)
+        steps[stuck] = -1
+        return steps
+
+    def distance_from(self, cell: Cell) -> float:
+        if not self.grid.in_bounds(cell):
+            return math.inf
+        return float(self.distances[cell])
+
+    def path(self, start: Cell, budget: float = math.inf) -> list[Cell]:
+        """
+        The squares entered on the way from ``start`` toward the goal, as far as
+        ``budget`` feet of movement allow.
+        """
+        entered = []
+        spent = 0.0
+        cell = start
+        while self.grid.in_bounds(cell) and self.steps[cell][0] >= 0:
+            step = tuple(self.steps[cell].tolist())
+            if spent + self.costs[step] > budget:
+                break
+            spent += self.costs[step]
+            entered.append(step)
+            cell = step
+        return entered
+
+    def advance(
+        self, cells: np.ndarray, budgets: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Move many movers toward the goal at once, each as far as its budget allows.
+
+        Every mover takes one square per iteration, so the work grows with the longest
+        move of the turn rather than with the number of movers. Movers don't block each
+        other.
+
+        Parameters
+        ----------
+        cells : np.ndarray
+            Shape ``(n, 2)`` starting squares.
+        budgets : np.ndarray
+            Shape ``(n,)`` feet of movement each mover has left.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]: the ``(n, 2)`` squares reached, the
+            ``(n,)`` feet of movement spent, and whether each mover reached the goal.
+        """
+        cells = np.array(cells, dtype=np.int64).reshape(-1, 2)
+        budgets = np.asarray(budgets, dtype=np.float64)
+        spent = np.zeros(len(cells))
+        moving = (
+            (cells[:, 0] >= 0)
+            & (cells[:, 0] < self.grid.width)
+            & (cells[:, 1] >= 0)
+            & (cells[:, 1] < self.grid.height)
+        )
+        while True:
+            index = np.flatnonzero(moving)
+            steps = self.steps[cells[index, 0], cells[index, 1]]
+            valid = steps[:, 0] >= 0
+            index, steps = index[valid], steps[valid]
+            costs = self.costs[steps[:, 0], steps[:, 1]]
+            affordable = spent[index] + costs <= budgets[index]
+            index, steps = index[affordable], steps[affordable]
+            if not index.size:
+                break
+            cells[index] = steps
+            spent[index] += costs[affordable]
+            moving[:] = False
+            moving[index] = True
+        arrived = (cells[:, 0] == self.goal[0]) & (cells[:, 1] == self.goal[1])
+        return cells, spent, arrived
+
+
+_OFFSETS = [tuple(offset) for offset in NEIGHBOURS.tolist()]
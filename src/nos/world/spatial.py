@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import typing
+
+import nos.world as world
+
+SQUARE = 5  # feet per square of the battle grid
+
+Box = tuple[float, float, float, float, float, float]  # x0, y0, z0, x1, y1, z1
+Cell = tuple[int, int]
+
+
+def footprint(entity: world.Entity) -> Box:
+    """
+    The space an entity occupies: ``Size.square_size`` squares on a side, starting at its
+    ``world_position``, and as tall as it is wide.
+    """
+    side = entity.size.square_size * SQUARE
+    position = entity.world_position
+    return (
+        position.x,
+        position.y,
+        position.z,
+        position.x + side,
+        position.y + side,
+        position.z + side,
+    )
+
+
+def distance(first: Box, second: Box) -> float:
+    """
+    The distance between the closest points of two spaces, 0 if they touch or overlap.
+    """
+    dx = max(first[0] - second[3], second[0] - first[3], 0)
+    dy = max(first[1] - second[4], second[1] - first[4], 0)
+    dz = max(first[2] - second[5], second[2] - first[5], 0)
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+class SpatialIndex:
+    """
+    A uniform grid over the battlefield, answering "who is near whom" without scanning
+    every entity.
+
+    Each entity is hashed into every grid cell its space overlaps, so Large and bigger
+    creatures are found from any of their squares. Distances are measured between the
+    closest points of two spaces, as reach and range are in play. Entities added to the
+    index are kept up to date as they move with ``Creature.move``; anything else that
+    changes a position should call ``update``.
+
+    Parameters
+    ----------
+    cell_size : float
+        The side of a grid cell, in feet. One square by default.
+    """
+
+    def __init__(self, cell_size: float = SQUARE):
+        self.cell_size = cell_size
+        self._entities: dict[int, world.Entity] = {}
+        self._boxes: dict[int, Box] = {}
+        self._cells: dict[Cell, set[int]] = {}
+        self._cell_ranges: dict[int, tuple[int, int, int, int]] = {}
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __contains__(self, entity: world.Entity):
+        return id(entity) in self._entities
+
+    def __iter__(self) -> typing.Iterator[world.Entity]:
+        return iter(self._entities.values())
+
+    def add(self, entity: world.Entity):
+        self._entities[id(entity)] = entity
+        entity.spatial_index = self
+        self.update(entity)
+
+    def remove(self, entity: world.Entity):
+        key = id(entity)
+        if self._entities.pop(key, None) is None:
+            return
+        self._unlink(key, self._range_cells(self._cell_ranges.pop(key)))
+        del self._boxes[key]
+        entity.spatial_index = None
+
+    def update(self, entity: world.Entity):
+        """
+        Rehash an entity after it moved or changed size. Only the cells it entered or
+        left are touched.
+        """
+        key = id(entity)
+        box = footprint(entity)
+        self._boxes[key] = box
+        cell_range = self._cell_range(box)
+        old_range = self._cell_ranges.get(key)
+        if cell_range == old_range:
+            return
+        self._cell_ranges[key] = cell_range
+        if old_range is None:
+            entered = self._range_cells(cell_range)
+        else:
+            self._unlink(key, self._range_difference(old_range, cell_range))
+            entered = self._range_difference(cell_range, old_range)
+        for cell in entered:
+            self._cells.setdefault(cell, set()).add(key)
+
+    def within(
+        self,
+        center: world.Entity | Box,
+        radius: float,
+        predicate: typing.Callable[[world.Entity], bool] = None,
+    ) -> list[world.Entity]:
+        """
+        The entities within ``radius`` feet of ``center``, nearest first.
+
+        Parameters
+        ----------
+        center : Entity | Box
+            An entity, which is left out of the results, or a space to measure from.
+        radius : float
+            The greatest distance, in feet, between the closest points of the spaces.
+        predicate : Callable[[Entity], bool]
+            Only keep the entities for which this returns True, e.g. enemies.
+        """
+        box = self._box_of(center)
+        found = []
+        for key in self._candidates(
+            box[0] - radius, box[1] - radius, box[3] + radius, box[4] + radius
+        ):
+            entity = self._entities[key]
+            if entity is center or (predicate and not predicate(entity)):
+                continue
+            entity_distance = distance(box, self._boxes[key])
+            if entity_distance <= radius:
+                found.append((entity_distance, key))
+        return [self._entities[key] for _, key in sorted(found)]
+
+    def in_rectangle(
+        self, x0: float, y0: float, x1: float, y1: float
+    ) -> list[world.Entity]:
+        """
+        The entities whose space overlaps the rectangle from (x0, y0) to (x1, y1).
+        """
+        return [
+            self._entities[key]
+            for key in self._candidates(x0, y0, x1, y1)
+            if self._boxes[key][0] <= x1
+            and self._boxes[key][3] >= x0
+            and self._boxes[key][1] <= y1
+            and self._boxes[key][4] >= y0
+        ]
+
+    def nearest(
+        self,
+        center: world.Entity | Box,
+        k: int = 1,
+        max_distance: float = math.inf,
+        predicate: typing.Callable[[world.Entity], bool] = None,
+    ) -> list[world.Entity]:
+        """
+        The ``k`` entities nearest to ``center``, nearest first.
+
+        The search widens one ring of cells at a time, and stops as soon as no unsearched
+        cell can hold anything nearer than the ``k`` already found.
+        """
+        if not self._entities:
+            return []
+        box = self._box_of(center)
+        x0, y0, x1, y1 = self._cell_range(box)
+        found: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        ring = 0
+        while True:
+            ring_cells = self._ring_cells(x0 - ring, y0 - ring, x1 + ring, y1 + ring)
+            if 2 * (x1 - x0 + y1 - y0 + 4 * ring) > len(self._cells):
+                # The ring has more cells than are occupied: visit those instead.
+                ring_cells = list(self._cells)
+                ring = math.inf
+            for cell in ring_cells:
+                for key in self._cells.get(cell, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    entity = self._entities[key]
+                    if entity is center or (predicate and not predicate(entity)):
+                        continue
+                    entity_distance = distance(box, self._boxes[key])
+                    if entity_distance <= max_distance:
+                        found.append((entity_distance, key))
+            searched = ring * self.cell_size  # everything nearer has been seen
+            best = heapq.nsmallest(k, found)
+            if (len(best) == k and best[-1][0] <= searched) or (
+                searched >= max_distance or len(seen) == len(self._entities)
+            ):
+                return [self._entities[key] for _, key in best]
+            ring += 1
+
+    def _box_of(self, center: world.Entity | Box) -> Box:
+        if isinstance(center, tuple):
+            return center
+        return self._boxes.get(id(center)) or footprint(center)
+
+    def _cell_range(self, box: Box) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        x0, y0 = math.floor(box[0] / size), math.floor(box[1] / size)
+        x1 = max(x0, math.ceil(box[3] / size) - 1)
+        y1 = max(y0, math.ceil(box[4] / size) - 1)
+        return x0, y0, x1, y1
+
+    @staticmethod
+    def _range_cells(cell_range: tuple[int, int, int, int]) -> typing.Iterator[Cell]:
+        x0, y0, x1, y1 = cell_range
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield x, y
+
+    @staticmethod
+    def _range_difference(
+        first: tuple[int, int, int, int], second: tuple[int, int, int, int]
+    ) -> typing.Iterator[Cell]:
+        """
+        The cells of the range ``first`` outside the range ``second``: the columns on
+        either side of ``second``, and the cells above and below it in between.
+        """
+        x0, y0, x1, y1 = first
+        sx0, sy0, sx1, sy1 = second
+        if sx0 > x1 or sx1 < x0 or sy0 > y1 or sy1 < y0:
+            yield from SpatialIndex._range_cells(first)
+            return
+        for x in itertools.chain(range(x0, sx0), range(sx1 + 1, x1 + 1)):
+            for y in range(y0, y1 + 1):
+                yield x, y
+        for x in range(max(x0, sx0), min(x1, sx1) + 1):
+            for y in itertools.chain(range(y0, sy0), range(sy1 + 1, y1 + 1)):
+                yield x, y
+
+    @staticmethod
+    def _ring_cells(x0: int, y0: int, x1: int, y1: int) -> typing.Iterator[Cell]:
+        """
+        The cells on the border of the rectangle of cells from (x0, y0) to (x1, y1).
+        """
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            yield from SpatialIndex._range_cells((x0, y0, x1, y1))
+            return
+        for x in range(x0, x1 + 1):
+            yield x, y0
+            yield x, y1
+        for y in range(y0 + 1, y1):
+            yield x0, y
+            yield x1, y
+
+    def _candidates(
+        self, x0: float, y0: float, x1: float, y1: float
+    ) -> typing.Iterator[int]:
+        # Include the cells that only touch the area, as touching is within reach.
+        size = self.cell_size
+        cell_range = (
+            math.ceil(x0 / size) - 1,
+            math.ceil(y0 / size) - 1,
+            math.floor(x1 / size),
+            math.floor(y1 / size),
+        )
+        query_cells = (cell_range[2] - cell_range[0] + 1) * (
+            cell_range[3] - cell_range[1] + 1
+        )
+        seen = set()
+        if query_cells <= len(self._cells):
+            cells = (
+                self._cells.get(cell, ()) for cell in self._range_cells(cell_range)
+            )
+        else:
+            # A huge area and a sparse battlefield: visit the occupied cells instead.
+            cx0, cy0, cx1, cy1 = cell_range
+            cells = (
+                keys
+                for (x, y), keys in self._cells.items()
+                if cx0 <= x <= cx1 and cy0 <= y <= cy1
+            )
+        for keys in cells:
+            for key in keys:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def _unlink(self, key: int, cells: typing.Iterable[Cell]):
+        for cell in cells:
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import math
+import typing
+
+import numpy as np
+
+import nos.world as world
+import nos.world.conditions as conditions
+from nos.world.spatial import SQUARE
+
+Cell = tuple[int, int]
+
+# Maps (depth, column) in an octant pair to grid offsets: north, east, south, west.
+_QUADRANTS = (
+    lambda depth, column: (column, -depth),
+    lambda depth, column: (depth, column),
+    lambda depth, column: (column, depth),
+    lambda depth, column: (-depth, column),
+)
+
+
+class Visibility:
+    """
+    Line of sight over a grid of squares, with a field of view cached per origin square.
+
+    Fields of view are computed with symmetric shadowcasting, so A sees B exactly when B
+    sees A. Each cached view remembers the squares it looked at, and changing whether a
+    square blocks sight throws away only the views that looked at it: a door opening at
+    one end of the battlefield leaves the views at the other end alone.
+
+    Parameters
+    ----------
+    width, height : int
+        The size of the grid, in squares.
+    square : float
+        The side of a square, in feet.
+    radius : int
+        How far sight reaches, in squares. Unlimited by default.
+
+    Attributes
+    ----------
+    opaque : np.ndarray
+        Shape ``(width, height)`` whether each square blocks sight: a wall, a closed
+        door, or an obstructing creature. Read only; see ``set_opaque`` and
+        ``add_obstruction``.
+    """
+
+    def __init__(
+        self, width: int, height: int, square: float = SQUARE, radius: int = None
+    ):
+        self.width = width
+        self.height = height
+        self.square = square
+        self.radius = radius
+        self._walls = np.zeros((width, height), dtype=bool)
+        self._obstructions = np.zeros((width, height), dtype=np.int64)
+        self._obstruction_cells: dict[int, list[Cell]] = {}
+        self._views: dict[Cell, tuple[frozenset[Cell], set[Cell]]] = {}
+        # The origins of the cached views that looked at each square.
+        self._watchers: dict[Cell, set[Cell]] = {}
+        self._opaque = np.zeros((width, height), dtype=bool)
+        self._opaque_rows = (
+            self._opaque.tolist()
+        )  # the same, faster to index one by one
+        self.opaque = self._opaque.view()
+        self.opaque.flags.writeable = False
+
+    @classmethod
+    def from_grid(cls, grid, radius: int = None) -> Visibility:
+        """
+        A Visibility whose walls are the blocked squares of a pathfinding BattleGrid.
+        """
+        visibility = cls(grid.width, grid.height, grid.square, radius)
+        visibility._walls[:] = visibility._opaque[:] = grid.blocked
+        visibility._opaque_rows = visibility._opaque.tolist()
+        return visibility
+
+    def set_opaque(
+        self, x0: int, y0: int, x1: int = None, y1: int = None, value: bool = True
+    ):
+        """
+        Put up (or take down) walls or closed doors over the squares from (x0, y0) to
+        (x1, y1), inclusive.
+        """
+        x1 = x0 if x1 is None else x1
+        y1 = y0 if y1 is None else y1
+        self._walls[x0 : x1 + 1, y0 : y1 + 1] = value
+        self._refresh([(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)])
+
+    def add_obstruction(self, entity: world.Entity):
+        """
+        Make ``entity`` block sight through the squares it occupies, until it's removed.
+        Call ``update`` after it moves.
+        """
+        self.remove_obstruction(entity)
+        cells = [cell for cell in self.cells_of(entity) if self.in_bounds(cell)]
+        self._obstruction_cells[id(entity)] = cells
+        for cell in cells:
+            self._obstructions[cell] += 1
+        self._refresh(cells)
+
+    def remove_obstruction(self, entity: world.Entity):
+        cells = self._obstruction_cells.pop(id(entity), [])
+        for cell in cells:
+            self._obstructions[cell] -= 1
+        self._refresh(cells)
+
+    def update(self, entity: world.Entity):
+        if id(entity) in self._obstruction_cells:
+            self.add_obstruction(entity)
+
+    def in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def cells_of(self, entity: world.Entity) -> list[Cell]:
+        """
+        The squares an entity occupies, at least one even for Tiny creatures.
+        """
+        x = math.floor(entity.world_position.x / self.square)
+        y = math.floor(entity.world_position.y / self.square)
+        side = max(1, math.ceil(entity.size.square_size))
+        return [(x + dx, y + dy) for dx in range(side) for dy in range(side)]
+
+    def field_of_view(self, origin: Cell) -> frozenset[Cell]:
+        """
+        The squares visible from ``origin``, walls included.
+        """
+        view = self._views.get(origin)
+        if view is None:
+            view = self._views[origin] = self._shadowcast(origin)
+            for cell in view[1]:
+                self._watchers.setdefault(cell, set()).add(origin)
+        return view[0]
+
+    def line_of_sight(self, first: world.Entity, second: world.Entity) -> bool:
+        """
+        Whether any square of ``first`` can be seen from any square of ``second``.
+        """
+        targets = self.cells_of(second)
+        return any(
+            not self.field_of_view(origin).isdisjoint(targets)
+            for origin in self.cells_of(first)
+            if self.in_bounds(origin)
+        )
+
+    def can_see(self, viewer: world.Entity, target: world.Entity) -> bool:
+        """
+        Whether ``viewer`` can see ``target``: it isn't blinded, the target isn't
+        invisible, and there is a line of sight between them.
+        """
+        if viewer.has_condition(conditions.Blinded):
+            return False
+        if target.has_condition(conditions.Invisible):
+            return False
+        return self.line_of_sight(viewer, target)
+
+    def visible_to(
+        self, viewer: world.Entity, entities: typing.Iterable[world.Entity]
+    ) -> list[world.Entity]:
+        return [
+            entity
+            for entity in entities
+            if entity is not viewer and self.can_see(viewer, entity)
+        ]
+
+    def _refresh(self, cells: typing.Iterable[Cell]):
+        # Only the changed squares are written, so a creature moving costs as much as
+        # the squares it covers, whatever the size of the grid.
+        rows = self._opaque_rows
+        for x, y in cells:
+            opaque = bool(self._walls[x, y] or self._obstructions[x, y] > 0)
+            if opaque != rows[x][y]:
+                self._opaque[x, y] = rows[x][y] = opaque
+                for origin in self._watchers.pop((x, y), ()):
+                    self._forget(origin)
+
+    def _forget(self, origin: Cell):
+        view = self._views.pop(origin, None)
+        if view is None:
+            return
+        for cell in view[1]:
+            watchers = self._watchers.get(cell)
+            if watchers is not None:
+                watchers.discard(origin)
+                if not watchers:
+                    del self._watchers[cell]
+
+    def _shadowcast(self, origin: Cell) -> tuple[frozenset[Cell], set[Cell]]:
+        """
+        Symmetric shadowcasting from ``origin``, quadrant by quadrant.
+
+        Returns
+        -------
+        tuple[frozenset[Cell], set[Cell]]: the visible squares, and every square looked
+            at, which the view depends on.
+        """
+        opaque = self._opaque_rows
+        width, height = self.width, self.height
+        ox, oy = origin
+        max_depth = self.radius if self.radius is not None else max(width, height)
+        visible = {origin}
+        examined = {origin}
+        for transform in _QUADRANTS:
+            # Slopes are kept as (numerator, denominator) pairs of integers, with a
+            # positive denominator, to stay exact without the cost of Fractions.
+            rows = [(1, -1, 1, 1, 1)]
+            while rows:
+                depth, start_n, start_d, end_n, end_d = rows.pop()
+                if depth > max_depth:
+                    continue
+                previous = None  # None, or whether the previous square was opaque
+                # Round depth * start_slope half up and depth * end_slope half down.
+                first_column = (2 * depth * start_n + start_d) // (2 * start_d)
+                last_column = -((end_d - 2 * depth * end_n) // (2 * end_d))
+                for column in range(first_column, last_column + 1):
+                    dx, dy = transform(depth, column)
+                    x, y = ox + dx, oy + dy
+                    in_bounds = 0 <= x < width and 0 <= y < height
+                    wall = not in_bounds or opaque[x][y]
+                    if in_bounds:
+                        examined.add((x, y))
+                        if (
+                            wall
+                            or depth * start_n <= column * start_d
+                            and column * end_d <= depth * end_n
+                        ):
+                            visible.add((x, y))
+                    if previous is True and not wall:
+                        start_n, start_d = 2 * column - 1, 2 * depth
+                    if previous is False and wall:
+                        rows.append(
+                            (depth + 1, start_n, start_d, 2 * column - 1, 2 * depth)
+                        )
+                    previous = wall
+                if previous is False:
+                    rows.append((depth + 1, start_n, start_d, end_n, end_d))
+        return frozenset(visible), examined
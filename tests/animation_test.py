@@ -0,0 +1,55 @@
+import pygame as pg
+
+import nos
+import nos.assets as assets
+
+
+def strip_asset(loop: bool = True) -> assets.AnimatedAsset:
+    """
+    Three 8x8 frames, shown for 6 frames each: 100 ms at 60 frames per second.
+    """
+    return assets.AnimatedAsset(
+        spritesheet=pg.Surface((24, 8), pg.SRCALPHA),
+        tile_size=(8, 8),
+        animation_tiles={"idle": [(0, 0), (1, 0), (2, 0)], "dead": [(0, 0), (1, 0)]},
+        frame_duration=6,
+        loop={"idle": loop, "dead": False},
+    )
+
+
+def test_animations_play_by_elapsed_time(display):
+    clock = nos.AnimationClock()
+    asset = strip_asset()
+    sprite = nos.AnimatedSprite(asset, clock=clock)
+    frames = asset.animations["idle"].frames
+    clock.advance(150)  # one slow frame of the game
+    sprite.update()
+    assert sprite.image is frames[1]
+    clock.advance(160)
+    sprite.update()
+    assert sprite.image is frames[0]  # looped around
+
+
+def test_sprites_keep_their_own_place(display):
+    clock = nos.AnimationClock()
+    asset = strip_asset()
+    first = nos.AnimatedSprite(asset, clock=clock)
+    second = nos.AnimatedSprite(asset, clock=clock)
+    frames = asset.animations["idle"].frames
+    clock.advance(120)
+    second.state = "dead"
+    second.state = "idle"  # restarts only the second sprite
+    first.update()
+    second.update()
+    assert first.image is frames[1]
+    assert second.image is frames[0]
+
+
+def test_animations_without_loop_stop_on_their_last_frame(display):
+    clock = nos.AnimationClock()
+    sprite = nos.AnimatedSprite(strip_asset(), initial_state="dead", clock=clock)
+    assert not sprite.cursor.done
+    clock.advance(1000)
+    sprite.update()
+    assert sprite.cursor.done
+    assert sprite.image is sprite.animation.frames[-1]
@@ -0,0 +1,115 @@
+import weakref
+from pathlib import Path
+
+import pygame as pg
+import pytest
+
+import nos
+import nos.assets as assets
+import nos.sprite_cache as sprite_cache
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    """
+    A budget of two 16x16 spritesheets.
+    """
+    loaded = assets.LoadedAssets(2 * 16 * 16 * 4)
+    monkeypatch.setattr(assets, "LOADED", loaded)
+    return loaded
+
+
+def square_asset() -> assets.Asset:
+    return assets.Asset(spritesheet=pg.Surface((16, 16), pg.SRCALPHA))
+
+
+def test_assets_load_on_first_use(display, loaded):
+    asset = square_asset()
+    assert not asset.loaded and asset not in loaded
+    assert asset.image.get_size() == (16, 16)
+    assert asset.loaded and asset in loaded
+    assert loaded.nbytes == asset.nbytes
+
+
+def test_least_recently_used_assets_are_unloaded(display, loaded):
+    first, second, third = square_asset(), square_asset(), square_asset()
+    first.load()
+    second.load()
+    first.image  # now second is the least recently used
+    third.load()
+    assert first.loaded and third.loaded
+    assert not second.loaded and second not in loaded
+    assert loaded.nbytes == first.nbytes + third.nbytes
+    assert second.image.get_size() == (16, 16)  # loaded again on use
+
+
+def test_assets_in_use_are_kept(display, loaded):
+    first, second, third = square_asset(), square_asset(), square_asset()
+    sprite = nos.Sprite(first)
+    second.load()
+    third.load()
+    assert first.loaded and not second.loaded
+    del sprite
+    second.load()
+    assert not first.loaded
+
+
+def test_load_all_decodes_on_workers(display, loaded, tmp_path, monkeypatch):
+    monkeypatch.setattr(sprite_cache, "CACHE", sprite_cache.SpriteCache(tmp_path))
+    loaded.budget = 2**30
+    try:
+        times = assets.load_all(workers=4)
+        assert set(times) == set(assets.REGISTRY)
+        assert all(seconds > 0 for seconds in times.values())
+        assert all(asset.loaded for asset in assets.REGISTRY.values())
+        assert not assets._decoded  # the batch lets go of the decoded files
+        reference = assets.Asset(
+            path=Path("assets/Skeleton_Archer.png"),
+            tile_size=(32, 34),
+            colorkey=(255, 0, 255),
+        )
+        assert pg.image.tobytes(
+            assets.REGISTRY["minions.SKELETON_ARCHER"].get_tile((0, 0)), "RGBA"
+        ) == pg.image.tobytes(reference.get_tile((0, 0)), "RGBA")
+    finally:
+        for asset in assets.REGISTRY.values():
+            asset.unload()
+
+
+def test_load_assets_keeps_order(display, tmp_path):
+    paths = []
+    for width in range(1, 6):
+        paths.append(tmp_path / f"{width}.png")
+        pg.image.save(pg.Surface((width, 1)), paths[-1])
+    images = assets.load_assets(paths)
+    assert [image.get_width() for image in images] == [1, 2, 3, 4, 5]
+
+
+def test_tiles_are_shared(display, loaded):
+    asset = assets.AnimatedAsset(
+        spritesheet=pg.Surface((32, 16), pg.SRCALPHA),
+        tile_size=(8, 8),
+        animation_tiles={"idle": [(0, 0), (1, 0)], "walking": [(1, 0), (2, 0)]},
+    )
+    tile = asset.get_tile((1, 0))
+    assert asset.get_tile((1, 0)) is tile
+    assert asset.animations["idle"].frames[1] is asset.animations["walking"].frames[0]
+    assert nos.Sprite(asset).image is nos.Sprite(asset).image is asset.image
+    asset.unload()
+    assert asset.get_tile((1, 0)) is not tile  # cut from the reloaded spritesheet
+
+
+def test_decoded_images_are_not_kept(display, loaded, tmp_path, monkeypatch):
+    monkeypatch.setattr(sprite_cache, "CACHE", sprite_cache.SpriteCache(tmp_path))
+    decoded = []
+    load = pg.image.load
+
+    def tracked_load(path):
+        image = load(path)
+        decoded.append(weakref.ref(image))
+        return image
+
+    monkeypatch.setattr(pg.image, "load", tracked_load)
+    asset = assets.Asset(path=Path("assets/Skeleton_Archer.png"), tile_size=(32, 34))
+    asset.load()
+    assert len(decoded) == 1 and decoded[0]() is None
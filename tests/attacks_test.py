@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+import nos.world as world
+import nos.world.abilities as abilities
+from nos import dice
+from nos.world.attacks import Attack, Weapon
+from nos.world.creatures import Creature
+
+
+class LoadedStream(dice.RandomStream):
+    """
+    A stream whose d20s come up in a fixed order and whose other dice always roll their maximum.
+    """
+
+    def __init__(self, d20_rolls: list[int]):
+        super().__init__(0)
+        self.d20_rolls = d20_rolls
+        self._next_d20 = iter(d20_rolls)
+
+    def randint(self, low, high):
+        return next(self._next_d20) if high == 20 else high
+
+    def integers(self, low, high, size=None):
+        if np.all(high == 20):
+            return np.array(self.d20_rolls).reshape(size)
+        return np.broadcast_to(high, size).copy()
+
+
+@pytest.fixture
+def shortbow_attack():
+    shortbow = Weapon(
+        "Shortbow", "A simple bow.", world.Small(), 0, 1, damage_roll="1d6"
+    )
+    return Attack(
+        name="Shortbow",
+        description="Ranged Weapon Attack",
+        ability=abilities.Dexterity(score=14),
+        proficiency_bonus=2,
+        range=80,
+        weapon=shortbow,
+    )
+
+
+@pytest.fixture
+def paladin():
+    return Creature("Paladin", "A very shiny target.", world.Medium(), 18, 45)
+
+
+def test_resolve_many_matches_resolve(shortbow_attack, paladin):
+    """
+    Test that the batch resolution agrees with the scalar one for every d20 roll.
+    """
+    d20_rolls = list(range(1, 21))
+    results = shortbow_attack.resolve_many(
+        len(d20_rolls), paladin, crit_range_min=19, rng=LoadedStream(d20_rolls)
+    )
+    for index, d20_roll in enumerate(d20_rolls):
+        hit, damage, _ = shortbow_attack.resolve(
+            None, paladin, crit_range_min=19, rng=LoadedStream([d20_roll])
+        )
+        assert results.damage[index] == damage
+        assert results.hits[index] == (damage > 0)
+        assert results.crits[index] == (hit is True)
+    assert not results.hits[0]
+    assert results.crits.sum() == 2
+    assert results.hits.sum() == 7  # 14 + 4 meets AC 18, plus the crits
+
+
+def test_critical_hits_add_only_the_kept_dice(shortbow_attack, paladin):
+    """
+    Test that a crit adds the maximum of the dice the damage roll keeps, and no more.
+    """
+    shortbow_attack.weapon.damage_roll = dice.parse("2d8kh1")
+    assert shortbow_attack.weapon.critical_damage == 8
+    _, damage, _ = shortbow_attack.resolve(None, paladin, rng=LoadedStream([20]))
+    assert damage == 8 + 8 + 2
+    results = shortbow_attack.resolve_many(1, paladin, rng=LoadedStream([20]))
+    assert results.damage.tolist() == [damage]
+    distribution = shortbow_attack.weapon.damage_roll.distribution()
+    assert np.isclose(
+        shortbow_attack.odds(paladin).expected_damage,
+        7 / 20 * (distribution.expected_value + 2) + 1 / 20 * 8,
+    )
+    shortbow_attack.weapon.damage_roll = dice.parse("1d6-1d4")
+    assert shortbow_attack.weapon.critical_damage == 2
+
+
+def test_resolve_many_hit_rate_matches_probability(shortbow_attack, paladin):
+    """
+    Test that a large volley hits about as often as the exact odds predict.
+    """
+    skeletons = [
+        Creature("Skeleton", "Rattles.", world.Medium(), 13, 13) for _ in range(200)
+    ]
+    results = Creature.group_attack(
+        skeletons * 100, paladin, shortbow_attack, rng=dice.RandomStream(7)
+    )
+    assert len(results) == 20000
+    assert np.isclose(results.hits.mean(), 7 / 20, atol=0.02)
+    assert np.isclose(results.crits.mean(), 1 / 20, atol=0.01)
+    assert (results.damage[results.misses] == 0).all()
+
+
+def test_resolve_many_per_target_armor_class(shortbow_attack, paladin):
+    """
+    Test that each attacker can have its own target.
+    """
+    unarmored = Creature("Commoner", "Unlucky.", world.Medium(), 0, 4)
+    results = shortbow_attack.resolve_many(
+        4, [unarmored, paladin, unarmored, paladin], rng=LoadedStream([10, 10, 1, 20])
+    )
+    assert results.hits.tolist() == [True, False, False, True]
+    with pytest.raises(ValueError):
+        shortbow_attack.resolve_many(3, [unarmored, paladin])
+
+
+def test_odds_table_matches_exact_odds(shortbow_attack, paladin):
+    """
+    Test the tabulated odds against hand-computed values, and that tables are cached.
+    """
+    odds = shortbow_attack.odds(paladin)
+    assert odds.armor_class == 18
+    assert np.isclose(odds.hit_chance, 7 / 20)
+    assert np.isclose(odds.crit_chance, 1 / 20)
+    assert np.isclose(odds.expected_damage, 7 / 20 * (3.5 + 2) + 1 / 20 * 6)
+    table = shortbow_attack.odds_table()
+    assert table.armor_classes.tolist() == list(range(5, 31))
+    assert np.isclose(table[30].hit_chance, 1 / 20)
+    assert shortbow_attack.odds_table() is table
+    advantage = shortbow_attack.odds(paladin, dice.Situation.ADVANTAGE)
+    assert np.isclose(advantage.hit_chance, 1 - (13 / 20) ** 2)
+
+
+def test_odds_table_follows_attack_changes(shortbow_attack, paladin):
+    """
+    Test that changing the attack's numbers gives a freshly computed table.
+    """
+    table = shortbow_attack.odds_table()
+    shortbow_attack.proficiency_bonus = 3
+    assert shortbow_attack.odds_table() is not table
+    assert np.isclose(shortbow_attack.odds(paladin).hit_chance, 8 / 20)
+    shortbow_attack.weapon.damage_roll = dice.parse("1d8")
+    assert np.isclose(
+        shortbow_attack.odds(paladin).expected_damage, 8 / 20 * (4.5 + 2) + 1 / 20 * 8
+    )
+
+
+def test_resolve_average(shortbow_attack, paladin):
+    """
+    Test mob-style resolution without rolling.
+    """
+    hits, damage = shortbow_attack.resolve_average(200, paladin)
+    assert hits == 70
+    assert damage == round(200 * (7 / 20 * 5.5 + 1 / 20 * 6))
@@ -0,0 +1,27 @@
+import nos.assets.minions as minions
+import nos.cards as cards
+
+
+def test_cards_share_composited_faces(fonts):
+    archer = cards.Card(minions.SKELETON_ARCHER, card_data={"name": "Archer"})
+    other = cards.Card(minions.SKELETON_ARCHER, card_data={"name": "Archer"})
+    assert len(archer) == 2  # the face and the icon
+    assert archer.face.image is other.face.image
+
+    face = archer.face.image
+    archer.select()
+    assert archer.face.image is not face and len(archer) == 2
+    archer.deselect()
+    assert archer.face.image is face
+
+    archer.rename("Bob")
+    assert archer.face.image is not face
+    assert archer.card_data["name"] == "Bob"
+
+
+def test_card_parts_follow_it(fonts):
+    card = cards.Card(minions.SKELETON_ARCHER, position=(10, 20), icon_offset=(5, 6))
+    card.rect.topleft = (100, 200)
+    card.update()
+    assert card.face.rect.topleft == (100, 200)
+    assert card.icon.rect.topleft == (105, 206)
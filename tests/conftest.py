@@ -1,11 +1,36 @@
+import os
 import subprocess
 import sys
 
+import pygame as pg
 import pytest
 
+import nos.cards as cards
+import nos.text as text
+
 
 @pytest.fixture
 def game_process():
     game_process = subprocess.Popen([sys.executable, "src/nos/main.py"])
     yield game_process
     game_process.kill()
+
+
+@pytest.fixture
+def display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    yield
+    pg.display.quit()
+
+
+@pytest.fixture
+def fonts(display):
+    pg.font.init()
+    yield
+    # Fonts, and the texts rendered in them, don't outlive pg.font.
+    text.font.cache_clear()
+    text._render.cache_clear()
+    cards.card_face.cache_clear()
+    pg.font.quit()
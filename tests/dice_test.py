@@ -0,0 +1,205 @@
+import collections
+import itertools
+
+import numpy as np
+
+from nos import dice
+
+
+def test_die_roll_is_an_integer_within_its_sides():
+    """
+    Test that a scalar roll returns a single value between 1 and the number of sides.
+    """
+    for situation in (None, *dice.SITUATION_ROLLS):
+        result = dice.d6.roll(situation)
+        assert isinstance(result, int)
+        assert 1 <= result <= 6
+
+
+def test_roll_many_shape_and_bounds():
+    """
+    Test that batch rolls of a single die cover every situation and stay in bounds.
+    """
+    for situation in dice.SITUATION_ROLLS:
+        results = dice.d20.roll_many(1000, situation)
+        assert results.shape == (1000,)
+        assert results.min() >= 1
+        assert results.max() <= 20
+
+
+def test_roll_many_situations_shift_the_mean():
+    """
+    Test that advantage and elven accuracy raise, and disadvantage lowers, the average roll.
+    """
+    plain = dice.d20.roll_many(20000).mean()
+    advantage = dice.d20.roll_many(20000, dice.Situation.ADVANTAGE).mean()
+    disadvantage = dice.d20.roll_many(20000, dice.Situation.DISADVANTAGE).mean()
+    elven = dice.d20.roll_many(20000, dice.Situation.ELVEN_ACCURACY).mean()
+    assert disadvantage < plain < advantage < elven
+
+
+def test_roll_batch_keeps_highest_and_lowest():
+    """
+    Test that keep-highest/lowest batch totals stay within the range of the kept dice.
+    """
+    four_d6 = dice.Roll(*[dice.d6] * 4)
+    totals = four_d6.roll_batch(1000)
+    assert totals.min() >= 4 and totals.max() <= 24
+    highest = four_d6.roll_batch(1000, highest=3)
+    assert highest.min() >= 3 and highest.max() <= 18
+    lowest = four_d6.roll_batch(1000, lowest=1)
+    assert lowest.min() >= 1 and lowest.max() <= 6
+
+
+def test_keep_and_total_matches_sorting():
+    """
+    Test that the vectorized keep-highest/lowest agrees with the scalar sorting approach.
+    """
+    rolls = np.array([[3, 6, 1, 4], [2, 2, 5, 1]])
+    assert dice.keep_and_total(rolls, highest=2).tolist() == [10, 7]
+    assert dice.keep_and_total(rolls, lowest=2).tolist() == [4, 3]
+    assert dice.keep_and_total(rolls).tolist() == [14, 10]
+
+
+def test_distribution_of_3d6():
+    """
+    Test the exact distribution of 3d6 against known values.
+    """
+    three_d6 = dice.Roll(dice.d6, dice.d6, dice.d6).distribution()
+    assert (three_d6.minimum, three_d6.maximum) == (3, 18)
+    assert np.isclose(three_d6.expected_value, 10.5)
+    assert np.isclose(three_d6.variance, 3 * 35 / 12)
+    assert np.isclose(three_d6.probability(10), 27 / 216)
+    assert np.isclose(three_d6.at_least(14), 35 / 216)
+    assert three_d6.cdf(2) == 0 and np.isclose(three_d6.cdf(18), 1)
+
+
+def test_distribution_of_situations():
+    """
+    Test that advantage matches keeping the highest of two dice, and disadvantage the lowest.
+    """
+    two_d20 = dice.Roll(dice.d20, dice.d20)
+    advantage = dice.d20.distribution(dice.Situation.ADVANTAGE)
+    disadvantage = dice.d20.distribution(dice.Situation.DISADVANTAGE)
+    assert np.allclose(advantage.pmf, two_d20.distribution(highest=1).pmf)
+    assert np.allclose(disadvantage.pmf, two_d20.distribution(lowest=1).pmf)
+    assert np.isclose(advantage.at_least(20), 1 - (19 / 20) ** 2)
+
+
+def test_distribution_keep_highest_and_lowest():
+    """
+    Test kept-dice distributions against every outcome of small rolls, mixed dice
+    included, and that large ones stay fast.
+    """
+    for sides, kept in (((6, 6, 6, 6), 3), ((4, 8, 8), 2), ((4, 6, 10, 12), 2)):
+        for highest in (True, False):
+            totals = collections.Counter(
+                sum(sorted(faces)[-kept:] if highest else sorted(faces)[:kept])
+                for faces in itertools.product(*(range(1, s + 1) for s in sides))
+            )
+            roll = dice.Roll(*(dice.Die(s) for s in sides))
+            distribution = roll.distribution(
+                highest=kept if highest else None, lowest=None if highest else kept
+            )
+            expected = np.array(
+                [totals[total] for total in range(min(totals), max(totals) + 1)]
+            )
+            assert distribution.minimum == min(totals)
+            assert np.allclose(distribution.pmf, expected / expected.sum())
+    twelve_d20 = dice.parse("12d20kh6").distribution()
+    assert (twelve_d20.minimum, twelve_d20.maximum) == (6, 120)
+
+
+def test_distribution_keep_highest_is_memoized():
+    """
+    Test 4d6 drop lowest against its known mean, and that equivalent rolls share a cache entry.
+    """
+    ability_score = dice.Roll(*[dice.d6] * 4).distribution(highest=3)
+    assert np.isclose(ability_score.expected_value, 15869 / 1296)
+    assert dice.Roll(*[dice.d6] * 4).distribution(highest=3) is ability_score
+    mixed = dice.Roll(dice.d8, dice.d4).distribution()
+    assert dice.Roll(dice.d4, dice.d8).distribution() is mixed
+
+
+def test_parse_expressions():
+    """
+    Test that dice expressions compile into the expected plans.
+    """
+    assert dice.parse("8d6+3") == dice.RollPlan((dice.DiceTerm(8, 6),), 3)
+    assert dice.parse("2d20kh1 + 5") == dice.RollPlan(
+        (dice.DiceTerm(2, 20, highest=1),), 5
+    )
+    assert dice.parse("4d6dl1") == dice.parse("4d6kh3")
+    assert dice.parse("4d6d1") == dice.parse("4d6kh3")
+    assert dice.parse("4d6dh1") == dice.parse("4d6kl3")
+    assert dice.parse("D20") == dice.RollPlan((dice.DiceTerm(1, 20),))
+    assert str(dice.parse("1d8 + 1d6 - 2")) == "1d8+1d6-2"
+    assert dice.parse("8d6+3") is dice.parse("8d6+3")
+
+
+def test_parse_rejects_invalid_expressions():
+    """
+    Test that malformed expressions raise a ValueError.
+    """
+    for expression in ("", "d", "3x", "1d6 2", "++3", "2d6kh3", "4d6dl4"):
+        try:
+            dice.parse(expression)
+        except ValueError:
+            continue
+        raise AssertionError(f"{expression!r} should not parse")
+
+
+def test_roll_plan_execution_modes_agree():
+    """
+    Test that scalar, batch and exact modes of a plan cover the same outcomes.
+    """
+    plan = dice.parse("2d20kh1+5")
+    distribution = plan.distribution()
+    assert (distribution.minimum, distribution.maximum) == (6, 25)
+    assert distribution.minimum <= plan.roll() <= distribution.maximum
+    batch = plan.roll_batch(1000)
+    assert batch.min() >= distribution.minimum
+    assert batch.max() <= distribution.maximum
+    assert np.isclose(
+        distribution.expected_value,
+        dice.d20.distribution(dice.Situation.ADVANTAGE).expected_value + 5,
+    )
+    assert len(dice.parse("8d6+3").dice) == 8
+
+
+def test_seeded_streams_replay_exactly():
+    """
+    Test that two streams with the same seed produce identical scalar and batch rolls.
+    """
+    first, second = dice.RandomStream(1234), dice.RandomStream(1234)
+    plan = dice.parse("2d20kh1+5")
+    assert [plan.roll(first) for _ in range(50)] == [
+        plan.roll(second) for _ in range(50)
+    ]
+    assert np.array_equal(
+        dice.d20.roll_many(100, dice.Situation.ADVANTAGE, first),
+        dice.d20.roll_many(100, dice.Situation.ADVANTAGE, second),
+    )
+
+
+def test_spawned_streams_are_independent_and_reproducible():
+    """
+    Test that child streams differ from each other but are reproducible from the parent seed.
+    """
+    children = dice.RandomStream(99).spawn(2)
+    replayed = dice.RandomStream(99).spawn(2)
+    first = dice.d100.roll_many(100, rng=children[0])
+    assert not np.array_equal(first, dice.d100.roll_many(100, rng=children[1]))
+    assert np.array_equal(first, dice.d100.roll_many(100, rng=replayed[0]))
+
+
+def test_using_binds_the_stream_for_a_block():
+    """
+    Test that rolls without an explicit stream use the one bound by ``dice.using``.
+    """
+    four_d6 = dice.Roll(*[dice.d6] * 4)
+    with dice.using(5):
+        first = [four_d6.roll(highest=3) for _ in range(20)]
+    with dice.using(dice.RandomStream(5)):
+        second = [four_d6.roll(highest=3) for _ in range(20)]
+    assert first == second
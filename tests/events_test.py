@@ -0,0 +1,73 @@
+import pygame as pg
+
+import nos.events as events
+
+
+class Target:
+    def __init__(self, rect, handles=(pg.MOUSEBUTTONDOWN,)):
+        self.rect = pg.Rect(rect)
+        self.handles = handles
+        self.received = []
+
+    def handle_event(self, event):
+        self.received.append(event.type)
+        if event.type == pg.MOUSEMOTION and pg.MOUSEMOTION in self.handles:
+            self.rect.move_ip(event.rel)
+        return event.type in self.handles
+
+
+def press(position):
+    return pg.event.Event(pg.MOUSEBUTTONDOWN, pos=position, button=1)
+
+
+def motion(position, rel):
+    return pg.event.Event(pg.MOUSEMOTION, pos=position, rel=rel, buttons=(1, 0, 0))
+
+
+def test_pointer_events_go_to_the_topmost_hit():
+    bottom, middle, top = (
+        Target((0, 0, 100, 100)),
+        Target((10, 10, 20, 20)),
+        Target((500, 500, 20, 20)),
+    )
+    router = events.EventRouter([bottom, middle, top])
+    assert router.dispatch(press((15, 15))) is middle
+    assert bottom.received == [] and top.received == []
+    assert router.dispatch(press((50, 50))) is bottom
+    assert router.dispatch(press((700, 700))) is None
+
+
+def test_unhandled_events_fall_through_to_lower_hits():
+    bottom = Target((0, 0, 100, 100), handles=(pg.MOUSEBUTTONUP,))
+    top = Target((0, 0, 100, 100), handles=())
+    router = events.EventRouter([bottom, top])
+    release = pg.event.Event(pg.MOUSEBUTTONUP, pos=(5, 5), button=1)
+    assert router.dispatch(release) is bottom
+    assert top.received == [pg.MOUSEBUTTONUP]
+
+
+def test_pressed_target_captures_the_pointer():
+    card = Target((0, 0, 10, 10), handles=(pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION))
+    other = Target((200, 0, 10, 10), handles=(pg.MOUSEMOTION,))
+    router = events.EventRouter([card, other])
+    router.dispatch(press((5, 5)))
+    # A fast drag leaves the card behind the pointer, over another target.
+    assert router.dispatch(motion((205, 5), (100, 0))) is card
+    assert card.rect.topleft == (100, 0) and other.received == []
+    assert router.index.at((105, 5)) == [card]
+    router.dispatch(pg.event.Event(pg.MOUSEBUTTONUP, pos=(205, 5), button=1))
+    assert router.captured is None
+    assert router.dispatch(motion((205, 5), (0, 0))) is other
+
+
+def test_motion_is_coalesced():
+    up = pg.event.Event(pg.MOUSEBUTTONUP, pos=(9, 9), button=1)
+    merged = events.coalesce(
+        [motion((1, 1), (1, 1)), motion((3, 4), (2, 3)), up, motion((9, 9), (6, 5))]
+    )
+    assert [event.type for event in merged] == [
+        pg.MOUSEMOTION,
+        pg.MOUSEBUTTONUP,
+        pg.MOUSEMOTION,
+    ]
+    assert merged[0].pos == (3, 4) and merged[0].rel == (3, 4)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import nos.world as world
+import nos.world.conditions as conditions
+import nos.world.formations as formations
+import nos.world.movement as movement
+from nos.world.creatures import Creature
+from nos.world.horde import Horde
+
+
+def skeleton(x: float = 0, y: float = 0) -> Creature:
+    return Creature(
+        "Skeleton",
+        "",
+        world.Medium(),
+        13,
+        13,
+        movements=[movement.Walk(30)],
+        world_position=world.Position(x, y, 0),
+    )
+
+
+@pytest.fixture
+def skeletons():
+    horde = Horde(skeleton(), 6)
+    horde.position[:, 0] = np.arange(6) * 5
+    return horde
+
+
+def test_shift_clamps_to_movement_budgets(skeletons):
+    """
+    Test that prone units crawl at half speed, immobilized ones stay put, and both are
+    reported as falling short.
+    """
+    skeletons.add_condition(conditions.Prone, [1])
+    skeletons.add_condition(conditions.Paralyzed, [2])
+    skeletons.movement[3] = 25
+    move = formations.shift(skeletons, (0, 20))
+    assert move.fell_short.tolist() == [False, True, True, True, False, False]
+    assert skeletons.position[:, 1].tolist() == [20, 15, 0, 5, 20, 20]
+    assert skeletons.movement.tolist() == [20, 15, 0, 30, 20, 20]
+    move = formations.shift(skeletons, (0, 20), [0, 4])
+    assert move.fell_short.tolist() == [True, True]
+    np.testing.assert_allclose(move.cost, 10)
+
+
+def test_form_matches_creature_and_horde_moves(skeletons):
+    """
+    Test forming up a horde and a list of creatures the same way.
+    """
+    creatures = [skeleton(x, 0) for x in range(0, 30, 5)]
+    horde_move = formations.form(skeletons, "wedge", world.Position(10, 20, 0))
+    creature_move = formations.form(creatures, "wedge", (10, 20))
+    np.testing.assert_allclose(horde_move.end, creature_move.end)
+    assert creature_move.arrived.all()
+    # The point of the wedge leads, and the rows behind it are one square apart.
+    assert sorted(horde_move.end[:, 1].tolist()) == [10, 10, 10, 15, 15, 20]
+    assert creatures[0].turn.movement == pytest.approx(creature_move.cost[0])
+    assert creatures[0].world_position.y == creature_move.end[0, 1]
+    with pytest.raises(ValueError):
+        formations.form(creatures, "phalanx", (0, 0))
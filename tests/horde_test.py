@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+import nos.world as world
+import nos.world.conditions as conditions
+import nos.world.movement as movement
+from nos.dice import Situation
+from nos.world.creatures import Creature
+from nos.world.horde import Horde
+
+
+@pytest.fixture
+def zombies():
+    zombie = world.Entity(
+        "Zombie",
+        "Shambles.",
+        world.Medium(),
+        8,
+        22,
+        movements=[movement.Walk(20)],
+    )
+    return Horde(zombie, 1000)
+
+
+def test_horde_columns_start_from_the_template(zombies):
+    """
+    Test that every spawned unit copies the template's stats.
+    """
+    assert len(zombies) == 1000
+    assert (zombies.current_hit_points == 22).all()
+    assert (zombies.armor_class == 8).all()
+    assert (zombies.remaining_movement == 20).all()
+    assert zombies.position.shape == (1000, 3)
+    assert zombies[0].name == "Zombie"
+
+
+def test_horde_damage_heal_and_compact(zombies):
+    """
+    Test bulk damage with repeated indices, healing up to the maximum and dropping the dead.
+    """
+    zombies.apply_damage(np.array([10, 15, 5]), np.array([0, 0, 1]))
+    assert zombies.current_hit_points[:3].tolist() == [0, 17, 22]
+    zombies.heal(10)
+    assert zombies.current_hit_points[:3].tolist() == [10, 22, 22]
+    zombies.apply_damage(30, np.arange(0, 1000, 2))
+    assert zombies.alive.sum() == 500
+    kept = zombies.compact()
+    assert len(zombies) == 500 and (kept % 2 == 1).all()
+    assert zombies.spawn(600).tolist() == list(range(500, 1100))
+    assert len(zombies) == 1100 and zombies.alive.all()
+
+
+def test_horde_unit_views_write_through(zombies):
+    """
+    Test that a unit view reads and writes its row of the horde.
+    """
+    unit = zombies[3]
+    unit.current_hit_points -= 7
+    unit.move(3, 4)
+    unit.world_position.z = 10
+    assert zombies.current_hit_points[3] == 15
+    assert zombies.position[3].tolist() == [3, 4, 10]
+    assert unit.remaining_movement == 15
+
+
+def test_horde_condition_bitmask(zombies):
+    """
+    Test that conditions are tracked per unit, including the conditions they imply.
+    """
+    zombies.add_condition(conditions.Paralyzed, [1, 2])
+    zombies.add_condition(conditions.Stunned, [2])
+    incapacitated = zombies.has_condition(conditions.Incapacitated)
+    assert np.flatnonzero(incapacitated).tolist() == [1, 2]
+    zombies.remove_condition(conditions.Paralyzed, [1, 2])
+    assert not zombies[1].has_condition(conditions.Immobilized)
+    assert zombies[2].has_condition(conditions.Incapacitated)
+
+
+def test_attacks_on_a_paralyzed_unit_have_advantage(zombies):
+    """
+    Test that a unit's own conditions, not the template's, decide an attack against it.
+    """
+
+    class RecordedAttack:
+        situations = []
+
+        def resolve(self, attacker, target, situation, crit_range_min):
+            self.situations.append(situation)
+            return 0, 0, []
+
+    zombies.add_condition(conditions.Paralyzed, [4])
+    paladin = Creature("Paladin", "Shiny.", world.Medium(), 18, 45)
+    paladin.attack(zombies[4], RecordedAttack())
+    paladin.attack(zombies[5], RecordedAttack())
+    assert RecordedAttack.situations == [Situation.ADVANTAGE, None]
+    assert zombies[4].automatically_fails("strength")
+    assert zombies[4].speed == 0 and zombies[5].speed == 20
+
+
+def test_conditions_added_to_one_unit(zombies):
+    """
+    Test that a unit's conditions are its own, and leave the template alone.
+    """
+    unit = zombies[7]
+    unit.add_condition(conditions.Poisoned(duration=2))
+    assert unit.condition_flags == conditions.Poisoned.bit
+    assert unit.attack_situation == Situation.DISADVANTAGE
+    assert unit.remaining_duration(conditions.Poisoned()) == 2
+    assert np.flatnonzero(zombies.has_condition(conditions.Poisoned)).tolist() == [7]
+    assert not zombies.template.conditions and zombies[8].attack_situation is None
+    unit.remove_condition(conditions.Poisoned())
+    assert not zombies.conditions.any()
+    with pytest.raises(AttributeError):
+        unit.turn
+
+
+def test_horde_start_round_expires_conditions(zombies):
+    """
+    Test that timed conditions end in the round they are due, and only for their units.
+    """
+    zombies.add_condition(conditions.Poisoned, [0, 1], duration=1)
+    zombies.add_condition(conditions.Poisoned, [2], duration=2)
+    zombies.add_condition(conditions.Prone, [3])
+    zombies.movement[:] = 5
+    expired = zombies.start_round()
+    assert [(flag, ended.tolist()) for flag, ended in expired] == [
+        (conditions.Poisoned.bit, [0, 1])
+    ]
+    assert (zombies.movement == 0).all()
+    assert np.flatnonzero(zombies.has_condition(conditions.Poisoned)).tolist() == [2]
+    zombies.start_round()
+    assert not zombies.has_condition(conditions.Poisoned).any()
+    assert zombies[3].has_condition(conditions.Prone)
+
+
+def test_horde_movement_budget_follows_the_movements_left():
+    """
+    Test that a prone unit crawls at half its walking speed, not half its fastest.
+    """
+    griffon = world.Entity(
+        "Griffon",
+        "Soars.",
+        world.Large(),
+        12,
+        59,
+        movements=[movement.Walk(10), movement.Fly(60)],
+    )
+    griffons = Horde(griffon, 3)
+    griffons.add_condition(conditions.Prone, [0])
+    griffons.add_condition(conditions.Grappled, [2])
+    griffon.add_condition(conditions.Prone())
+    assert griffons.movement_budget().tolist() == [griffon.speed, 60, 0]
+    assert griffon.speed == 5
@@ -0,0 +1,91 @@
+import dataclasses
+
+import pytest
+
+import nos.world as world
+import nos.world.abilities as abilities
+from nos.world.creatures import Creature
+from nos.world.horde import Horde
+from nos.world.initiative import InitiativeOrder
+
+
+def creature(name: str, dexterity: int = 10) -> Creature:
+    return Creature(
+        name,
+        "",
+        world.Medium(),
+        12,
+        10,
+        abilities=dataclasses.replace(
+            abilities.DEFAULT_ABILITIES, dexterity=abilities.Dexterity(score=dexterity)
+        ),
+    )
+
+
+@pytest.fixture
+def order():
+    return InitiativeOrder()
+
+
+def names(slot):
+    return [member.name for member in slot.members]
+
+
+def test_turn_order_breaks_ties_by_dexterity(order):
+    """
+    Test that slots act from the highest initiative, then the highest Dexterity bonus.
+    """
+    order.add(creature("Paladin", dexterity=10), initiative=15)
+    order.add(creature("Rogue", dexterity=18), initiative=15)
+    order.add([creature(f"Skeleton {i}", dexterity=14) for i in range(3)], 20)
+    turns = [names(order.next_turn()) for _ in range(4)]
+    assert turns[0] == ["Skeleton 0", "Skeleton 1", "Skeleton 2"]
+    assert turns[1:3] == [["Rogue"], ["Paladin"]]
+    assert turns[3] == turns[0]
+    assert order.round == 2
+
+
+def test_grouped_minions_start_their_turns_together(order):
+    """
+    Test that every member of a slot, including a whole Horde, starts its turn.
+    """
+    skeletons = [creature("Skeleton") for _ in range(3)]
+    zombies = Horde(creature("Zombie"), 50)
+    order.add(skeletons, initiative=12)
+    order.add(zombies, initiative=8)
+    for skeleton in skeletons:
+        skeleton.turn.movement = 30
+    order.next_turn()
+    assert all(skeleton.turn.movement == 0 for skeleton in skeletons)
+    assert zombies.round == 0
+    order.next_turn()
+    assert zombies.round == 1
+
+
+def test_joining_leaving_and_delaying_mid_round(order):
+    """
+    Test combatants summoned, killed and delayed in the middle of a round.
+    """
+    paladin = creature("Paladin")
+    order.add(paladin, initiative=18)
+    skeletons = [creature("Skeleton") for _ in range(2)]
+    skeleton_slot = order.add(skeletons, initiative=10)
+    cleric = creature("Cleric")
+    order.add(cleric, initiative=5)
+    assert names(order.next_turn()) == ["Paladin"]
+    order.add(creature("Summoned Zombie"), initiative=12)  # still to come this round
+    order.add(creature("Late Ghoul"), initiative=19)  # already passed this round
+    order.remove(skeletons[0])
+    order.join(skeleton_slot, creature("Raised Skeleton"))
+    order.delay(order.slot_of(cleric), 11)  # the cleric acts sooner
+    order.delay(order.slot_of(paladin), 7)  # already acted: from next round on
+    turns = [names(order.next_turn()) for _ in range(3)]
+    assert turns == [
+        ["Summoned Zombie"],
+        ["Cleric"],
+        ["Skeleton", "Raised Skeleton"],
+    ]
+    order.remove(skeletons[1])
+    assert names(order.next_turn()) == ["Late Ghoul"]
+    assert order.round == 2
+    assert [slot.initiative for slot in order] == [19, 12, 11, 10, 7]
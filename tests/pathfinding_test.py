@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+import pytest
+
+import nos.world as world
+import nos.world.conditions as conditions
+import nos.world.movement as movement
+from nos.world.creatures import Creature
+from nos.world.horde import Horde
+from nos.world.pathfinding import BattleGrid
+
+
+@pytest.fixture
+def crypt():
+    """
+    A 20x10 crypt split by a wall at x=10, with a gap at the top, and a pool by the gap.
+    """
+    grid = BattleGrid(20, 10)
+    grid.paint("blocked", 10, 1, 10, 9)
+    grid.paint("difficult", 5, 0, 9, 0)
+    grid.paint("water", 11, 0, 12, 3)
+    return grid
+
+
+def zombie(x: int = 0, y: int = 5, movements=None) -> Creature:
+    return Creature(
+        "Zombie",
+        "",
+        world.Medium(),
+        8,
+        22,
+        movements=movements or [movement.Walk(20)],
+        world_position=world.Position(x, y, 0),
+    )
+
+
+def test_flow_field_costs(crypt):
+    """
+    Test path costs through the gap, difficult terrain and water, by movement type.
+    """
+    walking = crypt.flow_field((15, 5), [movement.Walk(30)])
+    flying = crypt.flow_field((15, 5), [movement.Fly(30)])
+    # Across to the gap at (10, 0): 5 squares, the last 5 of them difficult; then down
+    # through the pool (2 squares of water) to the goal, 5 squares more.
+    assert flying.distance_from((0, 5)) == 15 * 5
+    assert walking.distance_from((0, 5)) > flying.distance_from((0, 5))
+    assert walking.distance_from((9, 5)) == flying.distance_from((9, 5)) + 5 + 5
+    assert crypt.flow_field((15, 5), [movement.Walk(30)]) is walking
+    crypt.paint("blocked", 10, 0)
+    assert math.isinf(
+        crypt.flow_field((15, 5), [movement.Walk(30)]).distance_from((0, 5))
+    )
+    swimming = crypt.flow_field((12, 0), [movement.Swim(30)])
+    assert swimming.distance_from((11, 3)) == 15 and math.isinf(
+        swimming.distance_from((15, 5))
+    )
+
+
+def test_path_respects_budget(crypt):
+    field = crypt.flow_field((15, 5), [movement.Fly(30)])
+    path = field.path((0, 5), budget=30)
+    assert len(path) == 6
+    assert all(
+        max(abs(a - c), abs(b - d)) == 1 for (a, b), (c, d) in zip(path, path[1:])
+    )
+
+
+def test_creature_and_horde_move_toward(crypt):
+    """
+    Test that a creature and a horde move the same way, within their remaining speed.
+    """
+    walker = zombie()
+    assert not walker.move_toward(crypt, (15, 5))
+    assert walker.turn.movement <= 20
+
+    horde = Horde(zombie(), 4)
+    horde.add_condition(conditions.Prone, np.array([1]))
+    horde.add_condition(conditions.Restrained, np.array([2]))
+    arrived = horde.move_toward(crypt, world.Position(75, 25, 0))
+    assert not arrived.any()
+    np.testing.assert_array_equal(
+        horde.position[[0, 3]],
+        [[walker.world_position.x, walker.world_position.y, 0]] * 2,
+    )
+    assert horde.movement.tolist() == [
+        walker.turn.movement,
+        10,
+        0,
+        walker.turn.movement,
+    ]
+    for _ in range(10):
+        horde.start_turn()
+        horde.move_toward(crypt, (15, 5), np.array([0, 3]))
+    assert horde.position[0].tolist() == [75, 25, 0]
+
+
+def test_movement_speeds_scale_costs():
+    """
+    Test that a square costs a mover's budget in proportion to the speed it's crossed at.
+    """
+    lake = BattleGrid(10, 1)
+    lake.paint("water", 0, 0, 9, 0)
+    swimmer = zombie(0, 0, [movement.Walk(30), movement.Swim(10)])
+    # Swimming costs 15 ft. of the 30 ft. budget per square, and walking through water
+    # without the swim speed 10 ft.
+    swimmer.move_toward(lake, (9, 0))
+    assert swimmer.world_position.x == 15
+    fish = lake.flow_field((9, 0), [movement.Walk(10), movement.Swim(30)])
+    assert fish.distance_from((0, 0)) == 9 * 5
+    assert fish is not lake.flow_field((9, 0), [movement.Walk(10), movement.Swim(20)])
@@ -0,0 +1,61 @@
+import pygame as pg
+import pytest
+
+import nos
+import nos.assets as assets
+import nos.rendering as rendering
+
+
+def block(color, size=(10, 10), position=(0, 0)) -> nos.Sprite:
+    surface = pg.Surface(size, pg.SRCALPHA)
+    surface.fill(color)
+    return nos.Sprite(assets.Asset(spritesheet=surface), position=position)
+
+
+@pytest.fixture
+def scene(display):
+    background = block("blue", size=(100, 100))
+    first = block("red", position=(10, 10))
+    second = block("green", position=(50, 50))
+    return pg.Surface((100, 100)), [
+        nos.Group([background]),
+        nos.Group([first]),
+        nos.Group([second]),
+    ]
+
+
+def redrawn(screen: pg.Surface, groups) -> pg.Surface:
+    full = screen.copy()
+    full.fill("black")
+    for group in groups:
+        group.draw(full)
+    return full
+
+
+def test_only_changes_are_redrawn(scene):
+    screen, groups = scene
+    renderer = rendering.DirtyRenderer(screen)
+    assert renderer.draw(groups) == [pg.Rect(0, 0, 100, 100)]
+    assert renderer.draw(groups) == []
+
+    first = groups[1].sprites()[0]
+    first.rect.topleft = (15, 10)
+    assert renderer.draw(groups) == [pg.Rect(10, 10, 15, 10)]
+    assert pg.image.tobytes(screen, "RGB") == pg.image.tobytes(
+        redrawn(screen, groups), "RGB"
+    )
+
+
+def test_removed_and_flagged_sprites_are_redrawn(scene):
+    screen, groups = scene
+    renderer = rendering.DirtyRenderer(screen)
+    renderer.draw(groups)
+    second = groups[2].sprites()[0]
+    groups[2].remove(second)
+    assert renderer.draw(groups) == [pg.Rect(50, 50, 10, 10)]
+    assert screen.get_at((55, 55)) == pg.Color("blue")
+
+    first = groups[1].sprites()[0]
+    first.dirty = True
+    assert renderer.draw(groups) == [pg.Rect(10, 10, 10, 10)]
+    assert not first.dirty
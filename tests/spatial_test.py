@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+import nos.world as world
+import nos.world.abilities as abilities
+from nos.world.attacks import Attack, Weapon
+from nos.world.creatures import Creature
+from nos.world.spatial import SpatialIndex, distance, footprint
+
+
+def creature(name: str, x: float, y: float, size: world.Size = None) -> Creature:
+    return Creature(
+        name,
+        "",
+        size or world.Medium(),
+        12,
+        10,
+        world_position=world.Position(x, y, 0),
+    )
+
+
+@pytest.fixture
+def battlefield():
+    random.seed(3)
+    index = SpatialIndex()
+    creatures = [
+        creature(
+            f"Skeleton {i}", random.randrange(0, 500, 5), random.randrange(0, 500, 5)
+        )
+        for i in range(500)
+    ]
+    for skeleton in creatures:
+        index.add(skeleton)
+    return index, creatures
+
+
+def test_within_matches_a_full_scan(battlefield):
+    """
+    Test radius and rectangle queries against checking every creature.
+    """
+    index, creatures = battlefield
+    archer = creatures[0]
+    for radius in (5, 30, 150):
+        expected = {
+            id(other)
+            for other in creatures[1:]
+            if distance(footprint(archer), footprint(other)) <= radius
+        }
+        assert {id(found) for found in index.within(archer, radius)} == expected
+    in_rectangle = {id(found) for found in index.in_rectangle(100, 100, 200, 150)}
+    assert in_rectangle == {
+        id(other)
+        for other in creatures
+        if 95 <= other.world_position.x <= 200 and 95 <= other.world_position.y <= 150
+    }
+
+
+def test_nearest_matches_a_full_scan(battlefield):
+    """
+    Test k-nearest queries, with a filter, against sorting every creature.
+    """
+    index, creatures = battlefield
+    archer = creatures[0]
+    even = creatures[2::2]
+    nearest = index.nearest(archer, 5, predicate=lambda other: other in even)
+    distances = sorted(distance(footprint(archer), footprint(o)) for o in even)
+    found = [distance(footprint(archer), footprint(o)) for o in nearest]
+    assert found == distances[:5]
+
+
+def test_moving_and_large_creatures():
+    """
+    Test that moves update the index, and that big creatures fill all their squares.
+    """
+    index = SpatialIndex()
+    ogre = creature("Ogre", 0, 0, world.Large())
+    goblin = creature("Goblin", 15, 0)
+    index.add(ogre)
+    index.add(goblin)
+    assert index.within(goblin, 5) == [ogre]  # the ogre's space reaches x=10
+    goblin.move(10, 0)
+    assert index.within(goblin, 5) == []
+    assert index.in_rectangle(6, 6, 7, 7) == [ogre]
+    assert index.nearest(goblin) == [ogre]
+    assert index.nearest(footprint(goblin), max_distance=10) == [goblin]
+    index.remove(ogre)
+    assert index.nearest(goblin) == []
+    assert ogre.spatial_index is None and goblin.spatial_index is index
+
+
+def test_moves_relink_only_changed_cells():
+    """
+    Test that moving by any step leaves the cells as a fresh index would have them.
+    """
+    index = SpatialIndex()
+    giant = creature("Giant", 0, 0, world.Huge())
+    index.add(giant)
+    for dx, dy in [(5, 0), (0, -10), (-15, 15), (40, 0), (2, 3), (-20, -20)]:
+        giant.move(dx, dy)
+        fresh = SpatialIndex()
+        fresh.add(giant)
+        assert index._cells == fresh._cells
+        giant.spatial_index = index
+
+
+def test_weapon_reach_and_attack_range():
+    """
+    Test that weapons and attacks pick their targets out of the index.
+    """
+    index = SpatialIndex()
+    fighter = creature("Fighter", 0, 0)
+    near, far = creature("Goblin", 10, 0), creature("Orc", 60, 0)
+    for entity in (fighter, near, far):
+        index.add(entity)
+    glaive = Weapon("Glaive", "", world.Medium(), 6, 20, damage_roll="1d10", reach=10)
+    assert glaive.targets_in_reach(fighter, index) == [near]
+    shortbow = Attack(
+        name="Shortbow",
+        description="",
+        ability=abilities.Dexterity(score=14),
+        proficiency_bonus=2,
+        range=80,
+    )
+    assert shortbow.targets_in_range(fighter, index) == [near, far]
+    assert shortbow.targets_in_range(fighter, index, lambda o: o.name == "Orc") == [far]
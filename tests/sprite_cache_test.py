@@ -0,0 +1,88 @@
+import os
+
+import pygame as pg
+import pytest
+
+import nos.assets as assets
+import nos.sprite_cache as sprite_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = sprite_cache.SpriteCache(tmp_path / "sprites")
+    monkeypatch.setattr(sprite_cache, "CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def spritesheet(tmp_path):
+    """
+    A 4x2 sheet of 8x8 tiles on a magenta background, each with a differently coloured
+    pixel in its corner.
+    """
+    surface = pg.Surface((32, 16))
+    surface.fill((255, 0, 255))
+    for x in range(4):
+        for y in range(2):
+            surface.set_at((x * 8, y * 8), (x * 60, y * 120, 10))
+    path = tmp_path / "sheet.png"
+    pg.image.save(surface, path)
+    return path
+
+
+def pixels(surface: pg.Surface) -> bytes:
+    return pg.image.tobytes(surface, "RGBA")
+
+
+def test_warm_load_skips_decoding(display, cache, spritesheet, monkeypatch):
+    """
+    Test that a cached asset comes back identical without decoding its image.
+    """
+    cold = assets.AnimatedAsset(
+        path=spritesheet,
+        tile_size=(8, 8),
+        scale=2,
+        colorkey=(255, 0, 255),
+        animation_tiles={"idle": [(0, 0), (2, 1)]},
+    )
+    cold.load()
+    assert cold.spritesheet.get_size() == (48, 32)  # the fourth column is never shown
+    assert cold.image.get_at((0, 0)) == (0, 0, 10, 255)
+    assert cold.image.get_at((2, 2)).a == 0
+
+    monkeypatch.setattr(pg.image, "load", pytest.fail)
+    warm = assets.AnimatedAsset(
+        path=spritesheet,
+        tile_size=(8, 8),
+        scale=2,
+        colorkey=(255, 0, 255),
+        animation_tiles={"idle": [(0, 0), (2, 1)]},
+    )
+    warm.load()
+    assert warm.tile_size == cold.tile_size == (16, 16)
+    for cold_frame, warm_frame in zip(
+        cold.animations["idle"].frames, warm.animations["idle"].frames
+    ):
+        assert pixels(cold_frame) == pixels(warm_frame)
+
+
+def test_entries_are_keyed_by_source_and_settings(display, cache, spritesheet):
+    """
+    Test that changing the image or how it is rendered makes a new entry, and that
+    stacked assets are cached as a whole.
+    """
+    first = assets.Asset(path=spritesheet, tile_size=(8, 8))
+    scaled = assets.Asset(path=spritesheet, tile_size=(8, 8), scale=3)
+    assert first.cache_key() != scaled.cache_key()
+    stacked = assets.Asset.stack([first, scaled], tiles=[(0, 0), (1, 1)])
+    stacked.load()
+    assert len(list(cache.directory.iterdir())) == 1
+    assert stacked.image.get_at((0, 0)) == (60, 120, 10, 255)
+
+    first_key = first.cache_key()
+    surface = pg.image.load(spritesheet)
+    surface.fill((0, 0, 0), pg.Rect(0, 0, 1, 1))
+    pg.image.save(surface, spritesheet)
+    os.utime(spritesheet, ns=(0, 0))
+    assert assets.Asset(path=spritesheet, tile_size=(8, 8)).cache_key() != first_key
+    assert assets.Asset(spritesheet=surface).cache_key() is None
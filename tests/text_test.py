@@ -0,0 +1,18 @@
+import nos.assets.cards as cards
+import nos.text as text
+
+
+def test_fonts_are_opened_once_per_style(fonts):
+    handwriting = text.font(cards.HANDWRITING, 10, italic=True)
+    assert text.font(cards.HANDWRITING, 10, italic=True) is handwriting
+    assert handwriting.italic
+    assert text.font(cards.HANDWRITING, 10) is not handwriting
+    assert text.font(cards.HANDWRITING, 12, italic=True) is not handwriting
+
+
+def test_texts_are_rendered_once(fonts):
+    handwriting = text.font(cards.HANDWRITING, 10)
+    name = text.render(handwriting, "Archer", "black")
+    assert text.render(handwriting, "Archer", (0, 0, 0)) is name
+    assert text.render(handwriting, "Archer", "red") is not name
+    assert text.render(handwriting, "Archer", "black", antialias=False) is not name
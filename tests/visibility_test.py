@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+import nos.world as world
+import nos.world.conditions as conditions
+from nos.world.creatures import Creature
+from nos.world.pathfinding import BattleGrid
+from nos.world.visibility import Visibility
+
+
+def creature(name: str, x: int, y: int) -> Creature:
+    return Creature(
+        name, "", world.Medium(), 10, 10, world_position=world.Position(x * 5, y * 5, 0)
+    )
+
+
+@pytest.fixture
+def ruins():
+    random.seed(15)
+    visibility = Visibility(24, 24)
+    for _ in range(90):
+        visibility.set_opaque(random.randrange(24), random.randrange(24))
+    return visibility
+
+
+def test_field_of_view_is_symmetric(ruins):
+    """
+    Test that every floor square sees exactly the floor squares that see it.
+    """
+    floors = [(x, y) for x in range(24) for y in range(24) if not ruins.opaque[x, y]]
+    for first in floors[::7]:
+        view = ruins.field_of_view(first)
+        for second in floors:
+            assert (second in view) == (first in ruins.field_of_view(second))
+
+
+def test_walls_and_radius():
+    visibility = Visibility(10, 10, radius=3)
+    visibility.set_opaque(5, 0, 5, 9)
+    view = visibility.field_of_view((2, 2))
+    assert (5, 2) in view and (6, 2) not in view  # the wall is seen, not what's behind
+    assert (2, 5) in view and (2, 6) not in view  # nor anything past the radius
+
+
+def test_changes_forget_only_affected_views():
+    """
+    Test that opening a door refreshes the views that looked at it, and no others.
+    """
+    visibility = Visibility(20, 10)
+    visibility.set_opaque(10, 0, 10, 9)
+    left, right = visibility.field_of_view((2, 5)), visibility.field_of_view((17, 5))
+    assert (12, 5) not in left
+    visibility.set_opaque(10, 5, value=False)
+    assert (12, 5) in visibility.field_of_view((2, 5))
+    assert visibility.field_of_view((17, 5)) is not right  # it saw the door, too
+    left = visibility.field_of_view((2, 5))
+    visibility.set_opaque(19, 0)  # out of sight of the left side
+    visibility.set_opaque(0, 0, value=False)  # no change at all
+    assert visibility.field_of_view((2, 5)) is left
+    assert set(visibility._views) == {(2, 5)}
+    assert visibility.opaque[19, 0] and not visibility.opaque[10, 5]
+
+
+def test_can_see_with_obstructions_and_conditions():
+    grid = BattleGrid(12, 12)
+    grid.paint("blocked", 6, 0, 6, 4)
+    visibility = Visibility.from_grid(grid)
+    archer, ogre, rogue = (
+        creature("Archer", 2, 6),
+        creature("Ogre", 6, 6),
+        creature("Rogue", 10, 6),
+    )
+    assert visibility.visible_to(archer, [archer, ogre, rogue]) == [ogre, rogue]
+    visibility.add_obstruction(ogre)
+    assert not visibility.can_see(archer, rogue) and not visibility.can_see(
+        rogue, archer
+    )
+    ogre.move(0, 10)
+    visibility.update(ogre)
+    assert visibility.can_see(archer, rogue)
+    rogue.add_condition(conditions.Invisible())
+    assert not visibility.can_see(archer, rogue) and visibility.line_of_sight(
+        archer, rogue
+    )
+    archer.add_condition(conditions.Blinded())
+    assert not visibility.can_see(archer, ogre) and visibility.can_see(ogre, archer)
@@ -0,0 +1,220 @@
+import dataclasses
+
+import pytest
+
+import nos.world as world
+import nos.world.abilities as abilities
+import nos.world.conditions as conditions
+import nos.world.movement as movement
+from nos import dice
+from nos.world.creatures import Creature
+
+
+@pytest.fixture
+def skeleton():
+    return Creature(
+        "Skeleton",
+        "Rattles.",
+        world.Medium(),
+        13,
+        13,
+        movements=[movement.Walk(30)],
+    )
+
+
+def test_model_instances_have_no_dict(skeleton):
+    """
+    Test that the model classes are slotted, so instances carry no ``__dict__``.
+    """
+    for instance in (
+        skeleton,
+        skeleton.abilities,
+        skeleton.abilities.strength,
+        skeleton.world_position,
+        skeleton.turn,
+        skeleton.size,
+        skeleton.movements[0],
+        conditions.Blinded(),
+        conditions.Paralyzed(),
+    ):
+        assert not hasattr(instance, "__dict__"), type(instance).__name__
+
+
+def test_default_abilities_are_shared(skeleton):
+    """
+    Test that creatures share the immutable default abilities, and can be given their own.
+    """
+    other = Creature("Zombie", "Shambles.", world.Medium(), 8, 22)
+    assert skeleton.abilities is other.abilities is abilities.DEFAULT_ABILITIES
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        skeleton.abilities.strength = abilities.Strength(score=16)
+    skeleton.abilities = dataclasses.replace(
+        skeleton.abilities, strength=abilities.Strength(score=16)
+    )
+    assert skeleton.abilities.strength.bonus == 3
+    assert other.abilities.strength.bonus == 0
+
+
+def test_conditions_expire_and_are_undone(skeleton):
+    """
+    Test that a timed condition blocks the entity until it expires, then is undone.
+    """
+    paralyzed = conditions.Paralyzed(duration=2)
+    skeleton.add_condition(paralyzed)
+    assert skeleton.has_condition(conditions.Incapacitated)
+    assert skeleton.has_condition(conditions.Immobilized)
+    assert not skeleton.has_condition(conditions.Prone)
+    assert skeleton.speed == 0 and skeleton.movements[0].speed == 30
+    skeleton.start_turn()
+    assert skeleton.turn.action is not None  # still incapacitated after the reset
+    assert skeleton.remaining_duration(paralyzed) == 1
+    skeleton.start_turn()
+    assert skeleton.conditions == []
+    assert skeleton.condition_flags == 0
+    assert skeleton.turn.action is None
+    assert skeleton.speed == 30
+
+
+def test_conditions_ended_early_forget_their_expiry(skeleton):
+    """
+    Test that a condition removed before it expires, then added again, lasts its new
+    duration rather than its old one.
+    """
+    poisoned = conditions.Poisoned(duration=2)
+    skeleton.add_condition(poisoned)
+    skeleton.remove_condition(poisoned)
+    assert skeleton.remaining_duration(poisoned) is None
+    skeleton.start_turn()
+    poisoned.remaining_duration = 5
+    skeleton.add_condition(poisoned)
+    skeleton.start_turn()
+    assert skeleton.has_condition(conditions.Poisoned)
+    assert skeleton.remaining_duration(poisoned) == 4
+
+
+def test_removing_combined_conditions_restores_movement(skeleton):
+    """
+    Test that removing a condition made of several others undoes all of them.
+    """
+    walk = skeleton.movements[0]
+    unconscious = conditions.Unconscious()
+    skeleton.add_condition(unconscious)
+    assert isinstance(skeleton.effective_movements[0], movement.Crawl)
+    assert skeleton.speed == 0
+    skeleton.add_condition(conditions.Poisoned())
+    skeleton.remove_condition(unconscious)
+    assert skeleton.effective_movements == (walk,) and skeleton.speed == 30
+    assert not skeleton.has_condition(conditions.Incapacitated)
+    assert skeleton.has_condition(conditions.Poisoned)
+
+
+def test_derived_stats_are_cached_until_their_inputs_change(skeleton):
+    """
+    Test that derived stats are computed once, and recomputed only after a change.
+    """
+    assert skeleton.speed == 30 and skeleton.carrying_capacity == 150
+    movements = skeleton.effective_movements
+    assert skeleton.effective_movements is movements
+    skeleton.add_condition(conditions.Poisoned())
+    assert skeleton.attack_situation == dice.Situation.DISADVANTAGE
+    prone = conditions.Prone()
+    skeleton.add_condition(prone)
+    assert skeleton.speed == 15 and skeleton.carrying_capacity == 150
+    skeleton.remove_condition(prone)
+    skeleton.abilities = dataclasses.replace(
+        skeleton.abilities, strength=abilities.Strength(score=16)
+    )
+    assert skeleton.carrying_capacity == 240
+    skeleton.movements = [movement.Walk(40)]
+    assert skeleton.speed == 40
+
+
+def test_condition_situations_and_phases(skeleton):
+    """
+    Test the attack, defense and save effects of conditions, and the turn phases they
+    take away while any incapacitating condition remains.
+    """
+    stunned, paralyzed = conditions.Stunned(), conditions.Paralyzed()
+    skeleton.add_condition(stunned)
+    skeleton.add_condition(paralyzed)
+    assert skeleton.defense_situation == dice.Situation.ADVANTAGE
+    assert skeleton.automatically_fails("dexterity")
+    skeleton.remove_condition(stunned)
+    assert skeleton.turn.reaction is not None
+    skeleton.remove_condition(paralyzed)
+    assert skeleton.turn.reaction is None
+    assert not skeleton.automatically_fails("dexterity")
+    skeleton.add_condition(conditions.Invisible())
+    skeleton.add_condition(conditions.Blinded())
+    assert skeleton.attack_situation is None  # advantage and disadvantage cancel out
+    assert skeleton.defense_situation is None
+
+
+def item(name: str, weight: float, value: int = 0) -> world.Item:
+    return world.Item(name, "", world.Tiny(weight=weight), 10, 1, value=value)
+
+
+def container(name: str, weight: float, items=None) -> world.Container:
+    return world.Container(
+        name, "", world.Small(weight=weight), 10, 5, items=items or []
+    )
+
+
+def test_container_totals_follow_nested_changes():
+    """
+    Test that weight, value and item counts stay correct through nested changes.
+    """
+    quiver = container("Quiver", 1, [item("Arrow", 0.05, 1) for _ in range(20)])
+    pack = container("Pack", 5, [quiver, item("Rations", 2, 5)])
+    cart = container("Cart", 200, [pack])
+    assert cart.item_count() == 23
+    assert cart.get_weight() == pytest.approx(200 + 5 + 2 + 1 + 20 * 0.05)
+    assert cart.get_value() == 25
+    arrows = quiver.items[:5]
+    for arrow in arrows:
+        quiver.remove_item(arrow)
+    assert quiver.item_count() == 15 and cart.item_count() == 18
+    assert arrows[0].container is None
+    quiver.items[0].set_weight(1.05)
+    assert cart.get_weight() == pytest.approx(208 + 14 * 0.05 + 1.05)
+    cart.add_item(quiver)  # moving it out of the pack
+    assert pack.get_weight() == pytest.approx(7)
+    assert pack.item_count() == 1 and cart.item_count() == 18
+    assert quiver.container is cart
+    with pytest.raises(ValueError):
+        quiver.add_item(cart)
+
+
+def test_container_recompute_matches_incremental_totals():
+    """
+    Test that rebuilding the totals from scratch agrees with the incremental ones.
+    """
+    pack = container("Pack", 5, [item("Rope", 10, 1), container("Pouch", 1)])
+    pack.items[1].add_item(item("Gem", 0, 50))
+    pack.set_value(2)
+    totals = (pack.get_weight(), pack.get_value(), pack.item_count())
+    pack.recompute()
+    assert (pack.get_weight(), pack.get_value(), pack.item_count()) == totals
+    assert totals == (16, 53, 3)
+
+
+def test_container_totals_follow_recompute_and_shared_sizes():
+    """
+    Test that recomputing an inner container updates the outer ones, and that changing
+    the weight of an item sharing its Size with others changes only that item.
+    """
+    inner = container("Pouch", 2)
+    outer = container("Pack", 0, [inner])
+    inner.items.append(item("Stone", 5, 0))
+    inner.recompute()
+    assert outer.get_weight() == 7 and outer.item_count() == 2
+
+    shared = world.Tiny(weight=1)
+    arrows = [world.Item("Arrow", "", shared, 10, 1) for _ in range(3)]
+    quiver = container("Quiver", 0, arrows)
+    arrows[0].set_weight(2)
+    assert [arrow.get_weight() for arrow in arrows] == [2, 1, 1]
+    assert quiver.get_weight() == 4
+    totals = (quiver.get_weight(), quiver.item_count())
+    quiver.recompute()
+    assert (quiver.get_weight(), quiver.item_count()) == totals